@@ -0,0 +1,152 @@
+#Benchmarks for the schedulers in main.py
+#Runs each scheduler on seeded generated workloads of growing size and a few arrival/burst shapes with
+#logging turned off, and reports simulated jobs/sec, events/sec and peak memory. Results can be saved as a
+#JSON baseline and later runs compared against it, failing when something got slower than allowed.
+#
+#   python benchmark.py --max-size 100000 --save-baseline benchmark_baseline.json
+#   python benchmark.py --max-size 100000 --baseline benchmark_baseline.json --tolerance 15
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import main
+
+# Workload sizes from 1e3 to 1e7 jobs; --max-size picks how far up to go
+SIZES = [10 ** exponent for exponent in range(3, 8)]
+# (name, generate_workload arguments)
+SHAPES = [
+    ("poisson-exponential", {"arrival": "poisson", "burst": "exponential"}),
+    ("bursty-pareto", {"arrival": "bursty", "burst": "pareto"}),
+    ("poisson-bimodal", {"arrival": "poisson", "burst": "bimodal", "short_burst": 0.5, "long_burst": 5.0}),
+]
+BENCHMARKS = ("srtf", "mlfq", "metrics")
+# Arrival rate used for every shape; a little under the mean burst so the CPU is busy but keeps up
+ARRIVAL_RATE = 0.9
+# Small cases finish in milliseconds, so each case is run again until this much time has been spent timing
+# it and the median run is kept
+MIN_CASE_SECONDS = 0.5
+# Cases whose baseline run took less than this are reported but not checked for regressions
+GATE_FLOOR_SECONDS = 0.05
+
+
+#Runs one benchmark in its own process so the peak RSS belongs to that run alone. The case is run at least
+#`repeat` times and until min_seconds have been spent on it; the median run time is reported.
+def run_case(benchmark, shape_args, size, seed, repeat, min_seconds=MIN_CASE_SECONDS):
+    table = main.generate_workload(size, seed=seed, rate=ARRIVAL_RATE, **shape_args)
+    if benchmark == "metrics":
+        _, completed = main.srtf_scheduler(table, sink=main.SilentSink())
+    times = []
+    events = 0
+    while len(times) < repeat or sum(times) < min_seconds:
+        if benchmark == "metrics":
+            started = time.perf_counter()
+            main.compute_metrics(completed)
+            elapsed = time.perf_counter() - started
+            events = size
+        else:
+            scheduler = main.srtf_scheduler if benchmark == "srtf" else main.mlfq_scheduler
+            metrics = main.MetricsAccumulator()
+            started = time.perf_counter()
+            scheduler(table, sink=main.SilentSink(), metrics=metrics, keep_completed=False)
+            elapsed = time.perf_counter() - started
+            # Every arrival and completion, plus each time a running process was stopped early
+            events = 2 * size + metrics.preemptions
+        times.append(elapsed)
+    median = statistics.median(times)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak_rss *= 1024
+    return {
+        "seconds": median,
+        "runs": len(times),
+        "jobs_per_sec": size / median if median > 0 else float('inf'),
+        "events_per_sec": events / median if median > 0 else float('inf'),
+        "peak_rss_mb": peak_rss / (1024 * 1024),
+    }
+
+
+def run_benchmarks(benchmarks, shapes, sizes, seed=1, repeat=1, min_seconds=MIN_CASE_SECONDS):
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        for shape_name, shape_args in shapes:
+            for benchmark in benchmarks:
+                key = f"{benchmark}/{shape_name}/{size}"
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(run_case, benchmark, shape_args, size, seed, repeat, min_seconds).result()
+                results[key] = result
+                print(f"{key:<40} {result['jobs_per_sec']:>14,.0f} jobs/s {result['events_per_sec']:>14,.0f} events/s "
+                      f"{result['peak_rss_mb']:>9.1f} MB peak ({result['runs']} runs)")
+    return results
+
+
+#Names of the benchmarks whose jobs/sec fell more than tolerance percent below the baseline. Cases that took
+#less than floor_seconds in the baseline are too short to compare reliably and are skipped.
+def find_regressions(results, baseline, tolerance, floor_seconds=GATE_FLOOR_SECONDS):
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get("results", {}).get(key)
+        if expected is None or expected["seconds"] < floor_seconds:
+            continue
+        floor = expected["jobs_per_sec"] * (1 - tolerance / 100)
+        if result["jobs_per_sec"] < floor:
+            change = (result["jobs_per_sec"] / expected["jobs_per_sec"] - 1) * 100
+            regressions.append((key, expected["jobs_per_sec"], result["jobs_per_sec"], change))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers in main.py.")
+    parser.add_argument("--max-size", type=int, default=10 ** 5, help="largest workload size to run (up to 10000000)")
+    parser.add_argument("--benchmarks", default=",".join(BENCHMARKS),
+                        help=f"comma separated subset of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--shapes", default=",".join(name for name, _ in SHAPES),
+                        help="comma separated subset of the workload shapes")
+    parser.add_argument("--seed", type=int, default=1, help="workload seed")
+    parser.add_argument("--repeat", type=int, default=1, help="minimum runs per case, the median one is kept")
+    parser.add_argument("--min-time", type=float, default=MIN_CASE_SECONDS,
+                        help="keep running each case until this many seconds were spent timing it")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results to this JSON file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0,
+                        help="allowed drop in jobs/sec below the baseline, in percent")
+    parser.add_argument("--gate-floor", type=float, default=GATE_FLOOR_SECONDS,
+                        help="skip the regression check for cases whose baseline run took less than this many seconds")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    benchmarks = [name.strip() for name in args.benchmarks.split(",") if name.strip()]
+    for name in benchmarks:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark '{name}' (expected one of {', '.join(BENCHMARKS)})")
+    wanted_shapes = {name.strip() for name in args.shapes.split(",")}
+    shapes = [shape for shape in SHAPES if shape[0] in wanted_shapes]
+    sizes = [size for size in SIZES if size <= args.max_size]
+
+    results = run_benchmarks(benchmarks, shapes, sizes, seed=args.seed, repeat=args.repeat, min_seconds=args.min_time)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "seed": args.seed,
+                       "results": results}, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance, args.gate_floor)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) more than {args.tolerance:g}% slower than {args.baseline}:")
+            for key, expected, actual, change in regressions:
+                print(f"  {key}: {actual:,.0f} jobs/s vs {expected:,.0f} baseline ({change:+.1f}%)")
+            sys.exit(1)
+        print(f"\nNo benchmark more than {args.tolerance:g}% slower than {args.baseline}.")
@@ -1,16 +1,54 @@
+import argparse
+import bisect
+import csv
+import hashlib
 import heapq
-from collections import deque
-import copy
+import itertools
+import json
+import math
+import mmap
+import numbers
+import os
+import pickle
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only generate_workload uses it
+    np = None
+
+# Smallest burst time generate_workload will produce
+MIN_BURST_TIME = 1e-9
 
 #Process class for use by the algorithms
 class Process:
-    def __init__(self, pid, arrival_time, burst_time):
+    __slots__ = ("pid", "arrival_time", "burst_time", "remaining_time", "start_time", "completion_time",
+                 "waiting_time", "turnaround_time", "bursts", "io_time")
+
+    def __init__(self, pid, arrival_time, burst_time, bursts=None):
         #process ID
         self.pid = pid
         #When the process shows up
         self.arrival_time = arrival_time
+        #For processes that do I/O: alternating CPU and I/O burst lengths, starting and ending with a CPU
+        #burst. burst_time is then the total of the CPU bursts.
+        self.bursts = bursts
+        if bursts is not None:
+            if len(bursts) % 2 == 0:
+                raise ValueError(f"Process {pid}: bursts must alternate CPU and I/O, starting and ending with CPU")
+            burst_time = sum(bursts[0::2])
         #How long it takes the CPU to complete the task
         self.burst_time = burst_time
+        #Time spent waiting on I/O, which is not counted as waiting time
+        self.io_time = sum(bursts[1::2]) if bursts is not None else 0
 
         self.remaining_time = burst_time
         self.start_time = -1
@@ -32,325 +70,3219 @@ class Process:
                 f"burst={self.burst_time}, remaining={self.remaining_time})")
 
 
-# 1. Shortest Remaining Time First (SRTF) Implementation
-def srtf_scheduler(processes_input):
-    # Use a deep copy to avoid modifying the original list objects
-    processes = copy.deepcopy(processes_input)
-    processes.sort(key=lambda p: p.arrival_time)
-    num_processes = len(processes)
-    completed_processes_list = []
-    scheduled_order = []
-    ready_queue = []
-    current_time = 0
-    processes_completed = 0
-    process_idx = 0
-    current_process = None
-    last_event_time = 0
-    is_cpu_idle = True
-
-    while processes_completed < num_processes:
-        # Add newly arrived processes to the ready queue
-        while process_idx < num_processes and processes[process_idx].arrival_time <= current_time:
-            newly_arrived_process = processes[process_idx]
-            heapq.heappush(ready_queue, newly_arrived_process)
-            print(f"Time {current_time}: Process {newly_arrived_process.pid} arrived, added to ready queue.")
-            process_idx += 1
-            #when a process arrives it checks if that process has less remaining time then the current process
-            #if it does then it interupts the current process and starts the other one
-            if current_process is not None and newly_arrived_process.remaining_time < current_process.remaining_time:
-                 print(f"Time {current_time}: Newly arrived Process {newly_arrived_process.pid} (RT: {newly_arrived_process.remaining_time}) preempts running Process {current_process.pid} (RT: {current_process.remaining_time}).")
-                 if current_time > last_event_time:
-                     scheduled_order.append((current_process.pid, last_event_time, current_time))
-
-                 heapq.heappush(ready_queue, current_process)
-                 current_process = None
-                 is_cpu_idle = True
-
-        #if the cpu is not doing anything and there are processes still waiting then pick a process
-        if is_cpu_idle and ready_queue:
-            current_process = heapq.heappop(ready_queue)
-            is_cpu_idle = False
-            if current_process.start_time == -1:
-                current_process.start_time = current_time
-
-            print(f"Time {current_time}: Process {current_process.pid} starts/resumes execution (Remaining: {current_process.remaining_time:.2f}).")
-            last_event_time = current_time
+# A finished Process built from its recorded start and completion times
+def completed_process(pid, arrival_time, burst_time, start_time, completion_time, io_time=0):
+    p = Process(pid, arrival_time, burst_time)
+    p.io_time = io_time
+    p.remaining_time = 0
+    p.start_time = start_time
+    p.completion_time = completion_time
+    p.turnaround_time = completion_time - arrival_time
+    p.waiting_time = p.turnaround_time - burst_time - io_time
+    return p
+
+
+# Struct-of-arrays workload: one typed array per column instead of one object per process.
+# The input columns (pid, arrival, burst) are shared by every run; each run only copies the
+# columns it changes through scratch().
+# Workloads with I/O also have phase columns (see set_phases); bursts is then each row's total CPU time.
+class ProcessTable:
+    __slots__ = ("pids", "arrivals", "bursts", "io_times", "phase_offsets", "phase_lengths")
+
+    def __init__(self, pids=(), arrivals=(), bursts=()):
+        self.pids = array('q', pids)
+        self.arrivals = array('d', arrivals)
+        self.bursts = array('d', bursts)
+        self.io_times = None
+        self.phase_offsets = None
+        self.phase_lengths = None
+
+    # Accepts a list of Process objects (or an existing table, which is returned as is)
+    @classmethod
+    def from_processes(cls, processes):
+        if isinstance(processes, ProcessTable):
+            return processes
+        table = cls([p.pid for p in processes], [p.arrival_time for p in processes], [p.burst_time for p in processes])
+        if any(p.bursts is not None for p in processes):
+            table.set_phases([p.bursts if p.bursts is not None else (p.burst_time,) for p in processes])
+        return table
+
+    # Gives every row a sequence of alternating CPU and I/O bursts (CPU first and last). They are stored
+    # flat: row i's bursts are phase_lengths[phase_offsets[i]:phase_offsets[i + 1]]. bursts and io_times
+    # become each row's CPU and I/O totals.
+    def set_phases(self, burst_lists):
+        offsets = array('q', [0])
+        lengths = array('d')
+        io_times = array('d')
+        for i, row_bursts in enumerate(burst_lists):
+            if len(row_bursts) % 2 == 0:
+                raise ValueError(f"Process {self.pids[i]}: bursts must alternate CPU and I/O, starting and ending with CPU")
+            lengths.extend(row_bursts)
+            offsets.append(len(lengths))
+            self.bursts[i] = sum(row_bursts[0::2])
+            io_times.append(sum(row_bursts[1::2]))
+        self.phase_offsets = offsets
+        self.phase_lengths = lengths
+        self.io_times = io_times
+
+    # Row i's bursts, alternating CPU and I/O
+    def bursts_of(self, i):
+        if self.phase_offsets is None:
+            return (self.bursts[i],)
+        return tuple(self.phase_lengths[self.phase_offsets[i]:self.phase_offsets[i + 1]])
+
+    def __len__(self):
+        return len(self.pids)
+
+    def append(self, pid, arrival_time, burst_time):
+        self.pids.append(pid)
+        self.arrivals.append(arrival_time)
+        self.bursts.append(burst_time)
+
+    # Rows ordered by arrival time (ties keep their input order); returns self when already sorted
+    def sorted_by_arrival(self):
+        arrivals = self.arrivals
+        if all(arrivals[i] <= arrivals[i + 1] for i in range(len(arrivals) - 1)):
+            return self
+        order = sorted(range(len(arrivals)), key=arrivals.__getitem__)
+        pids, bursts = self.pids, self.bursts
+        table = ProcessTable([pids[i] for i in order], [arrivals[i] for i in order], [bursts[i] for i in order])
+        if self.phase_offsets is not None:
+            table.set_phases([self.bursts_of(i) for i in order])
+        return table
+
+    # Fresh copies of the mutable columns for one scheduler run
+    def scratch(self):
+        return RunColumns(self)
+
+    # Process object for row i, filled in from a run's columns when one is given
+    def process(self, i, run=None):
+        p = Process(self.pids[i], self.arrivals[i], self.bursts[i])
+        if self.phase_offsets is not None:
+            p.bursts = self.bursts_of(i)
+            p.io_time = self.io_times[i]
+        if run is not None:
+            p.remaining_time = run.remaining[i]
+            p.start_time = run.start[i]
+            p.completion_time = run.completion[i]
+            if p.completion_time >= 0:
+                p.turnaround_time = p.completion_time - p.arrival_time
+                p.waiting_time = p.turnaround_time - p.burst_time - p.io_time
+        return p
+
+    def to_processes(self, run=None):
+        return [self.process(i, run) for i in range(len(self.pids))]
+
+    # Builds a table from (pid, arrival_time, burst_time) rows, e.g. from one of the trace loaders
+    @classmethod
+    def from_rows(cls, rows):
+        table = cls()
+        for pid, arrival_time, burst_time in rows:
+            table.append(pid, arrival_time, burst_time)
+        return table
+
+    # Builds a table by copying whole buffers (e.g. NumPy int64/float64 arrays) instead of element by element
+    @classmethod
+    def from_arrays(cls, pids, arrivals, bursts):
+        table = cls()
+        for column, values in ((table.pids, pids), (table.arrivals, arrivals), (table.bursts, bursts)):
+            view = memoryview(values)
+            if view.itemsize != column.itemsize:
+                raise ValueError(f"Expected {column.itemsize} byte items, got '{view.format}' ({view.itemsize} bytes)")
+            column.frombytes(view.cast("B"))
+        return table
+
+
+# Per-run mutable columns of a ProcessTable (start and completion stay -1 until they happen)
+# With I/O bursts, remaining is what is left of the current CPU burst and phase is that burst's
+# position in the table's phase_lengths; otherwise phase is None.
+class RunColumns:
+    __slots__ = ("remaining", "start", "completion", "phase")
+
+    def __init__(self, table):
+        n = len(table)
+        if table.phase_offsets is None:
+            # Copied as raw bytes so this also works when the table's columns are shared memory views
+            self.remaining = array('d')
+            self.remaining.frombytes(memoryview(table.bursts).cast("B"))
+            self.phase = None
+        else:
+            self.phase = array('q')
+            self.phase.frombytes(memoryview(table.phase_offsets).cast("B"))
+            del self.phase[n:]
+            lengths = table.phase_lengths
+            self.remaining = array('d', [lengths[k] for k in self.phase])
+        self.start = array('d', [-1.0]) * n
+        self.completion = array('d', [-1.0]) * n
+
+
+# Event sinks
+# The schedulers report what they do as small numeric event tuples (kind, time, pid, a, b) instead of
+# printing. A sink decides what happens to them; when sink.enabled is False the schedulers skip the call
+# entirely, so no strings are ever formatted.
+EVENT_ARRIVE = 0     # a = queue level the process joined (-1 for a single ready queue)
+EVENT_DISPATCH = 1   # a = remaining time, b = queue level (-1 for a single ready queue)
+EVENT_RUN = 2        # a = time executed, b = remaining time afterwards
+EVENT_PREEMPT = 3    # pid = preempted process, a = pid that takes over (-1 if not known yet), b = its remaining time
+EVENT_COMPLETE = 4
+EVENT_IDLE = 5       # time = start of the idle period, a = end of the idle period
+EVENT_DEMOTE = 6     # a = queue level the quantum expired in, b = queue level it moves to
+EVENT_RUN_START = 7  # a = number of queues (0 for a single ready queue), b = 1 when the times were given as ints
+EVENT_RUN_END = 8
+EVENT_BOOST = 9      # a = number of processes moved back to the top queue
+EVENT_MIGRATE = 10   # a = core the process last ran on, b = core it now runs on
+EVENT_SLEEP = 11     # a = length of the I/O burst the process now waits on
+EVENT_WAKE = 12      # a = queue level it rejoins (-1 for a single ready queue), b = length of its next CPU burst
+EVENT_QUANTUM = 13   # a = queue level, b = its time quantum; one per level right after EVENT_RUN_START
+EVENT_SLICE = 14     # a = queue level the process runs from, b = quantum left after the EVENT_RUN that follows
+EVENT_ARRIVAL_PREEMPT = 15  # SRTF's EVENT_PREEMPT when an arrival beats the running process: a = the first such
+                            # arrival, b = its remaining time. Sent right after its EVENT_ARRIVE; the process
+                            # dispatched next (the best one waiting) follows once every arrival is in.
+EVENT_NAMES = ("arrive", "dispatch", "run", "preempt", "complete", "idle", "demote", "run_start", "run_end",
+               "boost", "migrate", "sleep", "wake", "quantum", "slice", "arrival_preempt")
+
+
+# Whether a workload's times are Python ints, so the SRTF log can print them the way the original did
+def given_as_ints(processes_input):
+    return isinstance(processes_input, (list, tuple)) and all(
+        type(p.arrival_time) is int and type(p.burst_time) is int for p in processes_input)
+
+
+# Base sink, also used as the silent sink
+class EventSink:
+    enabled = True
+
+    def emit(self, kind, time, pid=-1, a=0.0, b=0.0):
+        pass
+
+    def close(self):
+        pass
+
+
+class SilentSink(EventSink):
+    enabled = False
+
+
+# The original human readable log written to the terminal
+class ConsoleSink(EventSink):
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        # Enough of the run's state to print each scheduler's original log lines: whether the processes
+        # have queue levels (MLFQ), the quantum of each level, each running process's level and remaining
+        # time, the slice reported for the next run, and who took over at the last preemption
+        self.levels = False
+        self.num_queues = 0
+        self.quantums = []
+        self.running = {}
+        self.slice = None
+        self.preempted_by = -1
+        self.ints = False
+        self.int_clock = True
+
+    # The original SRTF printed its clock and remaining times as Python had them: ints for int input,
+    # otherwise floats. Its clock started as the int 0 and stayed an int through steps of exactly 1, so even
+    # float input printed "Time 1" until the first other step or idle jump.
+    def raw(self, value):
+        return int(value) if self.ints and float(value).is_integer() else float(value)
+
+    def clock(self, time):
+        return int(time) if (self.ints or self.int_clock) and float(time).is_integer() else float(time)
+
+    def emit(self, kind, time, pid=-1, a=0.0, b=0.0):
+        # Single ready queue schedulers (SRTF and the proportional share ones) log raw times, MLFQ two decimals
+        raw = self.raw
+        clock = self.clock
+        if kind == EVENT_ARRIVE:
+            if a < 0:
+                line = f"Time {clock(time)}: Process {pid} arrived, added to ready queue."
+            else:
+                self.levels = True
+                line = f"Time {time:.2f}: Process {pid} arrived, added to Q{a}."
+        elif kind == EVENT_DISPATCH:
+            self.running[pid] = [b, a]
+            if b < 0:
+                if pid == self.preempted_by:
+                    line = f"Time {clock(time)}: Process {pid} starts execution."
+                else:
+                    line = f"Time {clock(time)}: Process {pid} starts/resumes execution (Remaining: {a:.2f})."
+            else:
+                self.levels = True
+                quantum = f"Quantum: {self.quantums[b]:g}, " if b < len(self.quantums) else ""
+                line = f"Time {time:.2f}: Process {pid} selected from Q{b} to run ({quantum}Remaining: {a:.2f})."
+            self.preempted_by = -1
+        elif kind == EVENT_SLICE:
+            self.slice = (pid, a, b)
+            return
+        elif kind == EVENT_RUN:
+            state = self.running.get(pid)
+            if state is not None:
+                state[1] = b
+            if self.slice is not None and self.slice[0] == pid:
+                _, level, slice_left = self.slice
+                self.slice = None
+                if state is not None:
+                    state[0] = level
+                line = (f"Time {time:.2f}: Process {pid} (Q{level}) ran for {a:.2f}. Remaining: {b:.2f}. "
+                        f"Slice left: {slice_left:.2f}")
+            elif self.levels:
+                line = f"Time {time:.2f}: Process {pid} executed for {a:.2f}. Remaining time: {b:.2f}"
+            else:
+                self.int_clock = self.int_clock and a == 1
+                line = f"Time {clock(time)}: Process {pid} executed for {a:.2f}. Remaining time: {b:.2f}"
+        elif kind == EVENT_PREEMPT:
+            state = self.running.get(pid)
+            if self.levels:
+                level = f" (running from Q{state[0]})" if state is not None else ""
+                by = "Arrival in Q0" if a < 0 else f"Process {a} (RT: {b:.2f})"
+                line = f"Time {time:.2f}: {by} preempts Process {pid}{level}."
+            else:
+                running = f" (RT: {state[1]:.2f})" if state is not None else ""
+                line = f"Time {clock(time)}: Process {a} in queue (RT: {b:.2f}) preempts running Process {pid}{running}."
+            self.preempted_by = a
+        elif kind == EVENT_ARRIVAL_PREEMPT:
+            state = self.running.get(pid)
+            running = f" (RT: {raw(state[1])})" if state is not None else ""
+            line = f"Time {clock(time)}: Newly arrived Process {a} (RT: {raw(b)}) preempts running Process {pid}{running}."
+        elif kind == EVENT_COMPLETE:
+            self.running.pop(pid, None)
+            line = f"Time {time:.2f}: Process {pid} completed." if self.levels else f"Time {clock(time)}: Process {pid} completed."
+        elif kind == EVENT_IDLE:
+            self.int_clock = False
+            line = f"Time {time:.2f}-{a:.2f}: CPU Idle."
+        elif kind == EVENT_DEMOTE:
+            line = f"Time {time:.2f}: Process {pid} quantum expired in Q{a}. Moving to Q{b}."
+        elif kind == EVENT_RUN_START:
+            self.levels = a > 0
+            self.num_queues = a
+            self.quantums = []
+            self.running = {}
+            self.ints = b > 0
+            self.int_clock = True
+            if a == 0:
+                return # the original SRTF log has no header
+            line = "MLFQ Run Start"
+        elif kind == EVENT_QUANTUM:
+            self.quantums.append(b)
+            if len(self.quantums) < self.num_queues:
+                return
+            line = f"Queues: {self.num_queues}, Time Quantums: [{', '.join(f'{q:g}' for q in self.quantums)}]"
+        elif kind == EVENT_RUN_END:
+            levels = self.levels
+            self.levels = False
+            self.ints = False
+            self.running = {}
+            if not levels:
+                return
+            line = "MLFQ Run End"
+        elif kind == EVENT_BOOST:
+            line = f"Time {time:.2f}: Priority boost, {a} processes moved to Q0."
+        elif kind == EVENT_MIGRATE:
+            line = f"Time {time:.2f}: Process {pid} migrates from CPU {a} to CPU {b}."
+        elif kind == EVENT_SLEEP:
+            self.running.pop(pid, None)
+            line = f"Time {time:.2f}: Process {pid} waits on I/O for {a:.2f}."
+        elif kind == EVENT_WAKE:
+            where = "ready queue" if a < 0 else f"Q{a}"
+            line = f"Time {time:.2f}: Process {pid} finished I/O, added to {where} (Next burst: {b:.2f})."
+        else:
+            line = f"Time {time:.2f}: {kind} {pid} {a} {b}"
+        print(line, file=self.stream)
 
-        #even if the cpu is doing something, still check to see if it should switch processes
-        elif not is_cpu_idle and ready_queue:
-             if current_process is not None and ready_queue[0].remaining_time < current_process.remaining_time:
-                print(f"Time {current_time}: Process {ready_queue[0].pid} in queue (RT: {ready_queue[0].remaining_time:.2f}) preempts running Process {current_process.pid} (RT: {current_process.remaining_time:.2f}).")
-                if current_time > last_event_time:
-                    scheduled_order.append((current_process.pid, last_event_time, current_time))
-                heapq.heappush(ready_queue, current_process)
-                current_process = heapq.heappop(ready_queue)
-                if current_process.start_time == -1: # First time running
-                     current_process.start_time = current_time
 
-                print(f"Time {current_time}: Process {current_process.pid} starts execution.")
-                last_event_time = current_time
+# Keeps only the last `capacity` events in memory, handy for looking at what led up to a problem
+class RingBufferSink(EventSink):
+    def __init__(self, capacity=10000):
+        self.buffer = deque(maxlen=capacity)
 
+    def emit(self, kind, time, pid=-1, a=0.0, b=0.0):
+        self.buffer.append((kind, time, pid, a, b))
 
-        if not is_cpu_idle and current_process is not None:
-             # Determine time until next event
-            time_to_next_arrival = float('inf')
-            if process_idx < num_processes:
-                time_to_next_arrival = processes[process_idx].arrival_time - current_time
+    def events(self):
+        return list(self.buffer)
 
-            time_to_completion = current_process.remaining_time
 
+# Writes one JSON object per line, buffering events and writing them in batches
+class JsonlEventSink(EventSink):
+    def __init__(self, path, batch_size=65536):
+        self.file = open(path, "w", encoding="utf-8")
+        self.batch_size = batch_size
+        self.pending = []
 
-            time_to_potential_preemption = float('inf')
-            if ready_queue:
-                 if current_process.remaining_time > ready_queue[0].remaining_time:
-                     time_diff = current_process.remaining_time - ready_queue[0].remaining_time
-                     time_to_potential_preemption = time_diff # Check exactly when they become equal, preemption happens next moment
+    def emit(self, kind, time, pid=-1, a=0.0, b=0.0):
+        self.pending.append((kind, time, pid, a, b))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
 
-            time_step = max(1, min(time_to_next_arrival if time_to_next_arrival > 0 else float('inf'),
-                                   time_to_completion,
-                                   time_to_potential_preemption if time_to_potential_preemption > 0 else float('inf')
-                                   ))
+    # Infinite values (the last MLFQ quantum, the slice left on it) are written as null, since JSON has no
+    # Infinity; allow_nan=False makes sure nothing else non-finite gets through as invalid JSON
+    def flush(self):
+        inf = float('inf')
+        self.file.write("".join(
+            json.dumps({"event": EVENT_NAMES[kind], "time": time if -inf < time < inf else None, "pid": pid,
+                        "a": a if -inf < a < inf else None, "b": b if -inf < b < inf else None},
+                       allow_nan=False) + "\n"
+            for kind, time, pid, a, b in self.pending))
+        self.pending.clear()
 
+    def close(self):
+        self.flush()
+        self.file.close()
 
-            # Execute for time_step
-            exec_time = min(time_step, current_process.remaining_time) # Cannot execute more than remaining time
-            current_process.remaining_time -= exec_time
-            current_time += exec_time
-            print(f"Time {current_time}: Process {current_process.pid} executed for {exec_time:.2f}. Remaining time: {current_process.remaining_time:.2f}")
 
-            # Check for completion
-            if current_process.remaining_time <= 0.00001:
-                current_process.completion_time = current_time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-                completed_processes_list.append(current_process)
-                processes_completed += 1
-                print(f"Time {current_time}: Process {current_process.pid} completed.")
-                scheduled_order.append((current_process.pid, last_event_time, current_time))
-                current_process = None
-                is_cpu_idle = True
-
-
-        elif is_cpu_idle and not ready_queue and process_idx < num_processes:
-            idle_start = current_time
-            current_time = processes[process_idx].arrival_time
-            print(f"Time {idle_start:.2f}-{current_time:.2f}: CPU Idle.")
-            last_event_time = current_time
+# Fixed-width little endian records: kind (uint8), time (double), pid (int64), a (double), b (double)
+EVENT_RECORD = struct.Struct("<Bdqdd")
 
-        # If CPU isn't doing anything, queue is empty, and all processes have arrived but not all completed
-        elif is_cpu_idle and not ready_queue and process_idx == num_processes and processes_completed < num_processes:
-             print(f"Time {current_time}: CPU Idle, waiting. Should not happen for long.")
-             # To prevent potential infinite loop if something is wrong:
-             current_time += 1
 
+class BinaryEventSink(EventSink):
+    def __init__(self, path, batch_size=65536):
+        self.file = open(path, "wb")
+        self.batch_size = batch_size
+        self.pending = []
 
-        #all processes accounted for and all completed
-        elif processes_completed == num_processes and process_idx == num_processes:
-             break
+    def emit(self, kind, time, pid=-1, a=0.0, b=0.0):
+        self.pending.append((kind, time, pid, a, b))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
 
+    def flush(self):
+        pack = EVENT_RECORD.pack
+        self.file.write(b"".join([pack(*event) for event in self.pending]))
+        self.pending.clear()
 
-    # Sort completed list by PID for consistent reporting
-    completed_processes_list.sort(key=lambda p: p.pid)
-    return scheduled_order, completed_processes_list
+    def close(self):
+        self.flush()
+        self.file.close()
 
 
-# 2. Multi Level Feedback Queue (MLFQ) Implementation
-def mlfq_scheduler(processes_input, time_quantums=[5, 10, float('inf')], num_queues=3):
-    # Use deep copies to keep original process data intact for metrics
-    processes_original = {p.pid: p for p in processes_input}
-    process_copies = copy.deepcopy(processes_input)
-    process_copies.sort(key=lambda p: p.arrival_time) # Sort by arrival time
-
-    num_processes = len(process_copies)
-    completed_processes_list = [] # Store original objects with updated metrics
-    scheduled_order = []
-    # Queues for each level, holding Process objects (copies)
-    queues = [deque() for _ in range(num_queues)]
-    # Keep track of which queue each process (by pid) is currently in
-    process_queue_level = {p.pid: -1 for p in process_copies}
+# Reads back a file written by BinaryEventSink, one event tuple at a time
+def read_binary_events(path):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(EVENT_RECORD.size * 65536)
+            if not chunk:
+                break
+            yield from EVENT_RECORD.iter_unpack(chunk)
+
+
+# Instrumentation
+# Counters, optional per-phase timers and callbacks for the scheduler loops. Pass an Instrumentation as
+# `instrument=` to srtf_scheduler or mlfq_scheduler. Counters are kept in plain local variables either way and
+# only copied in at the end of a run; timers and callbacks are skipped entirely unless turned on, so an
+# uninstrumented run pays a few untaken branches at most.
+#   timers: time the loop phases ("admit" arrivals, "boost", "select" the next process, "run" it forward)
+#   on_arrival(time, pid), on_dispatch(time, pid), on_preempt(time, pid, by_pid), on_complete(time, pid),
+#   on_demote(time, pid, from_level, to_level): called as those things happen (by_pid is -1 when not known)
+INSTRUMENT_COUNTERS = ("arrivals", "wakeups", "dispatches", "ready_pushes", "ready_pops", "preemptions",
+                       "idle_jumps", "quantum_expirations", "demotions", "boosts", "completions")
+INSTRUMENT_PHASES = ("admit", "boost", "select", "run")
+
+
+class Instrumentation:
+    def __init__(self, timers=False, on_arrival=None, on_dispatch=None, on_preempt=None, on_complete=None,
+                 on_demote=None):
+        self.timers = timers
+        self.on_arrival = on_arrival
+        self.on_dispatch = on_dispatch
+        self.on_preempt = on_preempt
+        self.on_complete = on_complete
+        self.on_demote = on_demote
+        # ready_pushes/ready_pops are heap operations for SRTF, CFS and stride, queue operations for MLFQ and
+        # TicketTree insertions/removals for lottery
+        self.counters = dict.fromkeys(INSTRUMENT_COUNTERS, 0)
+        self.phase_seconds = dict.fromkeys(INSTRUMENT_PHASES, 0.0)
+        self.runs = 0
+        self.wall_seconds = 0.0
+
+    # Called by the schedulers at the end of a run
+    def add_run(self, wall_seconds, counters, phase_seconds=None):
+        self.runs += 1
+        self.wall_seconds += wall_seconds
+        for name, value in counters.items():
+            self.counters[name] += value
+        if phase_seconds:
+            for name, value in phase_seconds.items():
+                self.phase_seconds[name] += value
+
+    def summary(self):
+        profile = {"runs": self.runs, "wall_seconds": self.wall_seconds, "counters": dict(self.counters)}
+        if self.timers:
+            profile["phase_seconds"] = dict(self.phase_seconds)
+        return profile
+
+    def format_summary(self):
+        lines = [f"Profile: {self.runs} run(s), {self.wall_seconds:.3f}s"]
+        for name in INSTRUMENT_COUNTERS:
+            lines.append(f"  {name:<20} {self.counters[name]:>14,}")
+        if self.timers:
+            timed = sum(self.phase_seconds.values()) or 1.0
+            for name in INSTRUMENT_PHASES:
+                seconds = self.phase_seconds[name]
+                lines.append(f"  {name + ' phase':<20} {seconds:>13.3f}s {seconds / timed * 100:>6.1f}%")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+# Synthetic workloads
+# generate_workload builds an n process ProcessTable in bulk, seeded so runs can be reproduced.
+#   arrival: "poisson" (exponential gaps at `rate` arrivals per time unit) or "bursty" (the same average
+#       rate, but processes arrive in batches averaging `mean_batch` processes at the same moment)
+#   burst: "exponential" (mean `mean_burst`), "pareto" (heavy tailed with shape `pareto_shape`, scaled to
+#       mean `mean_burst`) or "bimodal" (`short_fraction` of processes average `short_burst`, the rest `long_burst`)
+# NumPy is used when it is installed (10M processes take well under a second); otherwise the same
+# distributions are drawn with the random module, which is much slower for large n.
+ARRIVAL_PATTERNS = ("poisson", "bursty")
+BURST_DISTRIBUTIONS = ("exponential", "pareto", "bimodal")
+
+
+def generate_workload(n, seed=None, arrival="poisson", rate=1.0, mean_batch=8.0, burst="exponential",
+                      mean_burst=1.0, pareto_shape=1.5, short_burst=1.0, long_burst=20.0, short_fraction=0.8):
+    if arrival not in ARRIVAL_PATTERNS:
+        raise ValueError(f"Unknown arrival pattern '{arrival}' (expected one of {ARRIVAL_PATTERNS})")
+    if burst not in BURST_DISTRIBUTIONS:
+        raise ValueError(f"Unknown burst distribution '{burst}' (expected one of {BURST_DISTRIBUTIONS})")
+    if burst == "pareto" and pareto_shape <= 1:
+        raise ValueError("pareto_shape must be greater than 1 for the mean burst time to exist")
+    if np is None:
+        return _generate_workload_python(n, seed, arrival, rate, mean_batch, burst, mean_burst, pareto_shape,
+                                         short_burst, long_burst, short_fraction)
+
+    rng = np.random.default_rng(seed)
+    if arrival == "poisson":
+        arrivals = np.cumsum(rng.standard_exponential(n))
+        arrivals *= 1.0 / rate
+    else:
+        # Geometric batch sizes, with the gaps between batches stretched so the average rate stays the same
+        num_batches = int(n / mean_batch) + 16
+        sizes = rng.geometric(1.0 / mean_batch, num_batches)
+        while sizes.sum() < n:
+            sizes = np.concatenate((sizes, rng.geometric(1.0 / mean_batch, num_batches)))
+        batch_times = np.cumsum(rng.exponential(mean_batch / rate, len(sizes)))
+        arrivals = np.repeat(batch_times, sizes)[:n]
+
+    # Drawn in place from the standard distributions, which is several times faster than rng.pareto etc.
+    if burst == "exponential":
+        bursts = rng.standard_exponential(n)
+        bursts *= mean_burst
+    elif burst == "pareto":
+        # Inverse transform: scale * U ** (-1 / shape) with U uniform on (0, 1]
+        bursts = rng.random(n)
+        np.subtract(1.0, bursts, out=bursts)
+        np.power(bursts, -1.0 / pareto_shape, out=bursts)
+        bursts *= mean_burst * (pareto_shape - 1) / pareto_shape
+    else:
+        bursts = rng.standard_exponential(n)
+        bursts *= np.where(rng.random(n) < short_fraction, short_burst, long_burst)
+    # Every process needs some CPU time
+    np.maximum(bursts, MIN_BURST_TIME, out=bursts)
+
+    return ProcessTable.from_arrays(np.arange(1, n + 1, dtype=np.int64), arrivals, bursts)
+
+
+def _generate_workload_python(n, seed, arrival, rate, mean_batch, burst, mean_burst, pareto_shape,
+                              short_burst, long_burst, short_fraction):
+    rng = random.Random(seed)
+    arrivals = array('d')
+    current_time = 0.0
+    if arrival == "poisson":
+        for _ in range(n):
+            current_time += rng.expovariate(rate)
+            arrivals.append(current_time)
+    else:
+        while len(arrivals) < n:
+            current_time += rng.expovariate(rate / mean_batch)
+            # Geometric batch size with mean mean_batch
+            size = 1
+            while rng.random() >= 1.0 / mean_batch:
+                size += 1
+            arrivals.extend(array('d', [current_time]) * min(size, n - len(arrivals)))
+
+    if burst == "exponential":
+        bursts = [rng.expovariate(1.0 / mean_burst) for _ in range(n)]
+    elif burst == "pareto":
+        scale = mean_burst * (pareto_shape - 1) / pareto_shape
+        bursts = [rng.paretovariate(pareto_shape) * scale for _ in range(n)]
+    else:
+        bursts = [rng.expovariate(1.0) * (short_burst if rng.random() < short_fraction else long_burst)
+                  for _ in range(n)]
+    return ProcessTable(range(1, n + 1), arrivals, [max(b, MIN_BURST_TIME) for b in bursts])
+
+
+# Makes a fraction of a workload's processes I/O bound: the CPU time of each one picked is cut into
+# cpu_bursts bursts of random length with exponentially distributed I/O waits (mean mean_io) in between.
+# CPU totals stay the same, so results can be compared with the CPU-only workload. Returns a new table.
+def add_io_bursts(table, fraction=0.5, cpu_bursts=4, mean_io=5.0, seed=None):
+    table = ProcessTable.from_processes(table)
+    rng = random.Random(seed)
+    burst_lists = []
+    for burst in table.bursts:
+        if cpu_bursts > 1 and rng.random() < fraction:
+            cuts = sorted(rng.random() for _ in range(cpu_bursts - 1))
+            row_bursts = []
+            for i, (low, high) in enumerate(zip([0.0] + cuts, cuts + [1.0])):
+                if i:
+                    row_bursts.append(rng.expovariate(1.0 / mean_io))
+                row_bursts.append(max(burst * (high - low), MIN_BURST_TIME))
+            burst_lists.append(row_bursts)
+        else:
+            burst_lists.append((burst,))
+    io_table = ProcessTable(table.pids, table.arrivals, table.bursts)
+    io_table.set_phases(burst_lists)
+    return io_table
+
+
+# Trace loading
+# Every loader is a generator of (pid, arrival_time, burst_time) rows, so a trace is read as the
+# schedulers need it instead of being loaded up front. Traces must already be sorted by arrival time.
+TRACE_COLUMNS = {"pid": "pid", "arrival": "arrival_time", "burst": "burst_time"}
+# Fixed-width little endian records: pid (int64), arrival time (double), burst time (double)
+TRACE_RECORD = struct.Struct("<qdd")
+
+
+# Fills in the default column names for anything the mapping leaves out
+def trace_columns(columns=None):
+    mapping = dict(TRACE_COLUMNS)
+    if columns:
+        mapping.update(columns)
+    return mapping
+
+
+# Rows from a CSV file with a header line. Without a pid column processes are numbered from 1.
+def iter_csv_trace(path, columns=None):
+    mapping = trace_columns(columns)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip() for name in header]
+        try:
+            arrival_col = header.index(mapping["arrival"])
+            burst_col = header.index(mapping["burst"])
+        except ValueError:
+            raise ValueError(f"{path}: CSV header {header} is missing the arrival or burst column") from None
+        pid_col = header.index(mapping["pid"]) if mapping["pid"] in header else -1
+        for number, record in enumerate(reader, 1):
+            if not record:
+                continue
+            pid = int(record[pid_col]) if pid_col >= 0 else number
+            yield pid, float(record[arrival_col]), float(record[burst_col])
+
+
+# Rows from a file with one JSON object per line
+def iter_jsonl_trace(path, columns=None):
+    mapping = trace_columns(columns)
+    pid_key, arrival_key, burst_key = mapping["pid"], mapping["arrival"], mapping["burst"]
+    with open(path, encoding="utf-8") as f:
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            record = json.loads(line)
+            yield int(record.get(pid_key, number)), float(record[arrival_key]), float(record[burst_key])
+
+
+# Rows from a binary trace, read through a memory map so only the pages in use are loaded
+def iter_binary_trace(path, chunk_records=65536):
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % TRACE_RECORD.size:
+            raise ValueError(f"{path}: size is not a multiple of the {TRACE_RECORD.size} byte record size")
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                chunk_bytes = TRACE_RECORD.size * chunk_records
+                for offset in range(0, size, chunk_bytes):
+                    yield from TRACE_RECORD.iter_unpack(view[offset:offset + chunk_bytes])
+            finally:
+                view.release()
+
+
+# Writes rows (or a ProcessTable / list of Process objects) in the binary trace format
+def write_binary_trace(path, rows):
+    if isinstance(rows, ProcessTable) or (isinstance(rows, list) and rows and isinstance(rows[0], Process)):
+        table = ProcessTable.from_processes(rows)
+        rows = zip(table.pids, table.arrivals, table.bursts)
+    pack = TRACE_RECORD.pack
+    with open(path, "wb") as f:
+        batch = []
+        for row in rows:
+            batch.append(pack(*row))
+            if len(batch) >= 65536:
+                f.write(b"".join(batch))
+                batch.clear()
+        f.write(b"".join(batch))
+
+
+# Picks the loader from the format name or the file extension
+def load_trace(path, trace_format=None, columns=None):
+    if trace_format is None:
+        trace_format = os.path.splitext(path)[1].lstrip(".").lower()
+    if trace_format == "csv":
+        return iter_csv_trace(path, columns)
+    if trace_format in ("jsonl", "json", "ndjson"):
+        return iter_jsonl_trace(path, columns)
+    if trace_format in ("bin", "trace"):
+        return iter_binary_trace(path)
+    raise ValueError(f"Unknown trace format '{trace_format}' (expected csv, jsonl or bin)")
+
+
+# Feeds rows from a trace into a growing ProcessTable a chunk at a time. The schedulers call fill()
+# whenever they have admitted every row loaded so far.
+class TraceStream:
+    def __init__(self, rows, chunk_size=65536):
+        self.rows = iter(rows)
+        self.chunk_size = chunk_size
+        self.table = ProcessTable()
+        self.exhausted = False
+
+    # Loads the next chunk into the table and the run's columns, returns the new row count
+    def fill(self, run):
+        table = self.table
+        if self.exhausted:
+            return len(table)
+        arrivals = table.arrivals
+        last_arrival = arrivals[-1] if arrivals else float('-inf')
+        loaded = 0
+        for pid, arrival, burst in itertools.islice(self.rows, self.chunk_size):
+            if arrival < last_arrival:
+                raise ValueError(f"Trace is not sorted by arrival time (pid {pid} arrives at {arrival} after {last_arrival})")
+            last_arrival = arrival
+            table.append(pid, arrival, burst)
+            run.remaining.append(burst)
+            run.start.append(-1.0)
+            run.completion.append(-1.0)
+            loaded += 1
+        if loaded < self.chunk_size:
+            self.exhausted = True
+        return len(table)
+
+
+# Turns any scheduler input into (table, run columns, stream). A ProcessTable or a list of Process
+# objects is used as is; anything else is treated as rows in arrival order and streamed, in which case
+# stream is the TraceStream that fills the table.
+def open_workload(processes_input):
+    if isinstance(processes_input, ProcessTable) or (
+            isinstance(processes_input, (list, tuple)) and (not processes_input or isinstance(processes_input[0], Process))):
+        table = ProcessTable.from_processes(processes_input).sorted_by_arrival()
+        return table, table.scratch(), None
+    stream = processes_input if isinstance(processes_input, TraceStream) else TraceStream(processes_input)
+    run = stream.table.scratch()
+    stream.fill(run)
+    return stream.table, run, stream
+
+
+
+# The whole workload as one ProcessTable in arrival order, for code that needs every row up front (the
+# sweep and comparison workers). Takes the same inputs as the schedulers.
+def load_workload(processes_input):
+    table, run, stream = open_workload(processes_input)
+    while stream is not None and not stream.exhausted:
+        stream.fill(run)
+    return table
+
+# Execution segments
+# The schedule ((pid, start, end) for every stretch of CPU time) kept as three typed arrays. Back to back
+# segments of the same process are merged as they are added. With a memory_budget (in bytes) older
+# segments are written out to temporary column files and read back through memory maps, so only the
+# newest ones stay in memory. Behaves like a read-only list of (pid, start, end) tuples.
+class SegmentStore:
+    SEGMENT_BYTES = 24
+
+    def __init__(self, memory_budget=None, spill_dir=None):
+        self.pids = array('q')
+        self.starts = array('d')
+        self.ends = array('d')
+        self.max_in_memory = max(2, memory_budget // self.SEGMENT_BYTES) if memory_budget else None
+        self.spill_dir = spill_dir
+        self.spill_files = None # pid, start and end column files once something has been spilled
+        self.spilled = 0
+        self.spilled_views = None
+        self.last_pid = None
+        self.last_end = None
+
+    def append(self, pid, start, end):
+        if pid == self.last_pid and start == self.last_end:
+            self.ends[-1] = end
+            self.last_end = end
+            return
+        self.pids.append(pid)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.last_pid = pid
+        self.last_end = end
+        if self.max_in_memory is not None and len(self.pids) > self.max_in_memory:
+            self.spill()
+
+    # Writes everything but the newest segment (which may still be extended) to the spill files
+    def spill(self):
+        count = len(self.pids) - 1
+        if count <= 0:
+            return
+        self._release_views()
+        if self.spill_files is None:
+            self.spill_files = [tempfile.TemporaryFile(dir=self.spill_dir) for _ in range(3)]
+        for f, column in zip(self.spill_files, (self.pids, self.starts, self.ends)):
+            f.seek(0, os.SEEK_END)
+            f.write(memoryview(column)[:count].cast("B"))
+            f.flush()
+            del column[:count]
+        self.spilled += count
+
+    # Memory mapped (pids, starts, ends) views of the spilled segments, opened on first use
+    def _views(self):
+        if self.spilled_views is None:
+            maps = [mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) for f in self.spill_files]
+            views = [memoryview(m).cast(code) for m, code in zip(maps, "qdd")]
+            self.spilled_views = (maps, views)
+        return self.spilled_views[1]
+
+    def _release_views(self):
+        if self.spilled_views is not None:
+            maps, views = self.spilled_views
+            for view in views:
+                view.release()
+            for m in maps:
+                m.close()
+            self.spilled_views = None
+
+    def close(self):
+        self._release_views()
+        if self.spill_files is not None:
+            for f in self.spill_files:
+                f.close()
+            self.spill_files = None
+
+    def __len__(self):
+        return self.spilled + len(self.pids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("segment index out of range")
+        if i < self.spilled:
+            pids, starts, ends = self._views()
+            return pids[i], starts[i], ends[i]
+        i -= self.spilled
+        return self.pids[i], self.starts[i], self.ends[i]
+
+    def __iter__(self):
+        return self.iter_range(0, len(self))
+
+    # Segments number first to last - 1, in order
+    def iter_range(self, first, last):
+        if first < self.spilled:
+            pids, starts, ends = self._views()
+            for i in range(first, min(last, self.spilled)):
+                yield pids[i], starts[i], ends[i]
+        pids, starts, ends = self.pids, self.starts, self.ends
+        for i in range(max(first, self.spilled) - self.spilled, last - self.spilled):
+            yield pids[i], starts[i], ends[i]
+
+    # Segments that overlap the time window (t1, t2), found by binary search since the schedule is in time order
+    def between(self, t1, t2):
+        if self.spilled:
+            first = bisect.bisect_right(self._views()[2], t1)
+            if first == self.spilled:
+                first += bisect.bisect_right(self.ends, t1)
+        else:
+            first = bisect.bisect_right(self.ends, t1)
+        for segment in self.iter_range(first, len(self)):
+            if segment[1] >= t2:
+                break
+            yield segment
+
+    def to_list(self):
+        return list(self)
+
+    # Copies of the (pids, starts, ends) columns, spilled segments included
+    def columns(self):
+        columns = (array('q'), array('d'), array('d'))
+        if self.spilled:
+            for column, view in zip(columns, self._views()):
+                column.frombytes(view.cast("B"))
+        for column, own in zip(columns, (self.pids, self.starts, self.ends)):
+            column.extend(own)
+        return columns
+
+    # A store holding the given columns (e.g. from columns())
+    @classmethod
+    def from_columns(cls, pids, starts, ends):
+        store = cls()
+        store.pids.extend(pids)
+        store.starts.extend(starts)
+        store.ends.extend(ends)
+        if store.pids:
+            store.last_pid = store.pids[-1]
+            store.last_end = store.ends[-1]
+        return store
+
+    # Drops the segments added since the store held `length` of them and rewinds the last one's end
+    # (it may have been extended by merging since). Segments already spilled to disk can not be dropped.
+    def truncate(self, length, last_pid, last_end):
+        keep = length - self.spilled
+        if keep < (1 if length else 0):
+            raise ValueError("Can not truncate segments that were already spilled to disk")
+        del self.pids[keep:]
+        del self.starts[keep:]
+        del self.ends[keep:]
+        if keep:
+            self.ends[-1] = last_end
+        self.last_pid = last_pid
+        self.last_end = last_end
 
-    current_time = 0
-    processes_completed = 0
-    process_idx = 0 # Index for the sorted list of arriving processes
-    current_process = None # The process currently holding the CPU
-    current_queue_level = -1 # The queue the current_process came from
-    time_slice_left = 0 # Time left in the current quantum for the running process
-    last_event_time = 0 # Start time of the current execution block
-    is_cpu_idle = True
-
-
-    print("MLFQ Run Start")
-    print(f"Queues: {num_queues}, Time Quantums: {time_quantums}")
-
-    while processes_completed < num_processes:
-        #First thing that is checked on every loop is the new processes
-        newly_arrived_pids = []
-        while process_idx < num_processes and process_copies[process_idx].arrival_time <= current_time:
-            #new processes start at the top of the priority queue
-            arriving_process = process_copies[process_idx]
-            print(f"Time {current_time:.2f}: Process {arriving_process.pid} arrived, added to Q0.")
-            queues[0].append(arriving_process)
-            process_queue_level[arriving_process.pid] = 0
-            newly_arrived_pids.append(arriving_process.pid)
-            process_idx += 1
+    def __repr__(self):
+        return f"SegmentStore({len(self)} segments, {self.spilled} spilled)"
+
+
+# Scheduler runs
+# The state one scheduler run works on: the workload's table and run columns, where the log goes, the
+# metrics and schedule being filled in and the instrumentation hooks. The SRTF and MLFQ runs keep the rest
+# of their state on the object too, so advance(until) can stop part way through and carry on in a later
+# call: srtf_scheduler and mlfq_scheduler make one call that runs to the end, Simulator one per update.
+# Each advance() copies the state into local variables and back, so the loops themselves run on locals.
+class _SchedulerRun:
+    # Scalar state saved by snapshot(), extended by the subclasses
+    _SCALARS = ("current_time", "process_idx", "num_processes", "last_event_time", "context_switches",
+                "preemptions")
+
+    def __init__(self, processes_input, sink=None, metrics=None, keep_completed=True, segments=None, instrument=None):
+        # Works on the table columns directly, the input processes are never modified.
+        # Streamed input (an iterable of rows) is loaded into the table as the simulation reaches it.
+        self.table, self.run, self.stream = open_workload(processes_input)
+        # Default to the original terminal log; pass SilentSink() to turn logging off
+        self.sink = sink if sink is not None else ConsoleSink()
+        self.metrics = metrics
+        self.keep_completed = keep_completed
+        self.completed_rows = []
+        # Execution segments, merged as they are added and optionally spilled to disk (see SegmentStore)
+        self.segments = segments if segments is not None else SegmentStore()
+        # Instrumentation hooks stay None/False unless an Instrumentation is passed in
+        self.instrument = instrument
+        if instrument is not None:
+            self.timed = instrument.timers
+            self.on_arrival, self.on_dispatch = instrument.on_arrival, instrument.on_dispatch
+            self.on_preempt, self.on_complete = instrument.on_preempt, instrument.on_complete
+            self.on_demote = instrument.on_demote
+            self.run_started = time.perf_counter()
+        else:
+            self.timed = False
+            self.on_arrival = self.on_dispatch = self.on_preempt = self.on_complete = self.on_demote = None
+        self.current_time = 0
+        self.process_idx = 0 # Index of the next row to arrive (rows are in arrival order)
+        self.num_processes = len(self.table)
+        self.last_event_time = 0 # Start time of the current execution block
+        self.context_switches = 0
+        self.preemptions = 0
+
+    # Logs the start of the run: the number of queue levels (0 for a single ready queue) and whether the times
+    # were given as ints (see ConsoleSink.raw)
+    def start_run(self, num_queues=0, ints=False):
+        if self.sink.enabled:
+            self.sink.emit(EVENT_RUN_START, self.current_time, -1, num_queues, 1 if ints else 0)
+
+    # Logs the end of the run, adds its totals to the metrics and instrumentation and returns
+    # (SegmentStore, completed processes sorted by pid)
+    def end_run(self, end_time, context_switches, preemptions, counters, phase_seconds=None):
+        if self.sink.enabled:
+            self.sink.emit(EVENT_RUN_END, end_time)
+        if self.metrics is not None:
+            self.metrics.context_switches += context_switches
+            self.metrics.preemptions += preemptions
+        if self.instrument is not None:
+            self.instrument.add_run(time.perf_counter() - self.run_started, counters,
+                                    phase_seconds if self.timed else None)
+        # Sort completed list by PID for consistent reporting
+        completed_processes_list = [self.table.process(row, self.run) for row in self.completed_rows]
+        completed_processes_list.sort(key=lambda p: p.pid)
+        return self.segments, completed_processes_list
+
+    # Adds a job that has not arrived yet (for Simulator.submit), after every row arriving by then.
+    # Returns its row; only rows that have not arrived move up to make room.
+    def add(self, pid, arrival_time, burst_time):
+        table, run = self.table, self.run
+        row = bisect.bisect_right(table.arrivals, arrival_time, self.process_idx)
+        for column, value in ((table.pids, pid), (table.arrivals, arrival_time), (table.bursts, burst_time),
+                              (run.remaining, burst_time), (run.start, -1.0), (run.completion, -1.0)):
+            column.insert(row, value)
+        self.num_processes += 1
+        return row
+
+    # The live state: the scalars, the rows that have not arrived yet and the columns of those that have but
+    # are not done. Completed rows never change again, so this is O(jobs in the system), not O(history).
+    # Only for tables without I/O bursts (as in Simulator).
+    def snapshot(self):
+        table, run, first = self.table, self.run, self.process_idx
+        state = {name: getattr(self, name) for name in self._SCALARS}
+        state["pending"] = (table.pids[first:], table.arrivals[first:], table.bursts[first:])
+        state["live"] = [(row, run.remaining[row], run.start[row]) for row in self.live_rows()]
+        return state
+
+    def restore(self, state):
+        table, run, first = self.table, self.run, state["process_idx"]
+        pids, arrivals, bursts = state["pending"]
+        for column, values in ((table.pids, pids), (table.arrivals, arrivals), (table.bursts, bursts),
+                               (run.remaining, bursts), (run.start, array('d', [-1.0]) * len(bursts)),
+                               (run.completion, array('d', [-1.0]) * len(bursts))):
+            del column[first:]
+            column.extend(values)
+        for row, remaining, start in state["live"]:
+            run.remaining[row] = remaining
+            run.start[row] = start
+            run.completion[row] = -1.0
+        for name in self._SCALARS:
+            setattr(self, name, state[name])
+
+
+# 1. Shortest Remaining Time First (SRTF) Implementation
+# Event driven: time only jumps between arrivals and completions, so the work done is
+# O(log n) heap operations per event no matter how long the simulated timeline is.
+#   metrics: optional MetricsAccumulator updated as each process completes
+#   keep_completed: set to False to skip building the completed Process list (it is returned empty), e.g.
+#       when metrics is enough and the workload is too big to keep a Process object per job
+#   segments: SegmentStore to record the schedule in, e.g. one with a memory_budget; a new one by default
+#   instrument: optional Instrumentation for counters, phase timers and callbacks (see Instrumentation)
+def srtf_scheduler(processes_input, sink=None, metrics=None, keep_completed=True, segments=None, instrument=None):
+    core = _SrtfRun(processes_input, sink, metrics, keep_completed, segments, instrument)
+    core.start_run(ints=given_as_ints(processes_input))
+    core.advance()
+    return core.finish()
+
+
+class _SrtfRun(_SchedulerRun):
+    _SCALARS = _SchedulerRun._SCALARS + ("current", "current_remaining", "idle_jumps", "wakeups")
+
+    def __init__(self, processes_input, sink=None, metrics=None, keep_completed=True, segments=None, instrument=None):
+        super().__init__(processes_input, sink, metrics, keep_completed, segments, instrument)
+        # Heap entries are (remaining, arrival, pid, row) which orders the same way as Process.__lt__
+        self.ready_queue = []
+        # Processes waiting on I/O as (wake up time, row), so the CPU keeps running others in the meantime
+        self.sleeping = []
+        self.current = None # heap entry of the running process
+        self.current_remaining = 0
+        self.idle_jumps = 0
+        self.wakeups = 0
+        self.admit_seconds = self.select_seconds = self.run_seconds = 0.0
+
+    def running_pid(self):
+        return self.current[2] if self.current is not None else None
+
+    def live_rows(self):
+        rows = [entry[3] for entry in self.ready_queue] + [row for _, row in self.sleeping]
+        if self.current is not None:
+            rows.append(self.current[3])
+        return rows
+
+    def snapshot(self):
+        state = super().snapshot()
+        state["ready_queue"] = list(self.ready_queue)
+        state["sleeping"] = list(self.sleeping)
+        return state
+
+    def restore(self, state):
+        super().restore(state)
+        self.ready_queue = list(state["ready_queue"])
+        self.sleeping = list(state["sleeping"])
+
+    # Runs the schedule up to `until`. Runs ending at `until` complete, but arrivals, preemptions and
+    # dispatches due then are left to the next call, and an idle CPU waits at the end of its last run while
+    # the next arrival is after `until` (jobs added in the meantime may come first).
+    def advance(self, until=float('inf')):
+        table, run, stream = self.table, self.run, self.stream
+        pids = table.pids
+        arrivals = table.arrivals
+        bursts = table.bursts
+        remaining = run.remaining
+        start = run.start
+        completion = run.completion
+        # Workloads with I/O bursts (see ProcessTable.set_phases), otherwise phase is None
+        phase = run.phase
+        phase_offsets = table.phase_offsets
+        phase_lengths = table.phase_lengths
+        io_times = table.io_times
+        sleeping = self.sleeping
+        ready_queue = self.ready_queue
+        completed_rows = self.completed_rows
+        keep_completed = self.keep_completed
+        metrics = self.metrics
+        record_segment = self.segments.append
+        log = self.sink.enabled
+        emit = self.sink.emit
+        current_time = self.current_time
+        process_idx = self.process_idx
+        num_processes = self.num_processes
+        current = self.current
+        current_remaining = self.current_remaining
+        last_event_time = self.last_event_time
+        context_switches = self.context_switches
+        preemptions = self.preemptions
+        idle_jumps = self.idle_jumps
+        wakeups = self.wakeups
+        perf_counter = time.perf_counter
+        timed = self.timed
+        on_arrival, on_dispatch = self.on_arrival, self.on_dispatch
+        on_preempt, on_complete = self.on_preempt, self.on_complete
+        admit_seconds, select_seconds, run_seconds = self.admit_seconds, self.select_seconds, self.run_seconds
+        announced = False # whether the log already has the preemption by an arrival at this time
+
+        while process_idx < num_processes or ready_queue or current is not None or sleeping:
+            if timed:
+                mark = perf_counter()
+            #if nothing is running or waiting, skip straight ahead to the next arrival
+            if current is None and not ready_queue:
+                next_arrival_time = arrivals[process_idx] if process_idx < num_processes else float('inf')
+                if sleeping and sleeping[0][0] < next_arrival_time:
+                    next_arrival_time = sleeping[0][0]
+                if next_arrival_time > current_time:
+                    if next_arrival_time > until:
+                        break
+                    if log:
+                        emit(EVENT_IDLE, current_time, -1, next_arrival_time)
+                    idle_jumps += 1
+                    current_time = next_arrival_time
+            # Decisions due at `until` itself are left to the next call
+            if current_time >= until:
+                break
+
+            # Add newly arrived processes to the ready queue
+            while process_idx < num_processes and arrivals[process_idx] <= current_time:
+                heapq.heappush(ready_queue, (remaining[process_idx], arrivals[process_idx], pids[process_idx], process_idx))
+                if log:
+                    emit(EVENT_ARRIVE, current_time, pids[process_idx], -1)
+                    # Logged where the original noticed it: at the first arrival that beats the running process
+                    if current is not None and not announced and remaining[process_idx] < current_remaining:
+                        emit(EVENT_ARRIVAL_PREEMPT, current_time, current[2], pids[process_idx], remaining[process_idx])
+                        announced = True
+                if on_arrival is not None:
+                    on_arrival(current_time, pids[process_idx])
+                process_idx += 1
+                if process_idx == num_processes and stream is not None:
+                    num_processes = stream.fill(run)
+            # Processes whose I/O has finished rejoin the ready queue with their next CPU burst
+            while sleeping and sleeping[0][0] <= current_time:
+                row = heapq.heappop(sleeping)[1]
+                heapq.heappush(ready_queue, (remaining[row], arrivals[row], pids[row], row))
+                if log:
+                    emit(EVENT_WAKE, current_time, pids[row], -1, remaining[row])
+                wakeups += 1
+            if timed:
+                tick = perf_counter()
+                admit_seconds += tick - mark
+                mark = tick
 
-        #Preemption Check on Arrival
-        # If a high-priority process arrived and CPU is running a lower-priority process is running, then stop the
-        #current process and work on the higher priority process.
-        if newly_arrived_pids and not is_cpu_idle and current_process is not None and current_queue_level > 0:
-            # Check if any new arrival is in Q0 (highest priority)
-             needs_preemption = any(process_queue_level[pid] == 0 for pid in newly_arrived_pids)
-             if needs_preemption:
-                print(f"Time {current_time:.2f}: Arrival in Q0 preempts Process {current_process.pid} (running from Q{current_queue_level}).")
+            #when a process arrives it checks if that process has less remaining time then the current process
+            #if it does then it interupts the current process and starts the other one
+            if current is not None and ready_queue and ready_queue[0][0] < current_remaining:
+                if log and not announced:
+                    emit(EVENT_PREEMPT, current_time, current[2], ready_queue[0][2], ready_queue[0][0])
+                announced = False
+                if on_preempt is not None:
+                    on_preempt(current_time, current[2], ready_queue[0][2])
+                preemptions += 1
+                context_switches += 1
+                if current_time > last_event_time:
+                    record_segment(current[2], last_event_time, current_time)
+                remaining[current[3]] = current_remaining
+                current = heapq.heappushpop(ready_queue, (current_remaining, current[1], current[2], current[3]))
+                current_remaining = current[0]
+                if start[current[3]] == -1: # First time running
+                    start[current[3]] = current_time
+                if log:
+                    emit(EVENT_DISPATCH, current_time, current[2], current_remaining, -1)
+                if on_dispatch is not None:
+                    on_dispatch(current_time, current[2])
+                last_event_time = current_time
+
+            #if the cpu is not doing anything and there are processes still waiting then pick a process
+            elif current is None:
+                current = heapq.heappop(ready_queue)
+                current_remaining = current[0]
+                context_switches += 1
+                if start[current[3]] == -1:
+                    start[current[3]] = current_time
+                if log:
+                    emit(EVENT_DISPATCH, current_time, current[2], current_remaining, -1)
+                if on_dispatch is not None:
+                    on_dispatch(current_time, current[2])
+                last_event_time = current_time
+
+            if timed:
+                tick = perf_counter()
+                select_seconds += tick - mark
+                mark = tick
+
+            # The running process only changes at the next arrival or when it finishes, whichever comes first.
+            # Nothing already in the ready queue can overtake it in between because only its remaining time shrinks.
+            next_arrival_time = arrivals[process_idx] if process_idx < num_processes else float('inf')
+            if sleeping and sleeping[0][0] < next_arrival_time:
+                next_arrival_time = sleeping[0][0]
+            if until < next_arrival_time:
+                next_arrival_time = until
+            finish_time = current_time + current_remaining
+
+            if finish_time <= next_arrival_time and phase is not None and phase[current[3]] + 1 < phase_offsets[current[3] + 1]:
+                # End of a CPU burst with more to come: wait out the I/O burst after it, off the CPU
+                exec_time = current_remaining
+                current_time = finish_time
+                row = current[3]
+                k = phase[row]
+                phase[row] = k + 2
+                remaining[row] = phase_lengths[k + 2]
+                heapq.heappush(sleeping, (current_time + phase_lengths[k + 1], row))
+                if log:
+                    emit(EVENT_RUN, current_time, current[2], exec_time, 0)
+                    emit(EVENT_SLEEP, current_time, current[2], phase_lengths[k + 1])
+                record_segment(current[2], last_event_time, current_time)
+                current = None
+            elif finish_time <= next_arrival_time:
+                exec_time = current_remaining
+                current_time = finish_time
+                row = current[3]
+                remaining[row] = 0
+                completion[row] = current_time
+                if keep_completed:
+                    completed_rows.append(row)
+                if metrics is not None:
+                    metrics.record(arrivals[row], bursts[row], start[row], current_time,
+                                   io_times[row] if io_times is not None else 0.0)
+                if log:
+                    emit(EVENT_RUN, current_time, current[2], exec_time, 0)
+                    emit(EVENT_COMPLETE, current_time, current[2])
+                if on_complete is not None:
+                    on_complete(current_time, current[2])
+                record_segment(current[2], last_event_time, current_time)
+                current = None
+            else:
+                exec_time = next_arrival_time - current_time
+                current_remaining -= exec_time
+                current_time = next_arrival_time
+                if log:
+                    emit(EVENT_RUN, current_time, current[2], exec_time, current_remaining)
+            if timed:
+                run_seconds += perf_counter() - mark
+
+        self.current_time = current_time
+        self.process_idx = process_idx
+        self.num_processes = num_processes
+        self.current = current
+        self.current_remaining = current_remaining
+        self.last_event_time = last_event_time
+        self.context_switches = context_switches
+        self.preemptions = preemptions
+        self.idle_jumps = idle_jumps
+        self.wakeups = wakeups
+        self.admit_seconds, self.select_seconds, self.run_seconds = admit_seconds, select_seconds, run_seconds
+
+    def finish(self):
+        # Every process arrives and completes; arrivals, wakeups and preempted processes are pushed on the heap,
+        # dispatches pop
+        process_idx, preemptions = self.process_idx, self.preemptions
+        return self.end_run(self.current_time, self.context_switches, preemptions, {
+            "arrivals": process_idx, "dispatches": self.context_switches,
+            "ready_pushes": process_idx + self.wakeups + preemptions, "wakeups": self.wakeups,
+            "ready_pops": self.context_switches, "preemptions": preemptions, "idle_jumps": self.idle_jumps,
+            "completions": process_idx,
+        }, {"admit": self.admit_seconds, "select": self.select_seconds, "run": self.run_seconds})
+
+
+# 2. Multi Level Feedback Queue (MLFQ) Implementation
+# Event driven like SRTF: the running process is advanced straight to its completion, the end of its
+# quantum, the next arrival or the next priority boost, whichever comes first.
+# The highest non-empty level is found from a bitmap of non-empty queues, so picking the next process
+# costs the same with 3 levels or 140.
+#   time_allotments: total CPU time a process may use at each level before it is demoted. When its quantum
+#       expires before that, it goes to the back of the same queue. Defaults to one quantum per level.
+#   boost_period: every boost_period time units all processes are moved back to Q0 (anti-starvation).
+#   metrics, keep_completed, segments, instrument: same as srtf_scheduler
+def mlfq_scheduler(processes_input, time_quantums=[5, 10, float('inf')], num_queues=3, boost_period=None,
+                   time_allotments=None, sink=None, metrics=None, keep_completed=True, segments=None,
+                   instrument=None):
+    core = _MlfqRun(processes_input, time_quantums, num_queues, boost_period, time_allotments, sink, metrics,
+                    keep_completed, segments, instrument)
+    core.start_run(num_queues)
+    if core.sink.enabled:
+        for level in range(num_queues):
+            core.sink.emit(EVENT_QUANTUM, core.current_time, -1, level, core.time_quantums[level])
+    core.advance()
+    return core.finish()
+
+
+class _MlfqRun(_SchedulerRun):
+    _SCALARS = _SchedulerRun._SCALARS + (
+        "current", "current_queue_level", "time_slice_left", "last_dispatched", "ready_levels", "next_boost_time",
+        "dispatches", "idle_jumps", "wakeups", "quantum_expirations", "demotions", "boosts")
+
+    def __init__(self, processes_input, time_quantums=[5, 10, float('inf')], num_queues=3, boost_period=None,
+                 time_allotments=None, sink=None, metrics=None, keep_completed=True, segments=None, instrument=None):
+        super().__init__(processes_input, sink, metrics, keep_completed, segments, instrument)
+        # Levels without their own quantum/allotment reuse the last one given
+        self.time_quantums = list(time_quantums) + [time_quantums[-1]] * (num_queues - len(time_quantums))
+        if time_allotments is None:
+            self.time_allotments = self.time_quantums
+        else:
+            self.time_allotments = list(time_allotments) + [time_allotments[-1]] * (num_queues - len(time_allotments))
+        self.num_queues = num_queues
+        self.boost_period = boost_period
+        # Queues for each level, holding table row numbers
+        self.queues = [deque() for _ in range(num_queues)]
+        # Bit n is set while queues[n] is not empty, the lowest set bit is the highest priority ready level
+        self.ready_levels = 0
+        # CPU time each process has used at its current level
+        self.level_time_used = array('d', [0.0]) * self.num_processes
+        # Processes waiting on I/O as (wake up time, row, queue level, boosts so far); they come back to their level
+        self.sleeping = []
+        self.current = -1 # Row of the process currently holding the CPU, -1 when idle
+        self.current_queue_level = -1 # The queue the current process came from
+        self.time_slice_left = 0 # Time left in the current quantum for the running process
+        self.last_dispatched = -1 # Row of the last process that was given the CPU
+        self.next_boost_time = boost_period if boost_period else float('inf')
+        # preemptions counts arrivals that took the CPU plus quantums that ran out before the process finished
+        self.dispatches = 0
+        self.idle_jumps = 0
+        self.wakeups = 0
+        self.quantum_expirations = 0
+        self.demotions = 0
+        self.boosts = 0
+        self.admit_seconds = self.boost_seconds = self.select_seconds = self.run_seconds = 0.0
+
+    def running_pid(self):
+        return self.table.pids[self.current] if self.current >= 0 else None
+
+    def live_rows(self):
+        rows = [row for queue in self.queues for row in queue] + [entry[1] for entry in self.sleeping]
+        if self.current >= 0:
+            rows.append(self.current)
+        return rows
+
+    def add(self, pid, arrival_time, burst_time):
+        row = super().add(pid, arrival_time, burst_time)
+        self.level_time_used.insert(row, 0.0)
+        return row
+
+    def snapshot(self):
+        state = super().snapshot()
+        state["queues"] = [deque(queue) for queue in self.queues]
+        state["sleeping"] = list(self.sleeping)
+        state["level_time_used"] = [(row, self.level_time_used[row]) for row, _, _ in state["live"]]
+        return state
+
+    def restore(self, state):
+        super().restore(state)
+        self.queues = [deque(queue) for queue in state["queues"]]
+        self.sleeping = list(state["sleeping"])
+        level_time_used = self.level_time_used
+        del level_time_used[state["process_idx"]:]
+        level_time_used.extend(array('d', [0.0]) * (state["num_processes"] - state["process_idx"]))
+        for row, used in state["level_time_used"]:
+            level_time_used[row] = used
+
+    # Runs the schedule up to `until`, with the same rules for what happens at `until` as _SrtfRun.advance
+    def advance(self, until=float('inf')):
+        table, run, stream = self.table, self.run, self.stream
+        pids = table.pids
+        arrivals = table.arrivals
+        bursts = table.bursts
+        remaining = run.remaining
+        start = run.start
+        completion = run.completion
+        # Workloads with I/O bursts, as in _SrtfRun
+        phase = run.phase
+        phase_offsets = table.phase_offsets
+        phase_lengths = table.phase_lengths
+        io_times = table.io_times
+        sleeping = self.sleeping
+        time_quantums, time_allotments = self.time_quantums, self.time_allotments
+        num_queues, boost_period = self.num_queues, self.boost_period
+        queues = self.queues
+        level_time_used = self.level_time_used
+        completed_rows = self.completed_rows
+        keep_completed = self.keep_completed
+        metrics = self.metrics
+        record_segment = self.segments.append
+        log = self.sink.enabled
+        emit = self.sink.emit
+        current_time = self.current_time
+        process_idx = self.process_idx
+        num_processes = self.num_processes
+        ready_levels = self.ready_levels
+        current = self.current
+        current_queue_level = self.current_queue_level
+        time_slice_left = self.time_slice_left
+        last_event_time = self.last_event_time
+        last_dispatched = self.last_dispatched
+        next_boost_time = self.next_boost_time
+        context_switches = self.context_switches
+        preemptions = self.preemptions
+        dispatches = self.dispatches
+        idle_jumps = self.idle_jumps
+        wakeups = self.wakeups
+        quantum_expirations = self.quantum_expirations
+        demotions = self.demotions
+        boosts = self.boosts
+        perf_counter = time.perf_counter
+        timed = self.timed
+        on_arrival, on_dispatch = self.on_arrival, self.on_dispatch
+        on_preempt, on_complete = self.on_preempt, self.on_complete
+        on_demote = self.on_demote
+        admit_seconds, boost_seconds = self.admit_seconds, self.boost_seconds
+        select_seconds, run_seconds = self.select_seconds, self.run_seconds
+
+        while True:
+            # Decisions due at `until` itself are left to the next call
+            if current_time >= until:
+                break
+            if timed:
+                mark = perf_counter()
+            #First thing that is checked on every loop is the new processes
+            arrived = False
+            while process_idx < num_processes and arrivals[process_idx] <= current_time:
+                #new processes start at the top of the priority queue
+                queues[0].append(process_idx)
+                if log:
+                    emit(EVENT_ARRIVE, current_time, pids[process_idx], 0)
+                if on_arrival is not None:
+                    on_arrival(current_time, pids[process_idx])
+                process_idx += 1
+                arrived = True
+                if process_idx == num_processes and stream is not None:
+                    num_processes = stream.fill(run)
+                    level_time_used.extend(array('d', [0.0]) * (num_processes - len(level_time_used)))
+            if arrived:
+                ready_levels |= 1
+            # Processes back from I/O rejoin the level they left, or Q0 if there was a boost meanwhile
+            woken_level = 0 if arrived else num_queues
+            while sleeping and sleeping[0][0] <= current_time:
+                _, row, level, boosts_then = heapq.heappop(sleeping)
+                if boosts_then != boosts:
+                    level = 0
+                    level_time_used[row] = 0
+                queues[level].append(row)
+                ready_levels |= 1 << level
+                if level < woken_level:
+                    woken_level = level
+                if log:
+                    emit(EVENT_WAKE, current_time, pids[row], level, remaining[row])
+                wakeups += 1
+            if timed:
+                tick = perf_counter()
+                admit_seconds += tick - mark
+                mark = tick
+
+            #Priority boost: everything waiting in a lower queue goes back to Q0 and starts its allotment over
+            if current_time >= next_boost_time:
+                moved = 0
+                lower_levels = ready_levels & ~1
+                while lower_levels:
+                    level = (lower_levels & -lower_levels).bit_length() - 1
+                    lower_levels &= lower_levels - 1
+                    for row in queues[level]:
+                        level_time_used[row] = 0
+                    moved += len(queues[level])
+                    queues[0].extend(queues[level])
+                    queues[level].clear()
+                if moved:
+                    ready_levels = 1
+                # The running process is boosted too and carries on with a fresh Q0 quantum
+                if current >= 0 and current_queue_level > 0:
+                    current_queue_level = 0
+                    level_time_used[current] = 0
+                    time_slice_left = time_quantums[0]
+                    moved += 1
+                if log:
+                    emit(EVENT_BOOST, current_time, -1, moved)
+                boosts += 1
+                next_boost_time = (current_time // boost_period + 1) * boost_period
+                if timed:
+                    tick = perf_counter()
+                    boost_seconds += tick - mark
+                    mark = tick
+
+            #Preemption Check on Arrival
+            # New arrivals always land in Q0 (and processes back from I/O in their own level), so they preempt
+            # whatever is running from a lower priority queue
+            if woken_level < current_queue_level and current >= 0:
+                if log:
+                    if arrived:
+                        emit(EVENT_PREEMPT, current_time, pids[current], -1, 0)
+                    else:
+                        emit(EVENT_PREEMPT, current_time, pids[current], pids[queues[woken_level][0]],
+                             remaining[queues[woken_level][0]])
+                if on_preempt is not None:
+                    # The newcomer that takes over is the next one dispatched from its queue
+                    on_preempt(current_time, pids[current], pids[queues[woken_level][0]])
+                preemptions += 1
                 # Record execution segment of the preempted process
                 if current_time > last_event_time:
-                     scheduled_order.append((current_process.pid, last_event_time, current_time))
+                    record_segment(pids[current], last_event_time, current_time)
                 # Put the preempted process back to the front of its queue (as it didn't finish its slice)
-                queues[current_queue_level].appendleft(current_process)
-                current_process = None # CPU becomes available
-                is_cpu_idle = True
+                queues[current_queue_level].appendleft(current)
+                ready_levels |= 1 << current_queue_level
+                current = -1 # CPU becomes available
                 current_queue_level = -1
 
-
-        #Choose a process if the queue is empty
-        if is_cpu_idle:
-            selected = False
-            #check queues from highest to lowest
-            for level in range(num_queues):
-                if queues[level]:
-                    current_process = queues[level].popleft()
+            #Choose a process if the cpu is idle
+            if current < 0:
+                if ready_levels:
+                    #the lowest set bit is the highest priority queue with something in it
+                    level = (ready_levels & -ready_levels).bit_length() - 1
+                    queue = queues[level]
+                    current = queue.popleft()
+                    if not queue:
+                        ready_levels ^= 1 << level
                     current_queue_level = level
-                    process_queue_level[current_process.pid] = level # Update tracker
                     time_slice_left = time_quantums[level]
-                    is_cpu_idle = False
-
-                    # Record start time for the original process
-                    original_process = processes_original[current_process.pid]
-                    if original_process.start_time == -1:
-                        original_process.start_time = current_time
-
-
-                    print(f"Time {current_time:.2f}: Process {current_process.pid} selected from Q{current_queue_level}"
-                          f" to run (Quantum: {time_slice_left}, Remaining: {current_process.remaining_time:.2f}).")
+                    if current != last_dispatched:
+                        context_switches += 1
+                        last_dispatched = current
+                    if start[current] == -1:
+                        start[current] = current_time
+                    if log:
+                        emit(EVENT_DISPATCH, current_time, pids[current], remaining[current], current_queue_level)
+                    if on_dispatch is not None:
+                        on_dispatch(current_time, pids[current])
+                    dispatches += 1
                     last_event_time = current_time
-                    selected = True
-                    break # Stop searching for processes once one is found
-
-            # If there was no current process found in all the queues...
-            if not selected:
-                 #And there are processes that are still to be done...
-                 if process_idx < num_processes:
-                     #THEN skip forward the time to the next arrival time
-                     idle_start = current_time
-                     current_time = process_copies[process_idx].arrival_time
-                     print(f"Time {idle_start:.2f}-{current_time:.2f}: CPU Idle.")
-                     last_event_time = current_time
-                     continue # Re-evaluate at the new time
-                 # If all arrived but not all completed (means queues empty - should only happen if finished)
-                 elif processes_completed < num_processes:
-                      print(f"Time {current_time:.2f}: CPU Idle, but processes remain? Ending simulation (check logic).")
-                      break # Avoid infinite loop
-                 else: # All processes arrived and completed
-                      break
-
-
-        #Runs if the cpu has a task to work on
-        if not is_cpu_idle and current_process is not None:
-            time_to_next_arrival = float('inf')
-            if process_idx < num_processes:
-                time_to_next_arrival = process_copies[process_idx].arrival_time - current_time
-
-            run_for = min(time_slice_left, current_process.remaining_time)
-
-            time_step = max(1.0, min(run_for, time_to_next_arrival if time_to_next_arrival > 0 else float('inf'))) # Ensure time advances
-            exec_time = min(time_step, run_for) # Actual execution time in this step
-
-            current_process.remaining_time -= exec_time
+                # If there was no process found in any queue skip forward to the next arrival, or stop if there are none left
+                elif process_idx < num_processes or sleeping:
+                    next_arrival_time = arrivals[process_idx] if process_idx < num_processes else float('inf')
+                    if sleeping and sleeping[0][0] < next_arrival_time:
+                        next_arrival_time = sleeping[0][0]
+                    if next_arrival_time > until:
+                        break
+                    if log:
+                        emit(EVENT_IDLE, current_time, -1, next_arrival_time)
+                    idle_jumps += 1
+                    current_time = next_arrival_time
+                    last_event_time = current_time
+                    # Nothing is waiting, so boosts that fell inside the idle period had nothing to do
+                    if current_time > next_boost_time:
+                        next_boost_time = (current_time // boost_period + 1) * boost_period
+                    if timed:
+                        select_seconds += perf_counter() - mark
+                    continue # Re-evaluate at the new time
+                else:
+                    break
+            if timed:
+                tick = perf_counter()
+                select_seconds += tick - mark
+                mark = tick
+
+            #Run the current process until it finishes, its quantum runs out, the next process arrives or a boost is due
+            next_event_time = arrivals[process_idx] if process_idx < num_processes else float('inf')
+            if sleeping and sleeping[0][0] < next_event_time:
+                next_event_time = sleeping[0][0]
+            if next_boost_time < next_event_time:
+                next_event_time = next_boost_time
+            if until < next_event_time:
+                next_event_time = until
+            run_for = min(time_slice_left, remaining[current])
+            if current_time + run_for <= next_event_time:
+                exec_time = run_for
+                current_time = current_time + run_for
+            else:
+                exec_time = next_event_time - current_time
+                current_time = next_event_time
+
+            remaining[current] -= exec_time
             time_slice_left -= exec_time
-            current_time += exec_time
-            print(f"Time {current_time:.2f}: Process {current_process.pid} (Q{current_queue_level}) ran for {exec_time:.2f}. Remaining: {current_process.remaining_time:.2f}. Slice left: {time_slice_left:.2f}")
+            level_time_used[current] += exec_time
+            if log:
+                emit(EVENT_SLICE, current_time, pids[current], current_queue_level, time_slice_left)
+                emit(EVENT_RUN, current_time, pids[current], exec_time, remaining[current])
+
+            # End of a CPU burst with more to come: the process waits on I/O off the CPU and keeps its level
+            if remaining[current] <= 0.00001 and phase is not None and phase[current] + 1 < phase_offsets[current + 1]:
+                k = phase[current]
+                phase[current] = k + 2
+                remaining[current] = phase_lengths[k + 2]
+                heapq.heappush(sleeping, (current_time + phase_lengths[k + 1], current, current_queue_level, boosts))
+                if log:
+                    emit(EVENT_SLEEP, current_time, pids[current], phase_lengths[k + 1])
+                record_segment(pids[current], last_event_time, current_time)
+                current = -1
+                current_queue_level = -1
 
             # Check for completion
-            if current_process.remaining_time <= 0.00001:
-                original_process = processes_original[current_process.pid]
-                original_process.completion_time = current_time
-                original_process.turnaround_time = original_process.completion_time - original_process.arrival_time
-                original_process.waiting_time = original_process.turnaround_time - original_process.burst_time
-                # Add the original process with final metrics to the completed list
-                completed_processes_list.append(original_process)
-
-                processes_completed += 1
-                print(f"Time {current_time:.2f}: Process {current_process.pid} completed.")
-                scheduled_order.append((current_process.pid, last_event_time, current_time))
-                process_queue_level[current_process.pid] = -1 # Mark as completed
-                current_process = None
-                is_cpu_idle = True
+            elif remaining[current] <= 0.00001:
+                remaining[current] = 0
+                completion[current] = current_time
+                if keep_completed:
+                    completed_rows.append(current)
+                if metrics is not None:
+                    metrics.record(arrivals[current], bursts[current], start[current], current_time,
+                                   io_times[current] if io_times is not None else 0.0)
+                if log:
+                    emit(EVENT_COMPLETE, current_time, pids[current])
+                if on_complete is not None:
+                    on_complete(current_time, pids[current])
+                record_segment(pids[current], last_event_time, current_time)
+                current = -1
                 current_queue_level = -1
 
             # Checks if the processed used all of its allotted time and if it has then move to the next process.
             elif time_slice_left <= 0.00001:
-                next_queue_level = min(current_queue_level + 1, num_queues - 1)
-                print(f"Time {current_time:.2f}: Process {current_process.pid} quantum expired in Q{current_queue_level}."
-                      f" Moving to Q{next_queue_level}.")
-                scheduled_order.append((current_process.pid, last_event_time, current_time))
-                queues[next_queue_level].append(current_process) # Add to the end of the next queue
-                process_queue_level[current_process.pid] = next_queue_level
-                current_process = None
-                is_cpu_idle = True
+                preemptions += 1
+                quantum_expirations += 1
+                if level_time_used[current] >= time_allotments[current_queue_level] - 0.00001:
+                    next_queue_level = min(current_queue_level + 1, num_queues - 1)
+                    level_time_used[current] = 0
+                else:
+                    next_queue_level = current_queue_level
+                if next_queue_level != current_queue_level:
+                    demotions += 1
+                    if on_demote is not None:
+                        on_demote(current_time, pids[current], current_queue_level, next_queue_level)
+                if log:
+                    emit(EVENT_DEMOTE, current_time, pids[current], current_queue_level, next_queue_level)
+                record_segment(pids[current], last_event_time, current_time)
+                queues[next_queue_level].append(current) # Add to the end of the next queue
+                ready_levels |= 1 << next_queue_level
+                current = -1
                 current_queue_level = -1
+            if timed:
+                run_seconds += perf_counter() - mark
+
+        self.current_time = current_time
+        self.process_idx = process_idx
+        self.num_processes = num_processes
+        self.ready_levels = ready_levels
+        self.current = current
+        self.current_queue_level = current_queue_level
+        self.time_slice_left = time_slice_left
+        self.last_event_time = last_event_time
+        self.last_dispatched = last_dispatched
+        self.next_boost_time = next_boost_time
+        self.context_switches = context_switches
+        self.preemptions = preemptions
+        self.dispatches = dispatches
+        self.idle_jumps = idle_jumps
+        self.wakeups = wakeups
+        self.quantum_expirations = quantum_expirations
+        self.demotions = demotions
+        self.boosts = boosts
+        self.admit_seconds, self.boost_seconds = admit_seconds, boost_seconds
+        self.select_seconds, self.run_seconds = select_seconds, run_seconds
+
+    def finish(self):
+        # Arrivals, wakeups, preempted processes and expired quantums are queued, every dispatch takes one off
+        # again. Processes moved between queues by a boost are counted under boosts only.
+        process_idx, preemptions, quantum_expirations = self.process_idx, self.preemptions, self.quantum_expirations
+        return self.end_run(self.current_time, self.context_switches, preemptions, {
+            "arrivals": process_idx, "dispatches": self.dispatches,
+            "ready_pushes": process_idx + self.wakeups + preemptions, "wakeups": self.wakeups,
+            "ready_pops": self.dispatches, "preemptions": preemptions - quantum_expirations,
+            "idle_jumps": self.idle_jumps, "quantum_expirations": quantum_expirations, "demotions": self.demotions,
+            "boosts": self.boosts, "completions": process_idx,
+        }, {"admit": self.admit_seconds, "boost": self.boost_seconds, "select": self.select_seconds,
+            "run": self.run_seconds})
+
+
+# 3. Multi-CPU (SMP) simulation
+# Runs SRTF or MLFQ on num_cpus cores. Like the single CPU schedulers it is event driven: each core has
+# one pending "run ends" event (completion, or quantum expiry for MLFQ) in a heap, so every arrival,
+# completion or preemption costs O(log n + log num_cpus) whatever the core count.
+#   queue_mode "global": one shared ready queue. A new arrival takes an idle core, otherwise it preempts
+#       the running process with the worst priority if it beats it (found through a heap of running cores).
+#   queue_mode "per_core": every core has its own ready queue. Arrivals go to an idle core, otherwise to the
+#       shorter queue of two randomly picked cores; a core that runs out of work steals from the longest of
+#       steal_attempts randomly picked queues, and work queued while cores sit idle is handed to one of them.
+#   migration_cost: extra CPU time a process needs when it resumes on a different core than it last ran on.
+# MLFQ here uses fixed quantums per level (no boost or allotments). Returns (per-core list of SegmentStores,
+# completed processes); with metrics given, per-core busy time and migration counts are recorded too.
+SMP_POLICIES = ("srtf", "mlfq")
+SMP_QUEUE_MODES = ("global", "per_core")
+
+
+# Ready queue for SMP SRTF: (remaining, arrival, pid, row) heap, best first
+class _SrtfReadyQueue:
+    __slots__ = ("heap",)
+
+    def __init__(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, row, remaining, arrivals, pids, level=0, front=False):
+        heapq.heappush(self.heap, (remaining[row], arrivals[row], pids[row], row))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[3]
+
+
+# Ready queue for SMP MLFQ: one deque per level plus a bitmap of non-empty levels
+class _MlfqReadyQueue:
+    __slots__ = ("queues", "ready_levels", "size")
+
+    def __init__(self, num_queues):
+        self.queues = [deque() for _ in range(num_queues)]
+        self.ready_levels = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, row, remaining, arrivals, pids, level=0, front=False):
+        if front:
+            self.queues[level].appendleft(row)
+        else:
+            self.queues[level].append(row)
+        self.ready_levels |= 1 << level
+        self.size += 1
+
+    def pop(self):
+        level = (self.ready_levels & -self.ready_levels).bit_length() - 1
+        queue = self.queues[level]
+        row = queue.popleft()
+        if not queue:
+            self.ready_levels ^= 1 << level
+        self.size -= 1
+        return row
+
+    # Level of the best waiting process (only valid when not empty)
+    def best_level(self):
+        return (self.ready_levels & -self.ready_levels).bit_length() - 1
+
+
+def smp_scheduler(processes_input, num_cpus=4, policy="srtf", queue_mode="global",
+                  time_quantums=[5, 10, float('inf')], num_queues=3, migration_cost=0.0, steal_attempts=4,
+                  seed=None, sink=None, metrics=None, keep_completed=True, segments=None):
+    if policy not in SMP_POLICIES:
+        raise ValueError(f"Unknown policy '{policy}' (expected one of {SMP_POLICIES})")
+    if queue_mode not in SMP_QUEUE_MODES:
+        raise ValueError(f"Unknown queue_mode '{queue_mode}' (expected one of {SMP_QUEUE_MODES})")
+    table, run, stream = open_workload(processes_input)
+    if table.phase_offsets is not None:
+        raise ValueError("smp_scheduler does not support I/O bursts, use srtf_scheduler or mlfq_scheduler")
+    pids = table.pids
+    arrivals = table.arrivals
+    bursts = table.bursts
+    remaining = run.remaining
+    start = run.start
+    completion = run.completion
+    num_processes = len(table)
+    is_mlfq = policy == "mlfq"
+    global_queue = queue_mode == "global"
+    time_quantums = list(time_quantums) + [time_quantums[-1]] * (num_queues - len(time_quantums))
+    rng = random.Random(seed)
+
+    # Per process: last core it ran on and its MLFQ level (grown with the table when streaming)
+    last_core = array('l', [-1]) * num_processes
+    levels = array('l', [0]) * num_processes
+
+    # Per core state
+    running = [-1] * num_cpus # row running on each core, -1 when idle
+    run_start = [0.0] * num_cpus # when the current row was dispatched there
+    version = [0] * num_cpus # bumped on every dispatch so stale events can be skipped
+    busy_time = [0.0] * num_cpus
+    idle_cores = list(range(num_cpus - 1, -1, -1)) # stack, core 0 on top
+    is_idle = [True] * num_cpus
+    if global_queue:
+        shared_ready = _MlfqReadyQueue(num_queues) if is_mlfq else _SrtfReadyQueue()
+        ready = [shared_ready] * num_cpus
+    else:
+        ready = [_MlfqReadyQueue(num_queues) if is_mlfq else _SrtfReadyQueue() for _ in range(num_cpus)]
+    # (time, core, version) for the end of each core's current run
+    core_events = []
+    # Global mode only: running cores with the worst priority on top, as (-key, core, version) where the
+    # key is the projected finish time for SRTF (the largest remaining time) and the level for MLFQ
+    worst_running = []
+
+    # One schedule per core, since segments on different cores overlap in time
+    scheduled_order = segments if segments is not None else [SegmentStore() for _ in range(num_cpus)]
+    completed_rows = []
+    context_switches = 0
+    preemptions = 0
+    migrations = 0
+    steals = 0
+
+    if sink is None:
+        sink = ConsoleSink()
+    log = sink.enabled
+    emit = sink.emit
+    if log:
+        emit(EVENT_RUN_START, 0, -1, num_queues if is_mlfq else 0, 1 if given_as_ints(processes_input) else 0)
+        if is_mlfq:
+            for level in range(num_queues):
+                emit(EVENT_QUANTUM, 0, -1, level, time_quantums[level])
+
+    def dispatch(core, row, now):
+        nonlocal context_switches, migrations
+        previous_core = last_core[row]
+        if previous_core >= 0 and previous_core != core:
+            migrations += 1
+            remaining[row] += migration_cost
+            if log:
+                emit(EVENT_MIGRATE, now, pids[row], previous_core, core)
+        last_core[row] = core
+        if start[row] == -1:
+            start[row] = now
+        running[core] = row
+        run_start[core] = now
+        version[core] += 1
+        context_switches += 1
+        if is_mlfq:
+            end = now + min(time_quantums[levels[row]], remaining[row])
+        else:
+            end = now + remaining[row]
+        heapq.heappush(core_events, (end, core, version[core]))
+        if global_queue:
+            heapq.heappush(worst_running, (-levels[row] if is_mlfq else -end, core, version[core]))
+        if log:
+            emit(EVENT_DISPATCH, now, pids[row], remaining[row], levels[row] if is_mlfq else -1)
+
+    # Takes the running row off a core, charging it for the time it ran
+    def stop(core, now):
+        row = running[core]
+        elapsed = now - run_start[core]
+        remaining[row] -= elapsed
+        busy_time[core] += elapsed
+        if now > run_start[core]:
+            scheduled_order[core].append(pids[row], run_start[core], now)
+        running[core] = -1
+        version[core] += 1
+        return row
+
+    def make_idle(core):
+        is_idle[core] = True
+        idle_cores.append(core)
+
+    # Next row for a core: its own queue, otherwise (per core mode) one stolen from another core
+    def next_row(core):
+        nonlocal steals
+        if ready[core]:
+            return ready[core].pop()
+        if global_queue or num_cpus == 1:
+            return -1
+        victim = -1
+        victim_size = 0
+        for _ in range(steal_attempts):
+            candidate = rng.randrange(num_cpus)
+            size = len(ready[candidate])
+            if size > victim_size:
+                victim, victim_size = candidate, size
+        if victim < 0:
+            return -1
+        steals += 1
+        return ready[victim].pop()
+
+    # Idle cores are stacked lazily; skip entries that were dispatched since
+    def take_idle_core():
+        while idle_cores:
+            core = idle_cores.pop()
+            if is_idle[core]:
+                is_idle[core] = False
+                return core
+        return -1
+
+    # Per core mode: work waiting in a core's queue while another core sits idle is handed straight to it
+    def share_work(core, now):
+        if idle_cores and ready[core]:
+            idle_core = take_idle_core()
+            if idle_core >= 0:
+                dispatch(idle_core, ready[core].pop(), now)
+
+    # Global mode: the running core with the worst priority, or -1 if none are running
+    def worst_running_core():
+        while worst_running:
+            key, core, v = worst_running[0]
+            if v == version[core] and running[core] >= 0:
+                return core
+            heapq.heappop(worst_running)
+        return -1
+
+    # A core whose run just ended takes its next process, or goes idle
+    def refill(core, now):
+        row = next_row(core)
+        if row >= 0:
+            dispatch(core, row, now)
+            if not global_queue:
+                share_work(core, now)
+        else:
+            make_idle(core)
+
+    # Does the best process waiting in the queue beat what runs on the core?
+    def queue_beats(queue, core, now):
+        current = running[core]
+        if is_mlfq:
+            return levels[current] > queue.best_level()
+        return queue.heap[0][0] < remaining[current] - (now - run_start[core])
+
+    def preempt(core, row, now):
+        nonlocal preemptions
+        preemptions += 1
+        preempted = stop(core, now)
+        if log:
+            emit(EVENT_PREEMPT, now, pids[preempted], pids[row], remaining[row])
+        dispatch(core, row, now)
+        # Back to the front of its level (MLFQ) or into the heap (SRTF), on the core it ran on
+        ready[core].push(preempted, remaining, arrivals, pids, levels[preempted], True)
 
-    print("MLFQ Run End")
-
-    # Sort completed list by PID for consistent reporting
+    current_time = 0
+    process_idx = 0
+    # Cores free to take work at the current arrival: runs that ended at that moment and, in per core mode,
+    # idle cores handed an arriving process. They pick their next process once every arrival is queued.
+    freed_cores = []
+    while True:
+        next_arrival_time = arrivals[process_idx] if process_idx < num_processes else float('inf')
+        # Core events first when they happen at the same time as an arrival, like the single CPU schedulers
+        if core_events and core_events[0][0] <= next_arrival_time:
+            end, core, v = heapq.heappop(core_events)
+            if v != version[core]:
+                continue # the run was cut short by a preemption
+            current_time = end
+            row = stop(core, current_time)
+            if remaining[row] <= 0.00001:
+                remaining[row] = 0
+                completion[row] = current_time
+                if keep_completed:
+                    completed_rows.append(row)
+                if metrics is not None:
+                    metrics.record(arrivals[row], bursts[row], start[row], current_time)
+                if log:
+                    emit(EVENT_COMPLETE, current_time, pids[row])
+            else:
+                # Only MLFQ runs end early: the quantum ran out, so the process moves down a level
+                preemptions += 1
+                old_level = levels[row]
+                levels[row] = min(old_level + 1, num_queues - 1)
+                if log:
+                    emit(EVENT_DEMOTE, current_time, pids[row], old_level, levels[row])
+                ready[core].push(row, remaining, arrivals, pids, levels[row])
+            if next_arrival_time <= current_time:
+                # Otherwise the next process could be dispatched only to be preempted by the arrival right away
+                freed_cores.append(core)
+            else:
+                refill(core, current_time)
+            continue
+
+        if process_idx >= num_processes:
+            break
+
+        # Every process arriving at this moment
+        current_time = next_arrival_time
+        first_row = process_idx
+        while process_idx < num_processes and arrivals[process_idx] <= current_time:
+            if log:
+                emit(EVENT_ARRIVE, current_time, pids[process_idx], 0 if is_mlfq else -1)
+            process_idx += 1
+            if process_idx == num_processes and stream is not None:
+                num_processes = stream.fill(run)
+                last_core.extend(array('l', [-1]) * (num_processes - len(last_core)))
+                levels.extend(array('l', [0]) * (num_processes - len(levels)))
+
+        if global_queue:
+            # Queue them all, fill the idle cores, then keep preempting the worst running process while the
+            # best waiting one beats it
+            for row in range(first_row, process_idx):
+                shared_ready.push(row, remaining, arrivals, pids)
+            for core in freed_cores:
+                make_idle(core)
+            freed_cores.clear()
+            while shared_ready:
+                core = take_idle_core()
+                if core < 0:
+                    break
+                dispatch(core, shared_ready.pop(), current_time)
+            while shared_ready:
+                core = worst_running_core()
+                if core < 0 or not queue_beats(shared_ready, core, current_time):
+                    break
+                preempt(core, shared_ready.pop(), current_time)
+        else:
+            # Queue them all before any core picks or preempts, otherwise a process put on a core could be
+            # preempted by the next one arriving at the same moment
+            contested_cores = []
+            for row in range(first_row, process_idx):
+                core = take_idle_core()
+                if core >= 0:
+                    ready[core].push(row, remaining, arrivals, pids)
+                    freed_cores.append(core)
+                    continue
+                # Power of two choices: the shorter of two random cores' queues
+                core = rng.randrange(num_cpus)
+                other = rng.randrange(num_cpus)
+                if len(ready[other]) < len(ready[core]):
+                    core = other
+                ready[core].push(row, remaining, arrivals, pids)
+                if running[core] >= 0:
+                    contested_cores.append(core)
+            for core in contested_cores:
+                if queue_beats(ready[core], core, current_time):
+                    preempt(core, ready[core].pop(), current_time)
+            for core in freed_cores:
+                refill(core, current_time)
+            freed_cores.clear()
+
+    if log:
+        emit(EVENT_RUN_END, current_time)
+    if metrics is not None:
+        metrics.context_switches += context_switches
+        metrics.preemptions += preemptions
+        metrics.migrations += migrations
+        metrics.steals += steals
+        metrics.add_core_busy_time(busy_time)
+
+    completed_processes_list = [table.process(row, run) for row in completed_rows]
     completed_processes_list.sort(key=lambda p: p.pid)
     return scheduled_order, completed_processes_list
 
 
-# Helper function to calculate and print average metrics
-def calculate_and_print_metrics(completed_processes, algorithm_name, start_time=0):
-    if not completed_processes:
-        print(f"\n--- {algorithm_name} Performance Metrics ---")
-        print("No processes completed.")
-        return {}
-
-    num_processes = len(completed_processes)
-    total_waiting_time = sum(p.waiting_time for p in completed_processes)
-    total_turnaround_time = sum(p.turnaround_time for p in completed_processes)
+# 4. Online simulation
+# SRTF or MLFQ driven one job at a time instead of from a complete workload. submit() queues a job (its
+# arrival time may not be before the simulator's clock) and advance_to(t) runs the schedule up to time t,
+# doing only the work for the events in between. It takes the same steps as srtf_scheduler /
+# mlfq_scheduler (the same _SrtfRun / _MlfqRun), so given the same jobs it produces the same schedule.
+# The schedule, completed processes and metrics are appended to as jobs finish.
+#   snapshot() / restore(state): save and roll back the simulation. A snapshot copies the live state only
+#       (jobs that have not completed), so it costs O(jobs in the system), not O(history). Restoring truncates
+#       the schedule and completed list back to where they were, so a snapshot can be restored any number of
+#       times but only while nothing before it has been rolled back (and not once its segments were spilled
+#       to disk).
+#   forecast(until): completed processes the current jobs would produce by `until` if nothing else arrived,
+#       worked out on a snapshot that is restored afterwards.
+class Simulator:
+    def __init__(self, policy="srtf", time_quantums=[5, 10, float('inf')], num_queues=3, boost_period=None,
+                 time_allotments=None, sink=None, keep_completed=True, segments=None):
+        if policy not in SMP_POLICIES:
+            raise ValueError(f"Unknown policy '{policy}' (expected one of {SMP_POLICIES})")
+        self.policy = policy
+        self.sink = sink if sink is not None else SilentSink()
+        self.keep_completed = keep_completed
+        self.completed = []
+        self.metrics = MetricsAccumulator()
+        if policy == "srtf":
+            self._core = _SrtfRun(ProcessTable(), self.sink, self.metrics, keep_completed, segments)
+        else:
+            self._core = _MlfqRun(ProcessTable(), time_quantums, num_queues, boost_period, time_allotments,
+                                  self.sink, self.metrics, keep_completed, segments)
+        self.schedule = self._core.segments
+        # The core's clock stays at the end of the last run while the CPU is idle, this one moves on to `until`
+        self.now = 0
+
+    # Jobs submitted but not completed yet
+    def __len__(self):
+        return self._core.num_processes - self.metrics.count
+
+    # pid of the job holding the CPU, or None
+    @property
+    def running(self):
+        return self._core.running_pid()
+
+    # Queues a job (a Process or a (pid, arrival_time, burst_time) row). It is picked up by the next advance_to().
+    def submit(self, job):
+        if isinstance(job, Process):
+            if job.bursts is not None:
+                raise ValueError(f"Process {job.pid}: Simulator does not support I/O bursts")
+            pid, arrival_time, burst_time = job.pid, job.arrival_time, job.burst_time
+        else:
+            pid, arrival_time, burst_time = job
+        if arrival_time < self.now:
+            raise ValueError(f"Process {pid} arrives at {arrival_time}, before the simulator's clock ({self.now})")
+        self._core.add(pid, arrival_time, burst_time)
+
+    # Runs the schedule until time `until` (float('inf') runs every submitted job to completion). Runs ending
+    # at `until` complete, but arrivals, preemptions and dispatches due then wait for the next call, so jobs
+    # submitted for time `until` afterwards still take part in them.
+    def advance_to(self, until):
+        core = self._core
+        core.sink, core.keep_completed, core.metrics = self.sink, self.keep_completed, self.metrics
+        core.advance(until)
+        if core.completed_rows:
+            self.completed.extend([core.table.process(row, core.run) for row in core.completed_rows])
+            core.completed_rows.clear()
+        self.now = max(self.now, core.current_time if until == float('inf') else until)
+        return self
+
+    # Context switch and preemption counts so far, in the metrics
+    def summary(self):
+        self.metrics.context_switches = self._core.context_switches
+        self.metrics.preemptions = self._core.preemptions
+        return self.metrics.summary()
+
+    def snapshot(self):
+        state = self._core.snapshot()
+        state["now"] = self.now
+        state["segments"] = (len(self.schedule), self.schedule.last_pid, self.schedule.last_end)
+        state["completed"] = len(self.completed)
+        state["metrics"] = self.metrics.copy()
+        return state
+
+    def restore(self, state):
+        length, last_pid, last_end = state["segments"]
+        if length > len(self.schedule) or state["completed"] > len(self.completed):
+            raise ValueError("Snapshot is not from this simulator's current history")
+        self._core.restore(state)
+        self.now = state["now"]
+        self.schedule.truncate(length, last_pid, last_end)
+        del self.completed[state["completed"]:]
+        self.metrics = state["metrics"].copy()
+        return self
+
+    def forecast(self, until=float('inf')):
+        state = self.snapshot()
+        sink, keep_completed = self.sink, self.keep_completed
+        done = len(self.completed)
+        self.sink, self.keep_completed = SilentSink(), True
+        try:
+            self.advance_to(until)
+            return self.completed[done:]
+        finally:
+            self.sink, self.keep_completed = sink, keep_completed
+            self.restore(state)
+
+
+# 5. Proportional share schedulers
+# CFS-style fair scheduling, lottery scheduling and stride scheduling. Like the schedulers above they
+# take any workload input and return (SegmentStore, completed processes sorted by pid), and every
+# scheduling decision is O(log n) in the number of runnable processes.
+#   metrics, keep_completed, segments, instrument: same as srtf_scheduler
+
+# CFS weight of nice 0; vruntime advances by exec_time * CFS_NICE_0_WEIGHT / weight
+CFS_NICE_0_WEIGHT = 1.0
+
+
+# Weights must be positive and finite: vruntime advances by exec_time / weight and slices are shares of the
+# total weight
+def _check_weights(weights):
+    for pid, value in (weights or {}).items():
+        if not 0 < value < float('inf'):
+            raise ValueError(f"Process {pid}: weight must be positive, got {value}")
+
+
+# Fair scheduling by virtual runtime (the idea behind Linux CFS). Each runnable process's vruntime grows
+# with the CPU time it gets divided by its weight, and the process with the smallest vruntime runs next.
+# The runnable set is a heap keyed by vruntime: CFS only ever needs the leftmost entry, which the heap gives
+# in O(log n) like a balanced tree would. Arrivals start at the current minimum vruntime.
+#   weights: optional {pid: weight}, 1.0 (nice 0) for processes not listed; weights must be positive
+#   target_latency: period in which every runnable process should get a turn; a process's slice is its
+#       share of it by weight, but never less than min_granularity
+#   wakeup_granularity: an arrival preempts the running process when its vruntime is lower by more than this
+def cfs_scheduler(processes_input, target_latency=20.0, min_granularity=1.0, wakeup_granularity=1.0, weights=None,
+                  sink=None, metrics=None, keep_completed=True, segments=None, instrument=None):
+    core = _SchedulerRun(processes_input, sink, metrics, keep_completed, segments, instrument)
+    table, run, stream = core.table, core.run, core.stream
+    if table.phase_offsets is not None:
+        raise ValueError("cfs_scheduler does not support I/O bursts, use srtf_scheduler or mlfq_scheduler")
+    _check_weights(weights)
+    pids = table.pids
+    arrivals = table.arrivals
+    bursts = table.bursts
+    remaining = run.remaining
+    start = run.start
+    completion = run.completion
+    num_processes = core.num_processes
+    completed_rows = core.completed_rows
+    record_segment = core.segments.append
+    vruntime = array('d', [0.0]) * num_processes
+    weight = array('d', [CFS_NICE_0_WEIGHT]) * num_processes
+    # Heap entries are (vruntime, row); rows are in arrival order, which breaks ties
+    ready_queue = []
+    total_weight = 0.0 # Of every runnable process, the running one included
+    min_vruntime = 0.0
 
+    current_time = 0
+    process_idx = 0
+    current = -1
+    slice_left = 0
+    last_event_time = 0
+    last_dispatched = -1
+    context_switches = 0
+    preemptions = 0
+
+    log = core.sink.enabled
+    emit = core.sink.emit
+    perf_counter = time.perf_counter
+    timed = core.timed
+    on_arrival, on_dispatch = core.on_arrival, core.on_dispatch
+    on_preempt, on_complete = core.on_preempt, core.on_complete
+    dispatches = 0
+    idle_jumps = 0
+    slice_expirations = 0
+    admit_seconds = select_seconds = run_seconds = 0.0
+    core.start_run()
 
-    avg_waiting_time = total_waiting_time / num_processes
-    avg_turnaround_time = total_turnaround_time / num_processes
+    while True:
+        if timed:
+            mark = perf_counter()
+        if current < 0 and not ready_queue:
+            if process_idx >= num_processes:
+                break
+            if arrivals[process_idx] > current_time:
+                if log:
+                    emit(EVENT_IDLE, current_time, -1, arrivals[process_idx])
+                idle_jumps += 1
+                current_time = arrivals[process_idx]
+
+        arrived = False
+        while process_idx < num_processes and arrivals[process_idx] <= current_time:
+            row = process_idx
+            if weights:
+                weight[row] = weights.get(pids[row], CFS_NICE_0_WEIGHT)
+            vruntime[row] = min_vruntime
+            heapq.heappush(ready_queue, (min_vruntime, row))
+            total_weight += weight[row]
+            if log:
+                emit(EVENT_ARRIVE, current_time, pids[row], -1)
+            if on_arrival is not None:
+                on_arrival(current_time, pids[row])
+            process_idx += 1
+            arrived = True
+            if process_idx == num_processes and stream is not None:
+                num_processes = stream.fill(run)
+                vruntime.extend(array('d', [0.0]) * (num_processes - len(vruntime)))
+                weight.extend(array('d', [CFS_NICE_0_WEIGHT]) * (num_processes - len(weight)))
+        if timed:
+            tick = perf_counter()
+            admit_seconds += tick - mark
+            mark = tick
+
+        # Wakeup preemption
+        if arrived and current >= 0 and vruntime[current] - ready_queue[0][0] > wakeup_granularity:
+            if log:
+                emit(EVENT_PREEMPT, current_time, pids[current], pids[ready_queue[0][1]], ready_queue[0][0])
+            if on_preempt is not None:
+                on_preempt(current_time, pids[current], pids[ready_queue[0][1]])
+            preemptions += 1
+            if current_time > last_event_time:
+                record_segment(pids[current], last_event_time, current_time)
+            heapq.heappush(ready_queue, (vruntime[current], current))
+            current = -1
+
+        if current < 0:
+            current = heapq.heappop(ready_queue)[1]
+            slice_left = max(target_latency * weight[current] / total_weight, min_granularity)
+            if current != last_dispatched:
+                context_switches += 1
+                last_dispatched = current
+            if start[current] == -1:
+                start[current] = current_time
+            if log:
+                emit(EVENT_DISPATCH, current_time, pids[current], remaining[current], -1)
+            if on_dispatch is not None:
+                on_dispatch(current_time, pids[current])
+            dispatches += 1
+            last_event_time = current_time
+        if timed:
+            tick = perf_counter()
+            select_seconds += tick - mark
+            mark = tick
+
+        # Run until the process finishes, its slice ends or the next arrival
+        next_arrival_time = arrivals[process_idx] if process_idx < num_processes else float('inf')
+        run_for = min(slice_left, remaining[current])
+        if current_time + run_for <= next_arrival_time:
+            exec_time = run_for
+            current_time = current_time + run_for
+        else:
+            exec_time = next_arrival_time - current_time
+            current_time = next_arrival_time
+        remaining[current] -= exec_time
+        slice_left -= exec_time
+        vruntime[current] += exec_time * CFS_NICE_0_WEIGHT / weight[current]
+        leftmost = ready_queue[0][0] if ready_queue else vruntime[current]
+        min_vruntime = max(min_vruntime, min(vruntime[current], leftmost))
+        if log:
+            emit(EVENT_RUN, current_time, pids[current], exec_time, remaining[current])
+
+        if remaining[current] <= 0.00001:
+            remaining[current] = 0
+            completion[current] = current_time
+            total_weight -= weight[current]
+            if keep_completed:
+                completed_rows.append(current)
+            if metrics is not None:
+                metrics.record(arrivals[current], bursts[current], start[current], current_time)
+            if log:
+                emit(EVENT_COMPLETE, current_time, pids[current])
+            if on_complete is not None:
+                on_complete(current_time, pids[current])
+            record_segment(pids[current], last_event_time, current_time)
+            current = -1
+        elif slice_left <= 0.00001:
+            slice_expirations += 1
+            # Another process is further behind now, so it gets the CPU; otherwise keep going with a new slice
+            if ready_queue and ready_queue[0][0] < vruntime[current]:
+                if log:
+                    emit(EVENT_PREEMPT, current_time, pids[current], pids[ready_queue[0][1]], ready_queue[0][0])
+                if on_preempt is not None:
+                    on_preempt(current_time, pids[current], pids[ready_queue[0][1]])
+                preemptions += 1
+                record_segment(pids[current], last_event_time, current_time)
+                heapq.heappush(ready_queue, (vruntime[current], current))
+                current = -1
+            else:
+                slice_left = max(target_latency * weight[current] / total_weight, min_granularity)
+        if timed:
+            run_seconds += perf_counter() - mark
+
+    # Arrivals and preempted processes are pushed on the vruntime heap, dispatches pop; a slice that ends
+    # counts as a quantum expiration whether or not the process keeps the CPU
+    return core.end_run(current_time, context_switches, preemptions, {
+        "arrivals": process_idx, "dispatches": dispatches, "ready_pushes": process_idx + preemptions,
+        "ready_pops": dispatches, "preemptions": preemptions, "idle_jumps": idle_jumps,
+        "quantum_expirations": slice_expirations, "completions": process_idx,
+    }, {"admit": admit_seconds, "select": select_seconds, "run": run_seconds})
+
+
+# Fenwick (binary indexed) tree of ticket counts, one slot per process in arrival order: changing a
+# count, a prefix sum and finding which slot holds a given ticket are all O(log n).
+class TicketTree:
+    __slots__ = ("tree", "total")
+
+    def __init__(self):
+        self.tree = array('q', [0]) # 1-based, tree[0] is unused
+        self.total = 0
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    # Tickets in slots 0 .. count - 1
+    def prefix(self, count):
+        tree = self.tree
+        total = 0
+        while count > 0:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    # Adds a slot at the end holding `tickets`
+    def append(self, tickets):
+        i = len(self.tree)
+        # Node i covers slots i - lowbit(i) .. i - 1; all but the new one are already in the tree
+        self.tree.append(tickets + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+        self.total += tickets
+
+    def add(self, slot, delta):
+        tree = self.tree
+        size = len(tree)
+        i = slot + 1
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+        self.total += delta
+
+    # Slot holding ticket number `ticket` (0 <= ticket < total), counting tickets slot by slot
+    def find(self, ticket):
+        tree = self.tree
+        size = len(tree)
+        position = 0
+        step = 1 << ((size - 1).bit_length() - 1) if size > 1 else 0
+        while step:
+            nxt = position + step
+            if nxt < size and tree[nxt] <= ticket:
+                position = nxt
+                ticket -= tree[nxt]
+            step >>= 1
+        return position
+
+
+# Ticket counts must be positive integers: a process with no tickets could never be drawn (or given a
+# stride), and the TicketTree counts tickets in 64-bit integers
+def _check_tickets(tickets, default_tickets):
+    if not isinstance(default_tickets, numbers.Integral) or default_tickets <= 0:
+        raise ValueError(f"default_tickets must be a positive integer, got {default_tickets}")
+    for pid, count in (tickets or {}).items():
+        if not isinstance(count, numbers.Integral) or count <= 0:
+            raise ValueError(f"Process {pid}: tickets must be a positive integer, got {count}")
+
+
+# Lottery scheduling: every quantum a ticket is drawn at random from the runnable processes' tickets and
+# its holder runs, so each process gets CPU time in proportion to its tickets on average. Draws go through
+# a TicketTree. A quantum is not interrupted by arrivals; they join the next draw.
+#   tickets: optional {pid: tickets}, default_tickets for processes not listed; counts must be positive integers
+#   seed: seed for the draws
+def lottery_scheduler(processes_input, quantum=1.0, tickets=None, default_tickets=100, seed=None, sink=None,
+                      metrics=None, keep_completed=True, segments=None, instrument=None):
+    core = _SchedulerRun(processes_input, sink, metrics, keep_completed, segments, instrument)
+    table, run, stream = core.table, core.run, core.stream
+    if table.phase_offsets is not None:
+        raise ValueError("lottery_scheduler does not support I/O bursts, use srtf_scheduler or mlfq_scheduler")
+    _check_tickets(tickets, default_tickets)
+    pids = table.pids
+    arrivals = table.arrivals
+    bursts = table.bursts
+    remaining = run.remaining
+    start = run.start
+    completion = run.completion
+    num_processes = core.num_processes
+    completed_rows = core.completed_rows
+    record_segment = core.segments.append
+    draw = random.Random(seed).random
+    ticket_tree = TicketTree()
+    held = array('q') # Tickets of each arrived row
 
+    current_time = 0
+    process_idx = 0
+    last_dispatched = -1
+    expired = -1 # Row whose quantum just ran out, it was preempted if someone else wins the draw
+    context_switches = 0
+    preemptions = 0
+
+    log = core.sink.enabled
+    emit = core.sink.emit
+    perf_counter = time.perf_counter
+    timed = core.timed
+    on_arrival, on_dispatch = core.on_arrival, core.on_dispatch
+    on_preempt, on_complete = core.on_preempt, core.on_complete
+    dispatches = 0
+    idle_jumps = 0
+    quantum_expirations = 0
+    admit_seconds = select_seconds = run_seconds = 0.0
+    core.start_run()
 
-    # For CPU Util and Throughput
-    last_completion_time = max(p.completion_time for p in completed_processes) if completed_processes else start_time
-    first_arrival_time = min(p.arrival_time for p in completed_processes) if completed_processes else start_time
-    total_simulation_time = last_completion_time - first_arrival_time # More accurate: time from first arrival to last completion
-    if total_simulation_time <= 0: total_simulation_time = last_completion_time # Handle case where all arrive at 0
+    while True:
+        if timed:
+            mark = perf_counter()
+        if not ticket_tree.total:
+            if process_idx >= num_processes:
+                break
+            if arrivals[process_idx] > current_time:
+                if log:
+                    emit(EVENT_IDLE, current_time, -1, arrivals[process_idx])
+                idle_jumps += 1
+                current_time = arrivals[process_idx]
+
+        while process_idx < num_processes and arrivals[process_idx] <= current_time:
+            count = tickets.get(pids[process_idx], default_tickets) if tickets else default_tickets
+            held.append(count)
+            ticket_tree.append(count)
+            if log:
+                emit(EVENT_ARRIVE, arrivals[process_idx], pids[process_idx], -1)
+            if on_arrival is not None:
+                on_arrival(arrivals[process_idx], pids[process_idx])
+            process_idx += 1
+            if process_idx == num_processes and stream is not None:
+                num_processes = stream.fill(run)
+        if timed:
+            tick = perf_counter()
+            admit_seconds += tick - mark
+            mark = tick
+
+        current = ticket_tree.find(int(draw() * ticket_tree.total))
+        if expired >= 0 and current != expired:
+            if log:
+                emit(EVENT_PREEMPT, current_time, pids[expired], pids[current], -1)
+            if on_preempt is not None:
+                on_preempt(current_time, pids[expired], pids[current])
+            preemptions += 1
+        if current != last_dispatched:
+            context_switches += 1
+            last_dispatched = current
+        if start[current] == -1:
+            start[current] = current_time
+        if log:
+            emit(EVENT_DISPATCH, current_time, pids[current], remaining[current], -1)
+        if on_dispatch is not None:
+            on_dispatch(current_time, pids[current])
+        dispatches += 1
+        if timed:
+            tick = perf_counter()
+            select_seconds += tick - mark
+            mark = tick
+
+        exec_time = min(quantum, remaining[current])
+        record_segment(pids[current], current_time, current_time + exec_time)
+        current_time += exec_time
+        remaining[current] -= exec_time
+        if log:
+            emit(EVENT_RUN, current_time, pids[current], exec_time, remaining[current])
+
+        if remaining[current] <= 0.00001:
+            remaining[current] = 0
+            completion[current] = current_time
+            ticket_tree.add(current, -held[current])
+            if keep_completed:
+                completed_rows.append(current)
+            if metrics is not None:
+                metrics.record(arrivals[current], bursts[current], start[current], current_time)
+            if log:
+                emit(EVENT_COMPLETE, current_time, pids[current])
+            if on_complete is not None:
+                on_complete(current_time, pids[current])
+            expired = -1
+        else:
+            expired = current
+            quantum_expirations += 1
+        if timed:
+            run_seconds += perf_counter() - mark
+
+    # Arrivals add their tickets to the TicketTree and completions take them out again; every quantum is a
+    # dispatch by draw
+    return core.end_run(current_time, context_switches, preemptions, {
+        "arrivals": process_idx, "dispatches": dispatches, "ready_pushes": process_idx,
+        "ready_pops": process_idx, "preemptions": preemptions, "idle_jumps": idle_jumps,
+        "quantum_expirations": quantum_expirations, "completions": process_idx,
+    }, {"admit": admit_seconds, "select": select_seconds, "run": run_seconds})
+
+
+# Stride scheduling, the deterministic version of lottery scheduling: each process has a stride inversely
+# proportional to its tickets and a pass value. The process with the lowest pass runs for a quantum and
+# its pass grows by its stride. Arrivals start one stride past the lowest pass among runnable processes.
+#   tickets, default_tickets, quantum: same as lottery_scheduler
+STRIDE_1 = 1 << 20
+
+
+def stride_scheduler(processes_input, quantum=1.0, tickets=None, default_tickets=100, sink=None, metrics=None,
+                     keep_completed=True, segments=None, instrument=None):
+    core = _SchedulerRun(processes_input, sink, metrics, keep_completed, segments, instrument)
+    table, run, stream = core.table, core.run, core.stream
+    if table.phase_offsets is not None:
+        raise ValueError("stride_scheduler does not support I/O bursts, use srtf_scheduler or mlfq_scheduler")
+    _check_tickets(tickets, default_tickets)
+    pids = table.pids
+    arrivals = table.arrivals
+    bursts = table.bursts
+    remaining = run.remaining
+    start = run.start
+    completion = run.completion
+    num_processes = core.num_processes
+    completed_rows = core.completed_rows
+    record_segment = core.segments.append
+    # Heap entries are (pass, row)
+    ready_queue = []
+    global_pass = 0.0
 
-    total_burst_time = sum(p.burst_time for p in completed_processes) # Use original burst times
+    current_time = 0
+    process_idx = 0
+    last_dispatched = -1
+    expired = -1
+    context_switches = 0
+    preemptions = 0
+
+    log = core.sink.enabled
+    emit = core.sink.emit
+    perf_counter = time.perf_counter
+    timed = core.timed
+    on_arrival, on_dispatch = core.on_arrival, core.on_dispatch
+    on_preempt, on_complete = core.on_preempt, core.on_complete
+    dispatches = 0
+    idle_jumps = 0
+    quantum_expirations = 0
+    admit_seconds = select_seconds = run_seconds = 0.0
+    core.start_run()
 
-    cpu_utilization = (total_burst_time / total_simulation_time) * 100 if total_simulation_time > 0 else 0
-    throughput = num_processes / total_simulation_time if total_simulation_time > 0 else 0
+    while True:
+        if timed:
+            mark = perf_counter()
+        if not ready_queue:
+            if process_idx >= num_processes:
+                break
+            if arrivals[process_idx] > current_time:
+                if log:
+                    emit(EVENT_IDLE, current_time, -1, arrivals[process_idx])
+                idle_jumps += 1
+                current_time = arrivals[process_idx]
+
+        if ready_queue:
+            global_pass = ready_queue[0][0]
+        while process_idx < num_processes and arrivals[process_idx] <= current_time:
+            count = tickets.get(pids[process_idx], default_tickets) if tickets else default_tickets
+            heapq.heappush(ready_queue, (global_pass + STRIDE_1 / count, process_idx))
+            if log:
+                emit(EVENT_ARRIVE, arrivals[process_idx], pids[process_idx], -1)
+            if on_arrival is not None:
+                on_arrival(arrivals[process_idx], pids[process_idx])
+            process_idx += 1
+            if process_idx == num_processes and stream is not None:
+                num_processes = stream.fill(run)
+        if timed:
+            tick = perf_counter()
+            admit_seconds += tick - mark
+            mark = tick
+
+        pass_value, current = heapq.heappop(ready_queue)
+        if expired >= 0 and current != expired:
+            if log:
+                emit(EVENT_PREEMPT, current_time, pids[expired], pids[current], -1)
+            if on_preempt is not None:
+                on_preempt(current_time, pids[expired], pids[current])
+            preemptions += 1
+        if current != last_dispatched:
+            context_switches += 1
+            last_dispatched = current
+        if start[current] == -1:
+            start[current] = current_time
+        if log:
+            emit(EVENT_DISPATCH, current_time, pids[current], remaining[current], -1)
+        if on_dispatch is not None:
+            on_dispatch(current_time, pids[current])
+        dispatches += 1
+        if timed:
+            tick = perf_counter()
+            select_seconds += tick - mark
+            mark = tick
+
+        exec_time = min(quantum, remaining[current])
+        record_segment(pids[current], current_time, current_time + exec_time)
+        current_time += exec_time
+        remaining[current] -= exec_time
+        if log:
+            emit(EVENT_RUN, current_time, pids[current], exec_time, remaining[current])
+
+        if remaining[current] <= 0.00001:
+            remaining[current] = 0
+            completion[current] = current_time
+            if keep_completed:
+                completed_rows.append(current)
+            if metrics is not None:
+                metrics.record(arrivals[current], bursts[current], start[current], current_time)
+            if log:
+                emit(EVENT_COMPLETE, current_time, pids[current])
+            if on_complete is not None:
+                on_complete(current_time, pids[current])
+            global_pass = pass_value
+            expired = -1
+        else:
+            count = tickets.get(pids[current], default_tickets) if tickets else default_tickets
+            heapq.heappush(ready_queue, (pass_value + STRIDE_1 / count, current))
+            expired = current
+            quantum_expirations += 1
+        if timed:
+            run_seconds += perf_counter() - mark
+
+    # Arrivals and processes whose quantum ran out are pushed on the pass heap, every quantum pops one
+    return core.end_run(current_time, context_switches, preemptions, {
+        "arrivals": process_idx, "dispatches": dispatches, "ready_pushes": process_idx + quantum_expirations,
+        "ready_pops": dispatches, "preemptions": preemptions, "idle_jumps": idle_jumps,
+        "quantum_expirations": quantum_expirations, "completions": process_idx,
+    }, {"admit": admit_seconds, "select": select_seconds, "run": run_seconds})
+
+
+# Streaming metrics
+# Mergeable quantile sketch with relative error (the DDSketch idea): values are counted in buckets whose
+# bounds grow geometrically, so any quantile is returned within `relative_accuracy` of the true value and
+# memory depends on the range of the values, not on how many were added.
+class QuantileSketch:
+    __slots__ = ("relative_accuracy", "gamma", "log_gamma", "buckets", "zero_count", "count", "min", "max")
+
+    # Values at or below this are counted as zero (waiting times can come out as tiny negatives from rounding)
+    ZERO_THRESHOLD = 1e-9
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def add(self, value):
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= self.ZERO_THRESHOLD:
+            self.zero_count += 1
+        else:
+            key = math.ceil(math.log(value) / self.log_gamma)
+            buckets = self.buckets
+            buckets[key] = buckets.get(key, 0) + 1
+
+    # Adds another sketch's counts into this one (both need the same relative_accuracy)
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Can only merge sketches with the same relative_accuracy")
+        buckets = self.buckets
+        for key, count in other.buckets.items():
+            buckets[key] = buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    # q between 0 and 1, e.g. 0.99 for p99
+    def quantile(self, q):
+        if self.count == 0:
+            return float('nan')
+        # Nearest rank: the value at 0-based position ceil(q * count) - 1
+        rank = max(math.ceil(q * self.count) - 1, 0)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        cumulative = self.zero_count
+        for key in sorted(self.buckets):
+            cumulative += self.buckets[key]
+            if cumulative > rank:
+                # Middle of the bucket (gamma**(key-1), gamma**key], clamped to what was actually seen
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+# Reported percentiles, as (label, quantile)
+METRIC_PERCENTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("p99.9", 0.999))
+
+
+# Exact nearest rank quantile of a sorted sequence, the value QuantileSketch.quantile estimates
+def nearest_rank(sorted_values, q):
+    return sorted_values[max(math.ceil(q * len(sorted_values)) - 1, 0)]
+
+
+# Running totals the schedulers update as each process completes, so the final report needs O(1) memory
+# instead of the whole completed process list. Accumulators from separate runs or workers can be merged.
+#   exact_percentiles: also keep every waiting, turnaround and response time and report their exact
+#       percentiles instead of the sketches' estimates, for runs small enough to have them all at hand.
+#       Merging in an accumulator without them falls back to the sketches.
+class MetricsAccumulator:
+    def __init__(self, relative_accuracy=0.01, exact_percentiles=False):
+        self.count = 0
+        self.total_waiting_time = 0.0
+        self.total_turnaround_time = 0.0
+        self.total_response_time = 0.0
+        self.total_burst_time = 0.0
+        self.first_arrival_time = float('inf')
+        self.last_completion_time = float('-inf')
+        self.context_switches = 0
+        self.preemptions = 0
+        # Only filled in by smp_scheduler
+        self.migrations = 0
+        self.steals = 0
+        self.core_busy_time = None
+        self.waiting = QuantileSketch(relative_accuracy)
+        self.turnaround = QuantileSketch(relative_accuracy)
+        self.response = QuantileSketch(relative_accuracy)
+        # (waiting, turnaround, response) times with exact_percentiles, otherwise None
+        self.values = (array('d'), array('d'), array('d')) if exact_percentiles else None
+
+    # io_time: time the process spent waiting on I/O, which is neither CPU time nor waiting time
+    def record(self, arrival_time, burst_time, start_time, completion_time, io_time=0.0):
+        turnaround_time = completion_time - arrival_time
+        waiting_time = turnaround_time - burst_time - io_time
+        response_time = start_time - arrival_time
+        self.count += 1
+        self.total_waiting_time += waiting_time
+        self.total_turnaround_time += turnaround_time
+        self.total_response_time += response_time
+        self.total_burst_time += burst_time
+        if arrival_time < self.first_arrival_time:
+            self.first_arrival_time = arrival_time
+        if completion_time > self.last_completion_time:
+            self.last_completion_time = completion_time
+        self.waiting.add(waiting_time)
+        self.turnaround.add(turnaround_time)
+        self.response.add(response_time)
+        if self.values is not None:
+            self.values[0].append(waiting_time)
+            self.values[1].append(turnaround_time)
+            self.values[2].append(response_time)
+
+    # Adds each core's busy time (a list with one entry per core)
+    def add_core_busy_time(self, busy_time):
+        if self.core_busy_time is None:
+            self.core_busy_time = list(busy_time)
+        elif len(self.core_busy_time) != len(busy_time):
+            raise ValueError("Can not combine runs with different core counts")
+        else:
+            self.core_busy_time = [a + b for a, b in zip(self.core_busy_time, busy_time)]
+
+    # Independent copy, e.g. for Simulator.snapshot()
+    def copy(self):
+        clone = MetricsAccumulator(self.waiting.relative_accuracy, self.values is not None)
+        clone.merge(self)
+        return clone
+
+    # Same as record() for a completed Process
+    def record_process(self, p):
+        self.record(p.arrival_time, p.burst_time, p.start_time, p.completion_time, p.io_time)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total_waiting_time += other.total_waiting_time
+        self.total_turnaround_time += other.total_turnaround_time
+        self.total_response_time += other.total_response_time
+        self.total_burst_time += other.total_burst_time
+        self.first_arrival_time = min(self.first_arrival_time, other.first_arrival_time)
+        self.last_completion_time = max(self.last_completion_time, other.last_completion_time)
+        self.context_switches += other.context_switches
+        self.preemptions += other.preemptions
+        self.migrations += other.migrations
+        self.steals += other.steals
+        if other.core_busy_time is not None:
+            self.add_core_busy_time(other.core_busy_time)
+        self.waiting.merge(other.waiting)
+        self.turnaround.merge(other.turnaround)
+        self.response.merge(other.response)
+        if self.values is not None:
+            if other.values is None:
+                self.values = None
+            else:
+                for mine, theirs in zip(self.values, other.values):
+                    mine.extend(theirs)
+
+    # The metrics dict used throughout the program; empty when nothing completed
+    def summary(self):
+        if self.count == 0:
+            return {}
+        total_simulation_time = self.last_completion_time - self.first_arrival_time # time from first arrival to last completion
+        if total_simulation_time <= 0: total_simulation_time = self.last_completion_time # Handle case where all arrive at 0
+        metrics = {
+            "AWT": self.total_waiting_time / self.count,
+            "ATT": self.total_turnaround_time / self.count,
+            "ART": self.total_response_time / self.count,
+            "CPU_Util": (self.total_burst_time / total_simulation_time) * 100 if total_simulation_time > 0 else 0,
+            "Throughput": self.count / total_simulation_time if total_simulation_time > 0 else 0,
+            "Total_Time": total_simulation_time,
+            "Completed": self.count,
+            "Context_Switches": self.context_switches,
+            "Preemptions": self.preemptions,
+        }
+        if self.core_busy_time is not None:
+            # Busy time includes migration overhead, so it is used instead of the burst total on multiple CPUs
+            num_cpus = len(self.core_busy_time)
+            metrics["CPUs"] = num_cpus
+            metrics["Core_Util"] = [busy / total_simulation_time * 100 if total_simulation_time > 0 else 0
+                                    for busy in self.core_busy_time]
+            metrics["CPU_Util"] = sum(metrics["Core_Util"]) / num_cpus
+            metrics["Migrations"] = self.migrations
+            metrics["Steals"] = self.steals
+        if self.values is not None:
+            # None of these times can really be negative; rounding can leave tiny negative waiting times
+            for key, values in zip(("WT", "TAT", "RT"), self.values):
+                values = sorted(values)
+                for label, q in METRIC_PERCENTILES:
+                    metrics[f"{key}_{label}"] = max(nearest_rank(values, q), 0.0)
+            return metrics
+        for label, q in METRIC_PERCENTILES:
+            metrics[f"WT_{label}"] = self.waiting.quantile(q)
+            metrics[f"TAT_{label}"] = self.turnaround.quantile(q)
+            metrics[f"RT_{label}"] = self.response.quantile(q)
+        return metrics
+
+
+# Helper function to calculate metrics without printing them. Accepts the completed process list or
+# the MetricsAccumulator a scheduler filled in. With the list every value is at hand, so the percentiles
+# are exact.
+def compute_metrics(completed_processes):
+    if isinstance(completed_processes, MetricsAccumulator):
+        return completed_processes.summary()
+    accumulator = MetricsAccumulator(exact_percentiles=True)
+    for p in completed_processes:
+        accumulator.record_process(p)
+    return accumulator.summary()
+
+
+# Helper function to calculate and print metrics, from a completed process list or a MetricsAccumulator.
+# start_time is only there for callers of the original signature; it never changed the result.
+def calculate_and_print_metrics(completed_processes, algorithm_name, start_time=0):
+    metrics = compute_metrics(completed_processes)
+    if not metrics:
+        print(f"\n--- {algorithm_name} Performance Metrics ---")
+        print("No processes completed.")
+        return {}
 
     print(f"\n{algorithm_name} Performance Measurements")
-    print(f"Total Simulation Time: {total_simulation_time:.2f}")
-    print(f"Average Waiting Time (AWT): {avg_waiting_time:.2f}")
-    print(f"Average Turnaround Time (ATT): {avg_turnaround_time:.2f}")
-
-    print(f"CPU Utilization: {cpu_utilization:.2f}%")
-    print(f"Throughput: {throughput:.2f} processes/unit time")
+    print(f"Total Simulation Time: {metrics['Total_Time']:.2f}")
+    print(f"Average Waiting Time (AWT): {metrics['AWT']:.2f}")
+    print(f"Average Turnaround Time (ATT): {metrics['ATT']:.2f}")
+    print(f"Average Response Time (ART): {metrics['ART']:.2f}")
+    for name, key in (("Waiting Time", "WT"), ("Turnaround Time", "TAT"), ("Response Time", "RT")):
+        percentiles = ", ".join(f"{label} {metrics[f'{key}_{label}']:.2f}" for label, _ in METRIC_PERCENTILES)
+        print(f"{name} Percentiles: {percentiles}")
+
+    print(f"CPU Utilization: {metrics['CPU_Util']:.2f}%")
+    if "Core_Util" in metrics:
+        core_util = metrics["Core_Util"]
+        print(f"CPUs: {metrics['CPUs']}, Migrations: {metrics['Migrations']}, Steals: {metrics['Steals']}")
+        if len(core_util) <= 16:
+            print("Per-CPU Utilization: " + ", ".join(f"CPU{i} {u:.2f}%" for i, u in enumerate(core_util)))
+        else:
+            print(f"Per-CPU Utilization: min {min(core_util):.2f}%, mean {sum(core_util) / len(core_util):.2f}%, "
+                  f"max {max(core_util):.2f}%")
+    print(f"Throughput: {metrics['Throughput']:.2f} processes/unit time")
+    if metrics["Context_Switches"] or metrics["Preemptions"]:
+        print(f"Context Switches: {metrics['Context_Switches']}, Preemptions: {metrics['Preemptions']}")
 
     # Return metrics for potential comparison
-    metrics = {
-        "AWT": avg_waiting_time,
-        "ATT": avg_turnaround_time,
-        "CPU_Util": cpu_utilization,
-        "Throughput": throughput
-    }
     return metrics
 
 
+# Result cache
+# Scheduler results kept on disk under a hash of the workload columns, the scheduler's name and its
+# parameters, so running the same comparison or sweep again skips the simulation. An entry holds the
+# schedule's columns, the completed processes' times and the MetricsAccumulator. Once the entries take
+# more than max_bytes the least recently used ones are deleted, and the last memo_entries results are
+# also kept in memory. Several processes can share a directory; each tracks the sizes it has seen, so
+# the budget is approximate then. Entries are pickled: only use a directory you trust.
+RESULT_CACHE_VERSION = 3
+
+
+# True when scheduler(**params) draws random numbers without a seed, so every run can give a different
+# result: lottery draws, and smp_scheduler's per-core queue picks and steals on more than one CPU
+def _unseeded_random(scheduler, params):
+    if params.get("seed") is not None:
+        return False
+    if scheduler is lottery_scheduler:
+        return True
+    if scheduler is smp_scheduler:
+        return params.get("queue_mode", "global") == "per_core" and params.get("num_cpus", 4) > 1
+    return False
+
+
+class ResultCache:
+    def __init__(self, directory, max_bytes=1 << 30, memo_entries=16):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memo_entries = memo_entries
+        self.memo = OrderedDict()
+        self.hits = 0
+        self.memo_hits = 0
+        self.misses = 0
+        # Entry sizes, least recently used first (an entry's modification time is when it was last used)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".result"):
+                stat = os.stat(os.path.join(directory, name))
+                entries.append((stat.st_mtime, name[:-len(".result")], stat.st_size))
+        entries.sort()
+        self.sizes = OrderedDict((key, size) for _, key, size in entries)
+        self.total_bytes = sum(self.sizes.values())
+
+    # Content hash of (scheduler name, parameters, workload columns)
+    @staticmethod
+    def key(algorithm, table, params):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps([RESULT_CACHE_VERSION, algorithm, params], sort_keys=True, default=repr).encode())
+        for column in (table.pids, table.arrivals, table.bursts, table.phase_offsets, table.phase_lengths):
+            if column is not None:
+                digest.update(memoryview(column).cast("B"))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".result")
+
+    def _remember(self, key, entry):
+        self.memo[key] = entry
+        self.memo.move_to_end(key)
+        while len(self.memo) > self.memo_entries:
+            self.memo.popitem(last=False)
+
+    # The stored entry, or None
+    def get(self, key):
+        path = self._path(key)
+        entry = self.memo.get(key)
+        if entry is not None:
+            self.memo.move_to_end(key)
+            self.memo_hits += 1
+        else:
+            try:
+                with open(path, "rb") as f:
+                    entry = pickle.load(f)
+            except FileNotFoundError:
+                entry = None
+            except (pickle.UnpicklingError, EOFError, AttributeError):
+                entry = None # Unreadable, e.g. cut short by a crash; it is replaced by the next put()
+            if entry is None or entry.get("version") != RESULT_CACHE_VERSION:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, entry)
+        try:
+            os.utime(path)
+            if key not in self.sizes:
+                self.sizes[key] = os.path.getsize(path)
+                self.total_bytes += self.sizes[key]
+            self.sizes.move_to_end(key)
+        except FileNotFoundError:
+            pass # Evicted by another process since; the memo copy is still good
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        # Written to a temporary file first so other processes never see half an entry
+        with tempfile.NamedTemporaryFile("wb", dir=self.directory, suffix=".tmp", delete=False) as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+        self.total_bytes += os.path.getsize(path) - self.sizes.pop(key, 0)
+        self.sizes[key] = os.path.getsize(path)
+        self._remember(key, entry)
+        # The newest entry is kept even when it alone is over the budget
+        while self.total_bytes > self.max_bytes and len(self.sizes) > 1:
+            old_key, size = self.sizes.popitem(last=False)
+            self.total_bytes -= size
+            self.memo.pop(old_key, None)
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for key in self.sizes:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self.sizes.clear()
+        self.memo.clear()
+        self.total_bytes = 0
+
+    # Runs scheduler(processes_input, **params) or returns the stored result for the same workload and
+    # parameters: (schedule, completed) like the scheduler itself, with `metrics` merged in either way.
+    # The event log is not stored, so the scheduler always runs silently. Randomized runs without a seed
+    # are never stored or looked up, since the next run would not give the same answer.
+    # A hit rebuilds the SegmentStore and, with keep_completed, one Process per completed process; for
+    # large workloads that rebuild dominates a hit from memory (about 0.3s for 200k processes).
+    def run(self, scheduler, processes_input, metrics=None, keep_completed=True, **params):
+        if _unseeded_random(scheduler, params):
+            return scheduler(processes_input, sink=SilentSink(), metrics=metrics, keep_completed=keep_completed,
+                             **params)
+        table, run, stream = open_workload(processes_input)
+        if stream is not None:
+            while not stream.exhausted:
+                stream.fill(run)
+        key = self.key(scheduler.__name__, table, params)
+        entry = self.get(key)
+        # An entry stored without the completed processes does not do when they are wanted
+        if entry is None or (keep_completed and entry["completed"] is None):
+            # Exact percentiles are kept when the caller collects them, so a later hit reports them too
+            accumulator = MetricsAccumulator(exact_percentiles=metrics is not None and metrics.values is not None)
+            schedule, completed = scheduler(table, sink=SilentSink(), metrics=accumulator,
+                                            keep_completed=keep_completed, **params)
+            stores = schedule if isinstance(schedule, list) else [schedule]
+            entry = {
+                "version": RESULT_CACHE_VERSION,
+                "per_core": isinstance(schedule, list),
+                "schedule": [store.columns() for store in stores],
+                "completed": (array('q', [p.pid for p in completed]), array('d', [p.arrival_time for p in completed]),
+                              array('d', [p.burst_time for p in completed]), array('d', [p.start_time for p in completed]),
+                              array('d', [p.completion_time for p in completed]),
+                              array('d', [p.io_time for p in completed])) if keep_completed else None,
+                "metrics": accumulator,
+            }
+            self.put(key, entry)
+        else:
+            stores = [SegmentStore.from_columns(*columns) for columns in entry["schedule"]]
+            schedule = stores if entry["per_core"] else stores[0]
+            completed = [completed_process(*row) for row in zip(*entry["completed"])] if keep_completed else []
+        if metrics is not None:
+            metrics.merge(entry["metrics"])
+        return schedule, completed
+
+
+# Shared workloads
+# Copies a ProcessTable's columns into one shared memory block so worker processes can read the same
+# workload without it being pickled for every task. Use as a context manager; the block is freed on exit.
+# Workloads with I/O bursts also share their io_times, phase_offsets and phase_lengths columns.
+class SharedWorkload:
+    def __init__(self, table):
+        table = ProcessTable.from_processes(table).sorted_by_arrival()
+        self.num_processes = n = len(table)
+        self.num_phases = m = len(table.phase_lengths) if table.phase_offsets is not None else 0
+        size = 24 * n + (16 * n + 8 + 8 * m if m else 0)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+        buf = self.shm.buf
+        buf[0:8 * n] = memoryview(table.pids).cast("B")
+        buf[8 * n:16 * n] = memoryview(table.arrivals).cast("B")
+        buf[16 * n:24 * n] = memoryview(table.bursts).cast("B")
+        if m:
+            buf[24 * n:32 * n] = memoryview(table.io_times).cast("B")
+            buf[32 * n:40 * n + 8] = memoryview(table.phase_offsets).cast("B")
+            buf[40 * n + 8:size] = memoryview(table.phase_lengths).cast("B")
+        self.name = self.shm.name
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Opens a SharedWorkload from another process. The table's columns are views straight onto the shared
+# block, so nothing is copied; keep the returned SharedMemory object alive while the table is in use.
+def attach_shared_workload(name, num_processes, num_phases=0):
+    shm = shared_memory.SharedMemory(name=name)
+    n = num_processes
+    table = ProcessTable()
+    table.pids = shm.buf[0:8 * n].cast("q")
+    table.arrivals = shm.buf[8 * n:16 * n].cast("d")
+    table.bursts = shm.buf[16 * n:24 * n].cast("d")
+    if num_phases:
+        table.io_times = shm.buf[24 * n:32 * n].cast("d")
+        table.phase_offsets = shm.buf[32 * n:40 * n + 8].cast("q")
+        table.phase_lengths = shm.buf[40 * n + 8:40 * n + 8 + 8 * num_phases].cast("d")
+    return table, shm
+
+
+# MLFQ parameter sweeps
+# A configuration is a dict with "levels", "base_quantum", "growth" and "boost_period". Level i gets a
+# quantum of base_quantum * growth**i and the last level runs to completion (quantum inf).
+def mlfq_config_quantums(config):
+    levels = config["levels"]
+    return [config["base_quantum"] * config["growth"] ** i for i in range(levels - 1)] + [float('inf')]
+
+
+# Every combination of the options (search="grid"), or `samples` distinct random picks from them (search="random")
+def mlfq_search_space(base_quantums=(2, 5, 10), levels=(3,), growths=(2,), boost_periods=(None,),
+                      search="grid", samples=20, seed=None):
+    grid = [{"levels": L, "base_quantum": q, "growth": g, "boost_period": b}
+            for L, q, g, b in itertools.product(levels, base_quantums, growths, boost_periods)]
+    if search == "grid":
+        return grid
+    if search == "random":
+        return random.Random(seed).sample(grid, min(samples, len(grid)))
+    raise ValueError(f"Unknown search '{search}' (expected grid or random)")
+
+
+# Set in each worker process by _sweep_worker_init
+_sweep_table = None
+_sweep_shm = None
+_sweep_cache = None
+
+
+def _sweep_worker_init(shm_name, num_processes, num_phases=0, cache_dir=None, cache_bytes=1 << 30):
+    global _sweep_table, _sweep_shm, _sweep_cache
+    _sweep_table, _sweep_shm = attach_shared_workload(shm_name, num_processes, num_phases)
+    if cache_dir is not None:
+        _sweep_cache = ResultCache(cache_dir, cache_bytes)
+
+
+def _sweep_run(config):
+    started = time.perf_counter()
+    metrics = MetricsAccumulator()
+    params = {"time_quantums": mlfq_config_quantums(config), "num_queues": config["levels"],
+              "boost_period": config["boost_period"]}
+    if _sweep_cache is not None:
+        _sweep_cache.run(mlfq_scheduler, _sweep_table, metrics=metrics, keep_completed=False, **params)
+    else:
+        mlfq_scheduler(_sweep_table, sink=SilentSink(), metrics=metrics, keep_completed=False, **params)
+    result = dict(config)
+    result.update(metrics.summary())
+    result["Seconds"] = time.perf_counter() - started
+    return result
+
+
+# Runs mlfq_scheduler once per configuration on a process pool and yields each result dict (the
+# configuration plus its metrics) as soon as it finishes. The workload is placed in shared memory once.
+# With cache_dir, results are looked up in and added to a ResultCache there.
+def iter_mlfq_sweep(workload, configs, max_workers=None, cache_dir=None, cache_bytes=1 << 30):
+    table = load_workload(workload)
+    with SharedWorkload(table) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_sweep_worker_init,
+                                 initargs=(shared.name, shared.num_processes, shared.num_phases, cache_dir,
+                                           cache_bytes)) as pool:
+            futures = [pool.submit(_sweep_run, config) for config in configs]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+# Same as iter_mlfq_sweep but returns every result ranked by `rank_by` (lowest first, or highest
+# first for Throughput and CPU_Util)
+def mlfq_sweep(workload, configs, max_workers=None, rank_by="AWT", cache_dir=None, cache_bytes=1 << 30):
+    return rank_sweep_results(list(iter_mlfq_sweep(workload, configs, max_workers, cache_dir, cache_bytes)), rank_by)
+
+
+def rank_sweep_results(results, rank_by="AWT"):
+    higher_is_better = rank_by in ("Throughput", "CPU_Util")
+    return sorted(results, key=lambda r: r.get(rank_by, float('inf')), reverse=higher_is_better)
+
+
+def print_sweep_table(results):
+    print(f"{'Rank':<5} | {'Levels':<6} | {'Quantum':<8} | {'Growth':<6} | {'Boost':<8} | "
+          f"{'AWT':<10} | {'ATT':<10} | {'Throughput':<10}")
+    print("-" * 86)
+    for rank, r in enumerate(results, 1):
+        boost = "off" if r["boost_period"] is None else f"{r['boost_period']:g}"
+        print(f"{rank:<5} | {r['levels']:<6} | {r['base_quantum']:<8g} | {r['growth']:<6g} | {boost:<8} | "
+              f"{r.get('AWT', 0):<10.2f} | {r.get('ATT', 0):<10.2f} | {r.get('Throughput', 0):<10.4f}")
+
+
+# Scheduler registry
+# Every policy the command line and compare_schedulers can run, by name. An entry holds the scheduler
+# function (called as scheduler(processes_input, sink=, metrics=, keep_completed=, **params) and returning
+# (schedule, completed)), the label used in reports, its default parameters and, when smp_scheduler
+# supports it, the smp_scheduler policy used for more than one CPU, and whether it handles workloads with
+# I/O bursts (io_bursts). New policies only need a
+# register_scheduler() call.
+SCHEDULERS = {}
+
+
+def register_scheduler(name, scheduler, label, title=None, smp_policy=None, io_bursts=False, **params):
+    SCHEDULERS[name] = {"scheduler": scheduler, "label": label, "title": title or label, "smp_policy": smp_policy,
+                        "io_bursts": io_bursts, "params": params}
+
+
+register_scheduler("srtf", srtf_scheduler, "SRTF", "Shortest Remaining Time First(SRTF)", smp_policy="srtf",
+                   io_bursts=True)
+register_scheduler("mlfq", mlfq_scheduler, "MLFQ", "Multi-Level Feedback Queue(MLFQ)", smp_policy="mlfq",
+                   io_bursts=True, time_quantums=[5, 10, float('inf')], num_queues=3)
+register_scheduler("cfs", cfs_scheduler, "CFS", "Completely Fair Scheduler(CFS)")
+register_scheduler("lottery", lottery_scheduler, "Lottery", "Lottery Scheduler", seed=0)
+register_scheduler("stride", stride_scheduler, "Stride", "Stride Scheduler")
+
+
+# Runs the registered policy `name` with its default parameters updated by `params`, on smp_scheduler when
+# num_cpus > 1 (smp_options are its queue_mode, migration_cost and seed arguments). With a ResultCache the
+# result may come from the cache, in which case there is no event log.
+def run_policy(name, processes_input, sink=None, metrics=None, keep_completed=True, num_cpus=1, smp_options=None,
+               cache=None, **params):
+    if name not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler '{name}' (expected one of {', '.join(SCHEDULERS)})")
+    entry = SCHEDULERS[name]
+    params = dict(entry["params"], **params)
+    scheduler = entry["scheduler"]
+    if num_cpus > 1:
+        if entry["smp_policy"] is None:
+            raise ValueError(f"{entry['label']} can only be simulated on one CPU")
+        scheduler = smp_scheduler
+        params.update(smp_options or {}, num_cpus=num_cpus, policy=entry["smp_policy"])
+    if cache is None:
+        return scheduler(processes_input, sink=sink, metrics=metrics, keep_completed=keep_completed, **params)
+    return cache.run(scheduler, processes_input, metrics=metrics, keep_completed=keep_completed, **params)
+
+
+def _compare_run(name, num_cpus, smp_options):
+    started = time.perf_counter()
+    metrics = MetricsAccumulator()
+    run_policy(name, _sweep_table, sink=SilentSink(), metrics=metrics, keep_completed=False, num_cpus=num_cpus,
+               smp_options=smp_options, cache=_sweep_cache)
+    return metrics, time.perf_counter() - started
+
+
+# Runs each named policy on its own worker process over one shared memory copy of the workload and
+# returns [(name, MetricsAccumulator, seconds)] in the order given, so K policies take about as long as
+# the slowest one instead of the sum. The workers are set up like iter_mlfq_sweep's.
+def compare_schedulers(workload, names, num_cpus=1, smp_options=None, max_workers=None, cache_dir=None,
+                       cache_bytes=1 << 30):
+    for name in names:
+        if name not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{name}' (expected one of {', '.join(SCHEDULERS)})")
+    table = load_workload(workload)
+    with SharedWorkload(table) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers or len(names), initializer=_sweep_worker_init,
+                                 initargs=(shared.name, shared.num_processes, shared.num_phases, cache_dir,
+                                           cache_bytes)) as pool:
+            futures = [pool.submit(_compare_run, name, num_cpus, smp_options) for name in names]
+            return [(name, *future.result()) for name, future in zip(names, futures)]
+
+
+# Metrics shown side by side by print_comparison_table, as (row label, metrics key)
+COMPARISON_ROWS = (("AWT", "AWT"), ("ATT", "ATT"), ("ART", "ART"), ("WT p99", "WT_p99"), ("TAT p99", "TAT_p99"),
+                   ("CPU Util%", "CPU_Util"), ("Throughput", "Throughput"))
+
+
+# One column per (label, metrics dict)
+def print_comparison_table(results):
+    print(f"{'Metric':<12} | " + " | ".join(f"{label:<10}" for label, _ in results))
+    print("-" * (12 + 13 * len(results) - 3))
+    for row_label, key in COMPARISON_ROWS:
+        print(f"{row_label:<12} | " + " | ".join(f"{metrics.get(key, float('nan')):<10.2f}" for _, metrics in results))
+
+
 #Get User Input
 def get_process_input():
     processes = []
@@ -379,67 +3311,212 @@ def get_process_input():
                 print("Invalid input. Please enter numbers.")
     return processes
 
+# Command line options. With no trace file the processes are typed in interactively as before.
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare CPU scheduling policies (SRTF and MLFQ by default).")
+    parser.add_argument("trace", nargs="?",
+                        help="trace file (csv, jsonl or bin) sorted by arrival time; prompts for processes when omitted")
+    parser.add_argument("--format", choices=["csv", "jsonl", "bin"],
+                        help="trace format, taken from the file extension by default")
+    parser.add_argument("--columns", default="",
+                        help="column names in the trace, e.g. pid=job_id,arrival=submit,burst=runtime")
+    parser.add_argument("--policies", default="srtf,mlfq",
+                        help=f"comma separated policies to compare, from {', '.join(SCHEDULERS)}")
+    parser.add_argument("--verbose", action="store_true",
+                        help="print the event log, execution order and process states for trace files too")
+    parser.add_argument("--window", metavar="T1,T2",
+                        help="only print execution segments that overlap this time window")
+    parser.add_argument("--cpus", type=int, default=1, help="simulate this many CPUs with smp_scheduler")
+    parser.add_argument("--queue-mode", choices=SMP_QUEUE_MODES, default="global",
+                        help="one shared ready queue or per-CPU queues with work stealing (with --cpus)")
+    parser.add_argument("--migration-cost", type=float, default=0.0,
+                        help="extra CPU time when a process resumes on a different CPU (with --cpus)")
+    parser.add_argument("--profile", nargs="?", const="", metavar="JSON",
+                        help="count scheduler events and time the loop phases; also written to JSON when a path is given")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="reuse scheduler results stored in this directory for the same workload and parameters")
+    parser.add_argument("--cache-size", type=float, default=1024, metavar="MB",
+                        help="delete the least recently used cached results beyond this size (with --cache)")
+    parser.add_argument("--generate", type=int, metavar="N",
+                        help="run on N synthetic processes from generate_workload instead of a trace")
+    parser.add_argument("--seed", type=int, help="random seed for --generate")
+    parser.add_argument("--arrival", choices=ARRIVAL_PATTERNS, default="poisson", help="arrival pattern for --generate")
+    parser.add_argument("--burst", choices=BURST_DISTRIBUTIONS, default="exponential",
+                        help="burst time distribution for --generate")
+    parser.add_argument("--io-fraction", type=float, default=0.0,
+                        help="make this fraction of the --generate processes I/O bound (SRTF and MLFQ only)")
+    parser.add_argument("--io-bursts", type=int, default=4, help="CPU bursts per I/O bound process")
+    parser.add_argument("--mean-io", type=float, default=5.0, help="mean I/O wait between the CPU bursts")
+    sweep = parser.add_argument_group("MLFQ parameter sweep")
+    sweep.add_argument("--sweep", action="store_true",
+                       help="tune MLFQ over the options below on a process pool instead of comparing SRTF and MLFQ")
+    sweep.add_argument("--sweep-quantums", default="2,5,10", help="comma separated Q0 quantums to try")
+    sweep.add_argument("--sweep-levels", default="3", help="comma separated queue counts to try")
+    sweep.add_argument("--sweep-growth", default="2", help="comma separated quantum growth factors per level")
+    sweep.add_argument("--sweep-boost", default="none", help="comma separated boost periods to try ('none' for off)")
+    sweep.add_argument("--sweep-search", choices=["grid", "random"], default="grid",
+                       help="try every combination or --sweep-samples random ones")
+    sweep.add_argument("--sweep-samples", type=int, default=20, help="configurations to try with --sweep-search random")
+    sweep.add_argument("--workers", type=int,
+                       help="worker processes for the sweep or comparison (defaults to the CPU count / policy count)")
+    sweep.add_argument("--rank-by", choices=["AWT", "ATT", "Throughput"], default="AWT", help="metric to rank by")
+    args = parser.parse_args(argv)
+    for name in args.policies.split(","):
+        if name.strip() and name.strip() not in SCHEDULERS:
+            parser.error(f"unknown policy '{name.strip()}' (expected one of {', '.join(SCHEDULERS)})")
+        if name.strip() and args.cpus > 1 and SCHEDULERS[name.strip()]["smp_policy"] is None:
+            parser.error(f"{SCHEDULERS[name.strip()]['label']} can only be simulated on one CPU (--cpus 1)")
+        if name.strip() and args.io_fraction > 0 and not SCHEDULERS[name.strip()]["io_bursts"]:
+            parser.error(f"{SCHEDULERS[name.strip()]['label']} does not support I/O bursts (--io-fraction)")
+    if args.io_fraction > 0 and args.cpus > 1:
+        parser.error("I/O bursts (--io-fraction) can only be simulated on one CPU (--cpus 1)")
+    if args.profile is not None and args.cpus > 1:
+        parser.error("--profile is only available on one CPU (--cpus 1)")
+    return args
+
+
+# Prints an execution order: one SegmentStore, or one per CPU from smp_scheduler, optionally limited to a time window
+def print_execution_order(schedule, window=None):
+    per_cpu = isinstance(schedule, list)
+    stores = schedule if per_cpu else [schedule]
+    if not any(len(store) for store in stores):
+        print("  No execution segments.")
+        return
+    for cpu, store in enumerate(stores):
+        if per_cpu:
+            print(f"  CPU {cpu}:")
+        for item in (store.between(*window) if window else store):
+            print(f"  PID: {item[0]}, Start: {item[1]:.2f}, End: {item[2]:.2f}")
+
+
+# Turns "2,5,none" into [2.0, 5.0, None]
+def parse_number_list(text, number=float):
+    return [None if item.strip().lower() in ("none", "off") else number(item) for item in text.split(",") if item.strip()]
+
+
+# The --sweep command: prints each configuration as it finishes, then the ranked table
+def run_sweep_command(args, workload):
+    configs = mlfq_search_space(base_quantums=parse_number_list(args.sweep_quantums),
+                                levels=parse_number_list(args.sweep_levels, int),
+                                growths=parse_number_list(args.sweep_growth),
+                                boost_periods=parse_number_list(args.sweep_boost),
+                                search=args.sweep_search, samples=args.sweep_samples, seed=args.seed)
+    print(f"\nSweeping {len(configs)} MLFQ configurations...")
+    results = []
+    for result in iter_mlfq_sweep(workload, configs, max_workers=args.workers, cache_dir=args.cache,
+                                  cache_bytes=int(args.cache_size * 1024 * 1024)):
+        results.append(result)
+        print(f"  [{len(results)}/{len(configs)}] levels={result['levels']} quantum={result['base_quantum']:g} "
+              f"growth={result['growth']:g} boost={result['boost_period']}: AWT {result.get('AWT', 0):.2f}, "
+              f"ATT {result.get('ATT', 0):.2f} ({result['Seconds']:.2f}s)")
+    print(f"\nMLFQ Sweep Results (ranked by {args.rank_by})")
+    print_sweep_table(rank_sweep_results(results, args.rank_by))
+
+
+# Turns "pid=job_id,arrival=submit" into {"pid": "job_id", "arrival": "submit"}
+def parse_column_mapping(text):
+    mapping = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        key, sep, name = item.partition("=")
+        if not sep or key.strip() not in TRACE_COLUMNS:
+            raise ValueError(f"Bad column mapping '{item}', expected one of {sorted(TRACE_COLUMNS)}=<column name>")
+        mapping[key.strip()] = name.strip()
+    return mapping
+
+
 #Main Execution
 if __name__ == "__main__":
-    user_processes = get_process_input()
+    args = parse_args()
+    if args.generate:
+        generated_table = generate_workload(args.generate, seed=args.seed, arrival=args.arrival, burst=args.burst)
+        if args.io_fraction > 0:
+            generated_table = add_io_bursts(generated_table, args.io_fraction, args.io_bursts, args.mean_io, args.seed)
+        def workload():
+            return generated_table
+        verbose = args.verbose
+        user_processes = None
+    elif args.trace:
+        trace_column_mapping = parse_column_mapping(args.columns)
+        # The trace is streamed again for each scheduler instead of being kept in memory
+        def workload():
+            return load_trace(args.trace, args.format, trace_column_mapping)
+        verbose = args.verbose
+        user_processes = None
+    else:
+        user_processes = get_process_input()
+        def workload():
+            return user_processes
+        verbose = True
+
+    window = parse_number_list(args.window) if args.window else None
+    cache = ResultCache(args.cache, int(args.cache_size * 1024 * 1024)) if args.cache else None
 
-    if not user_processes:
+    if args.sweep:
+        run_sweep_command(args, workload())
+    elif user_processes is not None and not user_processes:
         print("No processes entered. Exiting.")
     else:
-        print("\nRunning Schedulers with Provided Processes...")
-        print("Initial Processes:")
-        for p in user_processes:
-            print(f"  PID: {p.pid}, Arrival: {p.arrival_time}, Burst: {p.burst_time}")
-
-        #Run SRTF
-        print("\n\nRunning Shortest Remaining Time First(SRTF) Scheduler")
-        srtf_schedule, srtf_completed = srtf_scheduler(user_processes)
-
-        print("\nSRTF Execution Order (PID, Start, End):")
-        if srtf_schedule:
-            for item in srtf_schedule:
-                print(f"  PID: {item[0]}, Start: {item[1]:.2f}, End: {item[2]:.2f}")
-        else:
-            print("  No execution segments.")
-
-        print("\nSRTF Final Process States:")
-        if srtf_completed:
-             for p in sorted(srtf_completed, key=lambda x: x.pid): # Sort by PID for readability
-                  print(f"  PID: {p.pid}, AT: {p.arrival_time:.2f}, BT: {p.burst_time:.2f}, CT: {p.completion_time:.2f}, TAT: {p.turnaround_time:.2f}, WT: {p.waiting_time:.2f}")
+        if user_processes is not None:
+            print("\nRunning Schedulers with Provided Processes...")
+            print("Initial Processes:")
+            for p in user_processes:
+                print(f"  PID: {p.pid}, Arrival: {p.arrival_time}, Burst: {p.burst_time}")
+        elif args.generate:
+            io = f", {args.io_fraction:.0%} I/O bound" if args.io_fraction > 0 else ""
+            print(f"\nRunning Schedulers on {args.generate} generated processes ({args.arrival} arrivals, {args.burst} bursts{io})...")
         else:
-             print("  No processes completed.")
-        srtf_metrics = calculate_and_print_metrics(srtf_completed, "SRTF")
-
-
-        #Run MLFQ
-        print("\n\nRunning Multi-Level Feedback Queue(MLFQ) Scheduler")
-        # Define MLFQ parameters (can be customized)
-        mlfq_quantums = [5, 10, float('inf')] # Example: Q0=5, Q1=10, Q2=FCFS
-        mlfq_num_queues = len(mlfq_quantums)
-        # Pass the user_processes list again. The function makes its own copy.
-        mlfq_schedule, mlfq_completed = mlfq_scheduler(user_processes, time_quantums=mlfq_quantums, num_queues=mlfq_num_queues)
-
-        print("\nMLFQ Execution Order (PID, Start, End):")
-        if mlfq_schedule:
-            for item in mlfq_schedule:
-                print(f"  PID: {item[0]}, Start: {item[1]:.2f}, End: {item[2]:.2f}")
-        else:
-            print("No execution segments.")
-
-        print("\nMLFQ Final Process States:")
-        if mlfq_completed:
-             for p in sorted(mlfq_completed, key=lambda x: x.pid): # Sort by PID
-                  print(f"  PID: {p.pid}, AT: {p.arrival_time:.2f}, BT: {p.burst_time:.2f}, CT: {p.completion_time:.2f}, TAT: {p.turnaround_time:.2f}, WT: {p.waiting_time:.2f}")
+            print(f"\nRunning Schedulers on trace {args.trace}...")
+
+        policies = [name.strip() for name in args.policies.split(",") if name.strip()]
+        smp_options = {"queue_mode": args.queue_mode, "migration_cost": args.migration_cost, "seed": args.seed}
+        comparison = []
+        # The event log, execution order and profile are printed as each policy runs, so those runs happen one
+        # after another here; otherwise every policy runs at once on its own worker process.
+        if verbose or args.profile is not None or len(policies) == 1:
+            profiles = {}
+            for name in policies:
+                entry = SCHEDULERS[name]
+                print(f"\n\nRunning {entry['title']} Scheduler")
+                # Metrics are collected while the scheduler runs; the completed process list is only kept when it is
+                # printed, and then the percentiles are worked out exactly from every process's times too
+                accumulator = MetricsAccumulator(exact_percentiles=verbose)
+                if args.profile is not None:
+                    # Profiling needs the simulation to actually run, so the cache is skipped
+                    profiles[entry["label"]] = Instrumentation(timers=True)
+                    schedule, completed = run_policy(name, workload(), ConsoleSink() if verbose else SilentSink(),
+                                                     accumulator, verbose, instrument=profiles[entry["label"]])
+                else:
+                    schedule, completed = run_policy(name, workload(), ConsoleSink() if verbose else SilentSink(),
+                                                     accumulator, verbose, num_cpus=args.cpus,
+                                                     smp_options=smp_options, cache=cache)
+
+                if verbose:
+                    print(f"\n{entry['label']} Execution Order (PID, Start, End):")
+                    print_execution_order(schedule, window)
+
+                    print(f"\n{entry['label']} Final Process States:")
+                    if completed:
+                         for p in sorted(completed, key=lambda x: x.pid): # Sort by PID for readability
+                              print(f"  PID: {p.pid}, AT: {p.arrival_time:.2f}, BT: {p.burst_time:.2f}, CT: {p.completion_time:.2f}, TAT: {p.turnaround_time:.2f}, WT: {p.waiting_time:.2f}")
+                    else:
+                         print("  No processes completed.")
+                comparison.append((entry["label"], calculate_and_print_metrics(accumulator, entry["label"])))
+                if entry["label"] in profiles:
+                    print(f"\n{entry['label']} " + profiles[entry["label"]].format_summary())
+            if args.profile:
+                with open(args.profile, "w", encoding="utf-8") as f:
+                    json.dump({label: profile.summary() for label, profile in profiles.items()}, f, indent=2)
         else:
-             print("No processes completed.")
-
-        mlfq_metrics = calculate_and_print_metrics(mlfq_completed, "MLFQ")
+            print(f"\n\nRunning {', '.join(SCHEDULERS[name]['label'] for name in policies)} concurrently")
+            results = compare_schedulers(workload(), policies, num_cpus=args.cpus, smp_options=smp_options,
+                                         max_workers=args.workers, cache_dir=args.cache,
+                                         cache_bytes=int(args.cache_size * 1024 * 1024))
+            for name, accumulator, seconds in results:
+                print(f"  {SCHEDULERS[name]['label']} finished in {seconds:.2f}s")
+            for name, accumulator, seconds in results:
+                label = SCHEDULERS[name]["label"]
+                comparison.append((label, calculate_and_print_metrics(accumulator, label)))
 
         # Metric Results comparison
         print("\n\nMetric Results")
-        print(f"{'Metric':<12} | {'SRTF':<10} | {'MLFQ':<10}")
-        print("-" * 35)
-        print(f"{'AWT':<12} | {srtf_metrics.get('AWT', 'N/A'):<10.2f} | {mlfq_metrics.get('AWT', 'N/A'):<10.2f}")
-        print(f"{'ATT':<12} | {srtf_metrics.get('ATT', 'N/A'):<10.2f} | {mlfq_metrics.get('ATT', 'N/A'):<10.2f}")
-        print(f"{'CPU Util%':<12} | {srtf_metrics.get('CPU_Util', 'N/A'):<10.2f} | {mlfq_metrics.get('CPU_Util', 'N/A'):<10.2f}")
-        print(f"{'Throughput':<12} | {srtf_metrics.get('Throughput', 'N/A'):<10.2f} | {mlfq_metrics.get('Throughput', 'N/A'):<10.2f}")
\ No newline at end of file
+        print_comparison_table(comparison)
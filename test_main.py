@@ -0,0 +1,771 @@
+# Regression tests for the schedulers in main.py, run with `python -m pytest`
+# Expected values are worked out by hand or taken from the original (pre event driven) implementations.
+import io
+import json
+import random
+from array import array
+
+import pytest
+
+import main
+
+INF = float('inf')
+
+
+def run(scheduler, jobs, sink=None, **params):
+    schedule, completed = scheduler(jobs, sink=sink or main.SilentSink(), **params)
+    return list(schedule), {p.pid: (p.start_time, p.completion_time, p.waiting_time) for p in completed}
+
+
+def random_jobs(seed, count=30):
+    rng = random.Random(seed)
+    arrival = 0
+    jobs = []
+    for pid in range(1, count + 1):
+        arrival += rng.randint(0, 4)
+        jobs.append(main.Process(pid, arrival, rng.randint(1, 12)))
+    return jobs
+
+
+# SRTF with fractional times: P2 preempts P1 on arrival, P3 ties with P2's remaining time and waits for it
+def test_srtf_fractional_times():
+    jobs = [main.Process(1, 0.0, 3.5), main.Process(2, 1.25, 1.5), main.Process(3, 2.0, 0.75)]
+    schedule, completed = run(main.srtf_scheduler, jobs)
+    assert schedule == [(1, 0.0, 1.25), (2, 1.25, 2.75), (3, 2.75, 3.5), (1, 3.5, 5.75)]
+    assert completed == {1: (0.0, 5.75, 2.25), 2: (1.25, 2.75, 0.0), 3: (2.75, 3.5, 0.75)}
+
+
+# Schedule and completions produced by the original srtf_scheduler for the same input
+def test_srtf_matches_original():
+    jobs = [main.Process(*row) for row in [(1, 0, 8), (2, 1, 4), (3, 2, 9), (4, 3, 5), (5, 20, 2)]]
+    schedule, completed = run(main.srtf_scheduler, jobs)
+    assert schedule == [(1, 0, 1), (2, 1, 5), (4, 5, 10), (1, 10, 17), (3, 17, 20), (5, 20, 22), (3, 22, 28)]
+    assert completed == {1: (0, 17, 9), 2: (1, 5, 0), 3: (17, 28, 17), 4: (5, 10, 2), 5: (20, 22, 0)}
+
+
+# Several processes arriving at once, and an idle gap before the next one
+def test_srtf_simultaneous_arrivals_and_idle_gap():
+    jobs = [main.Process(1, 0, 4), main.Process(2, 0, 2), main.Process(3, 0, 2), main.Process(4, 10, 1)]
+    schedule, completed = run(main.srtf_scheduler, jobs)
+    assert schedule == [(2, 0, 2), (3, 2, 4), (1, 4, 8), (4, 10, 11)]
+    assert completed == {1: (4, 8, 4), 2: (0, 2, 0), 3: (2, 4, 2), 4: (10, 11, 0)}
+
+
+# Log text printed by the original schedulers for the same runs (int input for SRTF prints int times)
+ORIGINAL_SRTF_LOG = """\
+Time 0: Process 1 arrived, added to ready queue.
+Time 0: Process 1 starts/resumes execution (Remaining: 5.00).
+Time 1: Process 1 executed for 1.00. Remaining time: 4.00
+Time 1: Process 2 arrived, added to ready queue.
+Time 1: Newly arrived Process 2 (RT: 2) preempts running Process 1 (RT: 4).
+Time 1: Process 2 starts/resumes execution (Remaining: 2.00).
+Time 3: Process 2 executed for 2.00. Remaining time: 0.00
+Time 3: Process 2 completed.
+Time 3: Process 1 starts/resumes execution (Remaining: 4.00).
+Time 7: Process 1 executed for 4.00. Remaining time: 0.00
+Time 7: Process 1 completed.
+Time 7.00-10.00: CPU Idle.
+Time 10: Process 3 arrived, added to ready queue.
+Time 10: Process 3 starts/resumes execution (Remaining: 3.00).
+Time 13: Process 3 executed for 3.00. Remaining time: 0.00
+Time 13: Process 3 completed.
+"""
+
+ORIGINAL_MLFQ_LOG = """\
+MLFQ Run Start
+Queues: 3, Time Quantums: [2, 4, inf]
+Time 0.00: Process 1 arrived, added to Q0.
+Time 0.00: Process 1 selected from Q0 to run (Quantum: 2, Remaining: 5.00).
+Time 1.00: Process 1 (Q0) ran for 1.00. Remaining: 4.00. Slice left: 1.00
+Time 1.00: Process 2 arrived, added to Q0.
+Time 2.00: Process 1 (Q0) ran for 1.00. Remaining: 3.00. Slice left: 0.00
+Time 2.00: Process 1 quantum expired in Q0. Moving to Q1.
+Time 2.00: Process 2 selected from Q0 to run (Quantum: 2, Remaining: 2.00).
+Time 4.00: Process 2 (Q0) ran for 2.00. Remaining: 0.00. Slice left: 0.00
+Time 4.00: Process 2 completed.
+Time 4.00: Process 1 selected from Q1 to run (Quantum: 4, Remaining: 3.00).
+Time 5.00: Process 1 (Q1) ran for 1.00. Remaining: 2.00. Slice left: 3.00
+Time 5.00: Process 3 arrived, added to Q0.
+Time 5.00: Arrival in Q0 preempts Process 1 (running from Q1).
+Time 5.00: Process 3 selected from Q0 to run (Quantum: 2, Remaining: 1.00).
+Time 6.00: Process 3 (Q0) ran for 1.00. Remaining: 0.00. Slice left: 1.00
+Time 6.00: Process 3 completed.
+Time 6.00: Process 1 selected from Q1 to run (Quantum: 4, Remaining: 2.00).
+Time 8.00: Process 1 (Q1) ran for 2.00. Remaining: 0.00. Slice left: 2.00
+Time 8.00: Process 1 completed.
+MLFQ Run End
+"""
+
+
+def test_console_sink_matches_original_log():
+    out = io.StringIO()
+    main.srtf_scheduler([main.Process(1, 0, 5), main.Process(2, 1, 2), main.Process(3, 10, 3)],
+                        sink=main.ConsoleSink(out))
+    assert out.getvalue() == ORIGINAL_SRTF_LOG
+    out = io.StringIO()
+    main.mlfq_scheduler([main.Process(1, 0, 5), main.Process(2, 1, 2), main.Process(3, 5, 1)],
+                        time_quantums=[2, 4, INF], sink=main.ConsoleSink(out))
+    assert out.getvalue() == ORIGINAL_MLFQ_LOG
+
+
+# The original clock was an int until its first step other than exactly 1, even for float input
+def test_console_sink_srtf_float_input():
+    out = io.StringIO()
+    main.srtf_scheduler([main.Process(1, 0.0, 5.0), main.Process(2, 1.0, 2.0)], sink=main.ConsoleSink(out))
+    lines = out.getvalue().splitlines()
+    assert lines[:6] == [
+        "Time 0: Process 1 arrived, added to ready queue.",
+        "Time 0: Process 1 starts/resumes execution (Remaining: 5.00).",
+        "Time 1: Process 1 executed for 1.00. Remaining time: 4.00",
+        "Time 1: Process 2 arrived, added to ready queue.",
+        "Time 1: Newly arrived Process 2 (RT: 2.0) preempts running Process 1 (RT: 4.0).",
+        "Time 1: Process 2 starts/resumes execution (Remaining: 2.00).",
+    ]
+    assert lines[6] == "Time 3.0: Process 2 executed for 2.00. Remaining time: 0.00"
+
+
+def test_ring_buffer_sink_keeps_the_newest_events():
+    sink = main.RingBufferSink(capacity=4)
+    main.srtf_scheduler([main.Process(1, 0, 5), main.Process(2, 1, 2), main.Process(3, 10, 3)], sink=sink)
+    events = sink.events()
+    assert len(events) == 4
+    assert [(kind, pid) for kind, _, pid, _, _ in events] == [
+        (main.EVENT_DISPATCH, 3), (main.EVENT_RUN, 3), (main.EVENT_COMPLETE, 3), (main.EVENT_RUN_END, -1)]
+
+
+def test_jsonl_sink_writes_valid_json(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = main.JsonlEventSink(str(path), batch_size=3)
+    main.mlfq_scheduler([main.Process(1, 0, 5), main.Process(2, 1, 2)], sink=sink)
+    sink.close()
+    # parse_constant rejects the Infinity/NaN extensions Python would otherwise accept
+    events = [json.loads(line, parse_constant=lambda name: pytest.fail(f"{name} in the log"))
+              for line in path.read_text().splitlines()]
+    assert events[0] == {"event": "run_start", "time": 0, "pid": -1, "a": 3, "b": 0.0}
+    # The last level's infinite quantum is written as null
+    assert events[3] == {"event": "quantum", "time": 0, "pid": -1, "a": 2, "b": None}
+    assert [e["pid"] for e in events if e["event"] == "complete"] == [1, 2]
+
+
+def test_binary_sink_round_trip(tmp_path):
+    path = tmp_path / "events.bin"
+    ring = main.RingBufferSink()
+    binary = main.BinaryEventSink(str(path), batch_size=5)
+    jobs = [main.Process(1, 0, 5), main.Process(2, 1, 2), main.Process(3, 10, 3)]
+    main.srtf_scheduler(jobs, sink=ring)
+    main.srtf_scheduler(jobs, sink=binary)
+    binary.close()
+    assert list(main.read_binary_events(str(path))) == ring.events()
+
+
+def test_process_table_sorts_by_arrival_keeping_ties_in_order():
+    jobs = [main.Process(1, 5, 2), main.Process(2, 0, 3), main.Process(3, 5, 1), main.Process(4, 2, 4)]
+    table = main.ProcessTable.from_processes(jobs).sorted_by_arrival()
+    assert list(table.pids) == [2, 4, 1, 3]
+    assert list(table.arrivals) == [0, 2, 5, 5]
+    assert list(table.bursts) == [3, 4, 2, 1]
+    # Already sorted tables are used as they are
+    assert table.sorted_by_arrival() is table
+
+
+def test_process_table_from_arrays_copies_whole_buffers():
+    table = main.ProcessTable.from_arrays(array('q', [7, 8]), array('d', [0.0, 1.5]), array('d', [2.0, 3.0]))
+    assert [(p.pid, p.arrival_time, p.burst_time) for p in table.to_processes()] == [(7, 0.0, 2.0), (8, 1.5, 3.0)]
+    with pytest.raises(ValueError):
+        main.ProcessTable.from_arrays(array('i', [7, 8]), array('d', [0.0, 1.5]), array('d', [2.0, 3.0]))
+
+
+# Each run works on its own RunColumns, so neither the input processes nor the shared table change
+def test_runs_leave_the_workload_untouched():
+    jobs = [main.Process(1, 0, 4), main.Process(2, 1, 2), main.Process(3, 2, 6)]
+    table = main.ProcessTable.from_processes(jobs)
+    first = run(main.srtf_scheduler, table)
+    second = run(main.srtf_scheduler, table)
+    assert first == second
+    assert list(table.bursts) == [4, 2, 6]
+    assert [(p.remaining_time, p.start_time, p.completion_time) for p in jobs] == [(4, -1, -1), (2, -1, -1), (6, -1, -1)]
+    columns = table.scratch()
+    assert list(columns.remaining) == [4, 2, 6] and list(columns.start) == [-1, -1, -1]
+
+
+# Schedules and completions produced by the original mlfq_scheduler for the same inputs
+@pytest.mark.parametrize("rows, quantums, expected_schedule, expected_completed", [
+    ([(1, 0, 8), (2, 1, 4), (3, 2, 9), (4, 30, 2)], [2, 4, INF],
+     [(1, 0, 2), (2, 2, 4), (3, 4, 6), (1, 6, 10), (2, 10, 12), (3, 12, 16), (1, 16, 18), (3, 18, 21), (4, 30, 32)],
+     {1: (0, 18, 10), 2: (2, 12, 7), 3: (4, 21, 10), 4: (30, 32, 0)}),
+    ([(1, 0, 12), (2, 3, 6), (3, 3, 1), (4, 7, 15), (5, 20, 3)], [5, 10, INF],
+     [(1, 0, 5), (2, 5, 10), (3, 10, 11), (4, 11, 16), (1, 16, 20), (5, 20, 23), (1, 23, 26), (2, 26, 27),
+      (4, 27, 37)],
+     {1: (0, 26, 14), 2: (5, 27, 18), 3: (10, 11, 7), 4: (11, 37, 15), 5: (20, 23, 0)}),
+])
+def test_mlfq_matches_original(rows, quantums, expected_schedule, expected_completed):
+    schedule, completed = run(main.mlfq_scheduler, [main.Process(*row) for row in rows], time_quantums=quantums)
+    assert schedule == expected_schedule
+    assert completed == expected_completed
+
+
+def mlfq_events(jobs, kinds, **params):
+    sink = main.RingBufferSink()
+    schedule, completed = run(main.mlfq_scheduler, jobs, sink=sink, **params)
+    events = [(main.EVENT_NAMES[kind], time, pid, a, b) for kind, time, pid, a, b in sink.events() if kind in kinds]
+    return schedule, events
+
+
+# With an allotment of two quantums per level a process goes round its level once more before moving down
+def test_mlfq_time_allotments():
+    schedule, demotions = mlfq_events([main.Process(1, 0, 6), main.Process(2, 0, 6)], (main.EVENT_DEMOTE,),
+                                      time_quantums=[2, 4, INF], time_allotments=[4, 8, INF])
+    assert schedule == [(1, 0, 2), (2, 2, 4), (1, 4, 6), (2, 6, 8), (1, 8, 10), (2, 10, 12)]
+    assert demotions == [("demote", 2, 1, 0, 0), ("demote", 4, 2, 0, 0), ("demote", 6, 1, 0, 1), ("demote", 8, 2, 0, 1)]
+
+
+# The boost at 10 moves both processes back to Q0, so they share the CPU in short quantums again instead of
+# P1 running out its last level's infinite quantum
+def test_mlfq_priority_boost():
+    jobs = [main.Process(1, 0, 10), main.Process(2, 0, 10)]
+    schedule, _ = mlfq_events(jobs, (), time_quantums=[2, 2, INF])
+    assert schedule == [(1, 0, 2), (2, 2, 4), (1, 4, 6), (2, 6, 8), (1, 8, 14), (2, 14, 20)]
+    schedule, events = mlfq_events(jobs, (main.EVENT_BOOST,), time_quantums=[2, 2, INF], boost_period=10)
+    assert schedule == [(1, 0, 2), (2, 2, 4), (1, 4, 6), (2, 6, 8), (1, 8, 12), (2, 12, 14), (1, 14, 16), (2, 16, 20)]
+    assert events[0][:4] == ("boost", 10, -1, 2)
+
+
+# 140 levels: P1 works its way down to the last one, and an arrival still goes straight to the top
+def test_mlfq_many_levels():
+    schedule, demotions = mlfq_events([main.Process(1, 0, 150), main.Process(2, 100, 3)], (main.EVENT_DEMOTE,),
+                                      time_quantums=[1], num_queues=140)
+    p1_levels = [to_level for _, _, pid, _, to_level in demotions if pid == 1]
+    assert p1_levels == list(range(1, 140)) + [139] * (len(p1_levels) - 139)
+    assert schedule[-2:] == [(2, 100, 103), (1, 103, 153)]
+
+
+ROWS = [(1, 0.0, 8.0), (2, 1.0, 4.0), (3, 2.0, 9.0), (4, 30.0, 2.0)]
+
+
+def test_trace_loaders_read_the_same_rows(tmp_path):
+    csv_path = tmp_path / "jobs.csv"
+    csv_path.write_text("job,submit,runtime\n" + "".join(f"{p},{a},{b}\n" for p, a, b in ROWS))
+    jsonl_path = tmp_path / "jobs.jsonl"
+    jsonl_path.write_text("".join(json.dumps({"arrival_time": a, "burst_time": b}) + "\n\n" for _, a, b in ROWS))
+    bin_path = tmp_path / "jobs.bin"
+    main.write_binary_trace(str(bin_path), ROWS)
+    assert list(main.load_trace(str(csv_path), columns={"pid": "job", "arrival": "submit", "burst": "runtime"})) == ROWS
+    # Without a pid field processes are numbered from 1; blank lines are skipped
+    assert list(main.load_trace(str(jsonl_path))) == ROWS
+    assert list(main.load_trace(str(bin_path))) == ROWS
+    with pytest.raises(ValueError):
+        list(main.load_trace(str(csv_path)))
+    with pytest.raises(ValueError):
+        main.load_trace(str(tmp_path / "jobs.txt"))
+
+
+# A trace streamed a row at a time gives the same result as the whole workload up front
+def test_trace_stream_matches_whole_workload():
+    expected = run(main.mlfq_scheduler, [main.Process(*row) for row in ROWS])
+    assert run(main.mlfq_scheduler, main.TraceStream(iter(ROWS), chunk_size=1)) == expected
+    assert run(main.srtf_scheduler, iter(ROWS)) == run(main.srtf_scheduler, [main.Process(*row) for row in ROWS])
+
+
+def test_trace_stream_rejects_unsorted_rows():
+    with pytest.raises(ValueError):
+        run(main.srtf_scheduler, main.TraceStream(iter([(1, 5.0, 1.0), (2, 3.0, 1.0)]), chunk_size=1))
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize("arrival", main.ARRIVAL_PATTERNS)
+@pytest.mark.parametrize("burst", main.BURST_DISTRIBUTIONS)
+def test_generate_workload(monkeypatch, numpy, arrival, burst):
+    if not numpy:
+        monkeypatch.setattr(main, "np", None) # the pure Python fallback
+    elif main.np is None:
+        pytest.skip("NumPy is not installed")
+    n = 20000
+    table = main.generate_workload(n, seed=5, arrival=arrival, burst=burst, rate=2.0, mean_burst=3.0,
+                                   short_burst=1.0, long_burst=11.0)
+    assert list(table.pids) == list(range(1, n + 1))
+    arrivals = table.arrivals
+    assert all(arrivals[i] <= arrivals[i + 1] for i in range(n - 1))
+    assert min(table.bursts) >= main.MIN_BURST_TIME
+    # Averages close to what was asked for (bimodal: 0.8 * 1 + 0.2 * 11 = 3)
+    assert arrivals[-1] / n == pytest.approx(0.5, rel=0.1)
+    assert sum(table.bursts) / n == pytest.approx(3.0, rel=0.1)
+    if arrival == "bursty":
+        assert len(set(arrivals)) < n / 4
+    # Seeded, so the same call gives the same workload
+    again = main.generate_workload(n, seed=5, arrival=arrival, burst=burst, rate=2.0, mean_burst=3.0,
+                                   short_burst=1.0, long_burst=11.0)
+    assert again.arrivals == arrivals and again.bursts == table.bursts
+
+
+def test_generate_workload_rejects_bad_parameters():
+    with pytest.raises(ValueError):
+        main.generate_workload(10, arrival="uniform")
+    with pytest.raises(ValueError):
+        main.generate_workload(10, burst="normal")
+    with pytest.raises(ValueError):
+        main.generate_workload(10, burst="pareto", pareto_shape=1.0)
+
+
+def test_mlfq_search_space():
+    assert main.mlfq_config_quantums({"levels": 4, "base_quantum": 2, "growth": 3, "boost_period": None}) == \
+           [2, 6, 18, INF]
+    grid = main.mlfq_search_space(base_quantums=(2, 5), levels=(3, 4), boost_periods=(None, 50))
+    assert len(grid) == 8 and all(grid.count(config) == 1 for config in grid)
+    sample = main.mlfq_search_space(base_quantums=(2, 5), levels=(3, 4), boost_periods=(None, 50), search="random",
+                                    samples=3, seed=1)
+    assert len(sample) == 3 and all(config in grid for config in sample)
+
+
+# The workload in shared memory reads back as the same columns, I/O phases included
+def test_shared_workload_round_trip():
+    table = main.add_io_bursts(main.generate_workload(50, seed=2), fraction=0.5, seed=2)
+    with main.SharedWorkload(table) as shared:
+        attached, shm = main.attach_shared_workload(shared.name, shared.num_processes, shared.num_phases)
+        assert run(main.mlfq_scheduler, attached) == run(main.mlfq_scheduler, table)
+        assert [attached.bursts_of(i) for i in range(50)] == [table.bursts_of(i) for i in range(50)]
+        del attached
+        shm.close()
+
+
+# Each configuration run in the pool gives the metrics of a plain mlfq_scheduler run
+def test_mlfq_sweep_matches_serial_runs():
+    jobs = [main.Process(*row) for row in [(1, 0, 8), (2, 1, 4), (3, 2, 9), (4, 3, 5), (5, 20, 2)]]
+    configs = main.mlfq_search_space(base_quantums=(1, 2, 4), boost_periods=(None, 10))
+    results = main.mlfq_sweep(jobs, configs, max_workers=2)
+    assert len(results) == len(configs)
+    assert [r["AWT"] for r in results] == sorted(r["AWT"] for r in results)
+    for result in results:
+        metrics = main.MetricsAccumulator()
+        main.mlfq_scheduler(jobs, sink=main.SilentSink(), metrics=metrics, num_queues=result["levels"],
+                            time_quantums=main.mlfq_config_quantums(result), boost_period=result["boost_period"])
+        assert {name: result[name] for name in ("AWT", "ATT", "Throughput")} == \
+               {name: metrics.summary()[name] for name in ("AWT", "ATT", "Throughput")}
+
+
+def test_quantile_sketch_accuracy_and_merge():
+    rng = random.Random(4)
+    values = [rng.expovariate(0.1) for _ in range(5000)] + [0.0] * 100
+    whole = main.QuantileSketch(0.01)
+    halves = [main.QuantileSketch(0.01), main.QuantileSketch(0.01)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        halves[i % 2].add(value)
+    halves[0].merge(halves[1])
+    values.sort()
+    for q in (0.01, 0.5, 0.9, 0.99, 0.999, 1.0):
+        assert whole.quantile(q) == pytest.approx(main.nearest_rank(values, q), rel=0.01)
+        assert halves[0].quantile(q) == whole.quantile(q)
+    with pytest.raises(ValueError):
+        whole.merge(main.QuantileSketch(0.05))
+
+
+# Accumulators filled by separate runs merge into the totals of one run over everything
+def test_metrics_accumulator_merge():
+    jobs = random_jobs(3)
+    whole = main.MetricsAccumulator()
+    parts = [main.MetricsAccumulator(), main.MetricsAccumulator()]
+    _, completed = main.srtf_scheduler(jobs, sink=main.SilentSink())
+    for p in completed:
+        whole.record_process(p)
+        parts[p.pid % 2].record_process(p)
+    parts[0].merge(parts[1])
+    merged, expected = parts[0].summary(), whole.summary()
+    for key in ("AWT", "ATT", "ART", "CPU_Util", "Throughput", "Total_Time", "Completed", "WT_p99"):
+        assert merged[key] == pytest.approx(expected[key])
+    assert expected["AWT"] == pytest.approx(sum(p.waiting_time for p in completed) / len(completed))
+
+
+# Waiting times of exactly 6 are reported as 6, not as the sketch's estimate
+def test_exact_percentiles_when_every_value_is_known():
+    jobs = [main.Process(1, 0, 6), main.Process(2, 0, 6), main.Process(3, 6, 6)]
+    _, completed = main.srtf_scheduler(jobs, sink=main.SilentSink())
+    assert sorted(p.waiting_time for p in completed) == [0, 6, 6]
+    metrics = main.compute_metrics(completed)
+    assert (metrics["WT_p50"], metrics["WT_p99"], metrics["TAT_p99"]) == (6, 6, 12)
+    accumulator = main.MetricsAccumulator(exact_percentiles=True)
+    main.srtf_scheduler(jobs, sink=main.SilentSink(), metrics=accumulator)
+    assert accumulator.summary()["WT_p99"] == 6
+    # Merging in sketches alone falls back to them
+    accumulator.merge(main.MetricsAccumulator())
+    assert accumulator.summary()["WT_p99"] == pytest.approx(6, rel=0.01)
+
+
+# Back-to-back slices of the same process are stored as one segment
+def test_segment_store_merges_back_to_back_segments():
+    store = main.SegmentStore()
+    for segment in [(1, 0, 2), (1, 2, 3), (2, 3, 4), (1, 5, 6), (1, 6, 8)]:
+        store.append(*segment)
+    assert store.to_list() == [(1, 0, 3), (2, 3, 4), (1, 5, 8)]
+    assert store[-1] == (1, 5, 8) and store[1:] == [(2, 3, 4), (1, 5, 8)]
+
+
+# With a small memory budget older segments go to disk and still read back in order
+def test_segment_store_spills_past_its_budget():
+    segments = [(i % 3 + 1, float(i), i + 0.5) for i in range(20)]
+    store = main.SegmentStore(memory_budget=48)
+    for segment in segments:
+        store.append(*segment)
+    assert store.spilled and len(store.pids) <= 2
+    assert len(store) == 20
+    assert list(store) == segments
+    assert [store[i] for i in range(20)] == segments
+    with pytest.raises(IndexError):
+        store[20]
+    pids, starts, ends = store.columns()
+    copy = main.SegmentStore.from_columns(pids, starts, ends)
+    assert copy.to_list() == segments and copy.spilled == 0
+    store.close()
+
+
+@pytest.mark.parametrize("memory_budget", [None, 48])
+def test_segment_store_between(memory_budget):
+    segments = [(1, 0, 2), (2, 2, 5), (3, 6, 7), (1, 7, 10), (2, 10, 11)]
+    store = main.SegmentStore(memory_budget=memory_budget)
+    for segment in segments:
+        store.append(*segment)
+    assert list(store.between(4, 8)) == [(2, 2, 5), (3, 6, 7), (1, 7, 10)]
+    assert list(store.between(5, 6)) == []
+    assert list(store.between(-1, 100)) == segments
+    assert list(store.between(2, 2.5)) == [(2, 2, 5)]
+    store.close()
+
+
+# truncate() rewinds to an earlier length and end, but not past what was spilled
+def test_segment_store_truncate():
+    store = main.SegmentStore()
+    store.append(1, 0, 2)
+    length, last_pid, last_end = len(store), store.last_pid, store.last_end
+    store.append(1, 2, 4)
+    store.append(2, 4, 5)
+    store.truncate(length, last_pid, last_end)
+    assert store.to_list() == [(1, 0, 2)]
+    store.append(2, 2, 3)
+    assert store.to_list() == [(1, 0, 2), (2, 2, 3)]
+    store.truncate(0, None, None)
+    assert len(store) == 0
+
+    spilled = main.SegmentStore(memory_budget=48)
+    for i in range(6):
+        spilled.append(i, i, i + 1)
+    assert spilled.spilled
+    with pytest.raises(ValueError):
+        spilled.truncate(1, 1, 2)
+    spilled.truncate(len(spilled) - 1, 4, 5)
+    assert spilled.to_list() == [(i, i, i + 1) for i in range(5)]
+    spilled.close()
+
+
+@pytest.mark.parametrize("policy", main.SMP_POLICIES)
+@pytest.mark.parametrize("queue_mode", main.SMP_QUEUE_MODES)
+@pytest.mark.parametrize("seed", range(5))
+def test_smp_on_one_cpu_matches_single_cpu(policy, queue_mode, seed):
+    jobs = random_jobs(seed)
+    single = main.srtf_scheduler if policy == "srtf" else main.mlfq_scheduler
+    expected_schedule, expected_completed = run(single, jobs)
+    cores, completed = main.smp_scheduler(jobs, num_cpus=1, policy=policy, queue_mode=queue_mode,
+                                          sink=main.SilentSink())
+    assert list(cores[0]) == expected_schedule
+    assert {p.pid: (p.start_time, p.completion_time, p.waiting_time) for p in completed} == expected_completed
+
+
+# On several cores every job gets exactly its burst, never before it arrives, on one core at a time
+@pytest.mark.parametrize("policy", main.SMP_POLICIES)
+@pytest.mark.parametrize("queue_mode", main.SMP_QUEUE_MODES)
+def test_smp_schedules_are_consistent(policy, queue_mode):
+    jobs = random_jobs(11)
+    cores, completed = main.smp_scheduler(jobs, num_cpus=3, policy=policy, queue_mode=queue_mode,
+                                          sink=main.SilentSink())
+    arrivals = {p.pid: p.arrival_time for p in jobs}
+    bursts = {p.pid: p.burst_time for p in jobs}
+    ran = dict.fromkeys(bursts, 0)
+    by_pid = {}
+    for core in cores:
+        segments = list(core)
+        for (_, _, end), (_, start, _) in zip(segments, segments[1:]):
+            assert end <= start
+        for pid, start, end in segments:
+            assert start >= arrivals[pid]
+            ran[pid] += end - start
+            by_pid.setdefault(pid, []).append((start, end))
+    assert ran == pytest.approx(bursts)
+    for spans in by_pid.values():
+        spans.sort()
+        assert all(end <= start for (_, end), (start, _) in zip(spans, spans[1:]))
+    assert sorted(p.pid for p in completed) == sorted(bursts)
+    assert all(p.completion_time == max(end for _, end in by_pid[p.pid]) for p in completed)
+
+
+def test_smp_runs_jobs_in_parallel():
+    jobs = [main.Process(1, 0, 4), main.Process(2, 0, 4), main.Process(3, 0, 2)]
+    cores, completed = main.smp_scheduler(jobs, num_cpus=3, sink=main.SilentSink())
+    assert {p.pid: p.completion_time for p in completed} == {1: 4, 2: 4, 3: 2}
+    assert all(p.waiting_time == 0 for p in completed)
+
+
+def recording_instrumentation(calls, timers=False):
+    return main.Instrumentation(
+        timers=timers,
+        on_arrival=lambda time, pid: calls.append(("arrival", time, pid)),
+        on_dispatch=lambda time, pid: calls.append(("dispatch", time, pid)),
+        on_preempt=lambda time, pid, by_pid: calls.append(("preempt", time, pid, by_pid)),
+        on_complete=lambda time, pid: calls.append(("complete", time, pid)),
+        on_demote=lambda time, pid, old, new: calls.append(("demote", time, pid, old, new)))
+
+
+def test_instrumentation_callbacks_in_order():
+    calls = []
+    instrument = recording_instrumentation(calls)
+    main.srtf_scheduler([main.Process(1, 0, 5), main.Process(2, 1, 2)], sink=main.SilentSink(),
+                        instrument=instrument)
+    assert calls == [("arrival", 0, 1), ("dispatch", 0, 1), ("arrival", 1, 2), ("preempt", 1, 1, 2),
+                     ("dispatch", 1, 2), ("complete", 3, 2), ("dispatch", 3, 1), ("complete", 7, 1)]
+    counters = instrument.summary()["counters"]
+    assert (counters["arrivals"], counters["dispatches"], counters["preemptions"], counters["completions"]) == \
+        (2, 3, 1, 2)
+
+    calls.clear()
+    main.mlfq_scheduler([main.Process(1, 0, 5)], sink=main.SilentSink(), time_quantums=[2, 4, INF],
+                        instrument=instrument)
+    assert calls == [("arrival", 0, 1), ("dispatch", 0, 1), ("demote", 2, 1, 0, 1), ("dispatch", 2, 1),
+                     ("complete", 5, 1)]
+
+
+# The counters agree with the callbacks and the schedule, and leave the results unchanged
+@pytest.mark.parametrize("scheduler, params", [
+    (main.srtf_scheduler, {}),
+    (main.mlfq_scheduler, {"time_quantums": [2, 4, INF], "boost_period": 25}),
+])
+def test_instrumentation_counters(scheduler, params):
+    jobs = random_jobs(5)
+    calls = []
+    instrument = recording_instrumentation(calls, timers=True)
+    schedule, completed = scheduler(jobs, sink=main.SilentSink(), instrument=instrument, **params)
+    assert run(scheduler, jobs, **params) == \
+        (list(schedule), {p.pid: (p.start_time, p.completion_time, p.waiting_time) for p in completed})
+    profile = instrument.summary()
+    counters = profile["counters"]
+    assert profile["runs"] == 1 and set(profile["phase_seconds"]) == set(main.INSTRUMENT_PHASES)
+    assert counters["arrivals"] == counters["completions"] == len(jobs)
+    assert counters["dispatches"] == counters["ready_pops"] == counters["ready_pushes"]
+    for kind, name in [("arrival", "arrivals"), ("dispatch", "dispatches"), ("preempt", "preemptions"),
+                       ("complete", "completions"), ("demote", "demotions")]:
+        assert sum(call[0] == kind for call in calls) == counters[name]
+    if scheduler is main.mlfq_scheduler:
+        assert counters["boosts"] > 0 and counters["demotions"] > 0
+    else:
+        assert counters["dispatches"] == len(schedule)
+
+    # A second run adds to the totals; without timers no phases are reported
+    scheduler(jobs, sink=main.SilentSink(), instrument=instrument, **params)
+    assert instrument.summary()["counters"]["arrivals"] == 2 * len(jobs) and instrument.runs == 2
+    assert "phase_seconds" not in main.Instrumentation().summary()
+
+
+# Jobs submitted one at a time give the batch schedule, whether the clock is moved up to each arrival before
+# or after submitting it (several jobs arrive at the same time)
+@pytest.mark.parametrize("policy, scheduler, params", [
+    ("srtf", main.srtf_scheduler, {}),
+    ("mlfq", main.mlfq_scheduler, {"time_quantums": [2, 4, INF], "boost_period": 25}),
+])
+@pytest.mark.parametrize("advance_first", [True, False])
+def test_simulator_matches_batch_run(policy, scheduler, params, advance_first):
+    jobs = random_jobs(7)
+    expected_schedule, expected_completed = run(scheduler, jobs, **params)
+    simulator = main.Simulator(policy, **params)
+    for job in jobs:
+        if advance_first:
+            simulator.advance_to(job.arrival_time)
+        simulator.submit(job)
+        if not advance_first:
+            simulator.advance_to(job.arrival_time)
+    simulator.advance_to(INF)
+    assert list(simulator.schedule) == expected_schedule
+    assert {p.pid: (p.start_time, p.completion_time, p.waiting_time) for p in simulator.completed} == expected_completed
+
+
+# Restoring a snapshot drops what was submitted and run since; forecasts leave the simulator as it was
+@pytest.mark.parametrize("policy, scheduler", [("srtf", main.srtf_scheduler), ("mlfq", main.mlfq_scheduler)])
+def test_simulator_snapshot_and_forecast(policy, scheduler):
+    simulator = main.Simulator(policy)
+    # Submitted out of arrival order, ahead of the clock
+    for job in [(1, 0, 6), (3, 8, 2), (2, 3, 1)]:
+        simulator.submit(job)
+    simulator.advance_to(1)
+    state = simulator.snapshot()
+    forecast = [(p.pid, p.completion_time) for p in simulator.forecast()]
+    simulator.submit((4, 2, 1))
+    simulator.advance_to(INF)
+    assert len(simulator) == 0 and len(simulator.completed) == 4
+
+    simulator.restore(state)
+    assert (simulator.now, simulator.running, len(simulator), simulator.completed) == (1, 1, 3, [])
+    simulator.advance_to(INF)
+    assert [(p.pid, p.completion_time) for p in simulator.completed] == forecast
+    expected_schedule, _ = run(scheduler, [main.Process(1, 0, 6), main.Process(2, 3, 1), main.Process(3, 8, 2)])
+    assert list(simulator.schedule) == expected_schedule
+    with pytest.raises(ValueError):
+        simulator.submit((5, 1, 1))
+
+
+def test_result_cache_hit_matches_miss(tmp_path):
+    table = main.generate_workload(500, seed=3)
+    params = {"time_quantums": [2, 4, INF], "boost_period": 50}
+    cache = main.ResultCache(str(tmp_path))
+    miss_metrics = main.MetricsAccumulator()
+    miss_schedule, miss_completed = cache.run(main.mlfq_scheduler, table, metrics=miss_metrics, **params)
+    assert cache.misses == 1
+
+    # A new cache on the same directory has to read the entry back from disk
+    reopened = main.ResultCache(str(tmp_path))
+    hit_metrics = main.MetricsAccumulator()
+    hit_schedule, hit_completed = reopened.run(main.mlfq_scheduler, table, metrics=hit_metrics, **params)
+    assert reopened.hits == 1
+    assert list(hit_schedule) == list(miss_schedule)
+    assert [(p.pid, p.start_time, p.completion_time, p.waiting_time) for p in hit_completed] == \
+           [(p.pid, p.start_time, p.completion_time, p.waiting_time) for p in miss_completed]
+    assert hit_metrics.summary() == miss_metrics.summary()
+
+    # Other parameters are another entry
+    reopened.run(main.mlfq_scheduler, table, time_quantums=[3, 6, INF], boost_period=50)
+    assert (reopened.hits, reopened.misses) == (1, 1)
+
+
+def test_result_cache_skips_unseeded_random_runs(tmp_path):
+    table = main.generate_workload(200, seed=3)
+    cache = main.ResultCache(str(tmp_path))
+    for _ in range(2):
+        cache.run(main.smp_scheduler, table, num_cpus=4, queue_mode="per_core", seed=None)
+        cache.run(main.lottery_scheduler, table)
+    assert cache.hits == cache.memo_hits == cache.misses == 0
+    assert not cache.sizes
+
+
+
+# A registered policy runs with its default parameters, overridden by the caller's
+def test_register_and_run_policy(monkeypatch):
+    monkeypatch.setattr(main, "SCHEDULERS", dict(main.SCHEDULERS))
+    main.register_scheduler("mlfq2", main.mlfq_scheduler, "MLFQ-2", time_quantums=[2, INF], num_queues=2)
+    jobs = random_jobs(4)
+    for params in ({}, {"time_quantums": [3, INF]}):
+        expected = run(main.mlfq_scheduler, jobs, **dict({"time_quantums": [2, INF], "num_queues": 2}, **params))
+        assert run(lambda *args, **kwargs: main.run_policy("mlfq2", *args, **kwargs), jobs, **params) == expected
+    assert main.SCHEDULERS["mlfq2"]["title"] == "MLFQ-2"
+
+    cores, _ = main.run_policy("srtf", jobs, sink=main.SilentSink(), num_cpus=2, smp_options={"queue_mode": "per_core"})
+    assert len(cores) == 2
+    with pytest.raises(ValueError):
+        main.run_policy("fifo", jobs, sink=main.SilentSink())
+    with pytest.raises(ValueError):
+        main.run_policy("cfs", jobs, sink=main.SilentSink(), num_cpus=2)
+
+
+# The policies run side by side give the same metrics as running them one after the other
+def test_compare_schedulers_matches_serial_runs():
+    table = main.generate_workload(300, seed=5)
+    names = ["srtf", "mlfq", "cfs", "lottery", "stride"]
+    results = main.compare_schedulers(table, names, max_workers=2)
+    assert [name for name, _, _ in results] == names
+    for name, metrics, seconds in results:
+        expected = main.MetricsAccumulator()
+        main.run_policy(name, table, sink=main.SilentSink(), metrics=expected, keep_completed=False)
+        assert metrics.summary() == expected.summary() and seconds > 0
+    with pytest.raises(ValueError):
+        main.compare_schedulers(table, ["srtf", "fifo"])
+
+
+def test_ticket_tree_find():
+    rng = random.Random(1)
+    counts = [rng.randint(1, 20) for _ in range(37)]
+    tree = main.TicketTree()
+    for count in counts:
+        tree.append(count)
+    # Take a few slots out as if their processes completed
+    for slot in (0, 5, 36):
+        tree.add(slot, -counts[slot])
+        counts[slot] = 0
+    assert tree.total == sum(counts)
+    owners = [slot for slot, count in enumerate(counts) for _ in range(count)]
+    assert [tree.find(ticket) for ticket in range(tree.total)] == owners
+
+
+@pytest.mark.parametrize("tickets", [{1: 0}, {2: -5}, {1: 1.5}, {2: 2.0}])
+def test_ticket_counts_must_be_positive_integers(tickets):
+    jobs = [main.Process(1, 0, 5), main.Process(2, 1, 3)]
+    for scheduler in (main.lottery_scheduler, main.stride_scheduler):
+        with pytest.raises(ValueError):
+            scheduler(jobs, tickets=tickets, sink=main.SilentSink())
+    with pytest.raises(ValueError):
+        main.lottery_scheduler(jobs, default_tickets=0.5, sink=main.SilentSink())
+
+
+@pytest.mark.parametrize("weights", [{1: 0}, {2: -1.0}, {1: INF}, {1: float("nan")}])
+def test_cfs_weights_must_be_positive(weights):
+    with pytest.raises(ValueError):
+        main.cfs_scheduler([main.Process(1, 0, 5), main.Process(2, 1, 3)], weights=weights, sink=main.SilentSink())
+
+
+# Two processes sharing the CPU from the start get it in proportion to their weight or tickets
+@pytest.mark.parametrize("scheduler, params", [
+    (main.cfs_scheduler, {"weights": {1: 3.0}, "target_latency": 4.0}),
+    (main.stride_scheduler, {"tickets": {1: 300}}),
+    (main.lottery_scheduler, {"tickets": {1: 300}, "seed": 1}),
+])
+def test_proportional_share(scheduler, params):
+    jobs = [main.Process(1, 0, 400), main.Process(2, 0, 400)]
+    schedule, _ = run(scheduler, jobs, **params)
+    share = {1: 0.0, 2: 0.0}
+    for pid, start, end in schedule:
+        if start < 400:
+            share[pid] += min(end, 400) - start
+    assert share[1] / share[2] == pytest.approx(3, rel=0.15)
+
+
+
+
+# P1 and P2 go to I/O after one time unit each and P2's shorter I/O ends first. Under SRTF each one preempts
+# P3 as it wakes up; under MLFQ they wait in Q0 until P3's first quantum runs out. I/O time counts as neither
+# CPU time nor waiting time.
+@pytest.mark.parametrize("scheduler, expected_schedule, expected_completed", [
+    (main.srtf_scheduler, [(1, 0, 1), (2, 1, 2), (3, 2, 4), (2, 4, 5), (3, 5, 6), (1, 6, 7), (3, 7, 14)],
+     {1: (0, 7, 0), 2: (1, 5, 1), 3: (2, 14, 4)}),
+    (main.mlfq_scheduler, [(1, 0, 1), (2, 1, 2), (3, 2, 7), (2, 7, 8), (1, 8, 9), (3, 9, 14)],
+     {1: (0, 9, 2), 2: (1, 8, 4), 3: (2, 14, 4)}),
+])
+def test_io_wakeups(scheduler, expected_schedule, expected_completed):
+    jobs = [main.Process(1, 0, None, bursts=[1, 5, 1]), main.Process(2, 0, None, bursts=[1, 2, 1]),
+            main.Process(3, 0, 10)]
+    sink = main.RingBufferSink()
+    schedule, completed = run(scheduler, jobs, sink=sink)
+    wakeups = [(time, pid) for kind, time, pid, _, _ in sink.events() if kind == main.EVENT_WAKE]
+    assert wakeups == [(4, 2), (6, 1)]
+    assert schedule == expected_schedule
+    assert completed == expected_completed
+
+
+# Splitting CPU time into bursts keeps each process's CPU total; I/O time shows up in turnaround only
+def test_add_io_bursts():
+    table = main.generate_workload(40, seed=6)
+    io_table = main.add_io_bursts(table, fraction=0.5, cpu_bursts=3, seed=6)
+    assert list(io_table.bursts) == pytest.approx(list(table.bursts))
+    split = [i for i in range(40) if len(io_table.bursts_of(i)) > 1]
+    assert split and len(split) < 40
+    for i in split:
+        bursts = io_table.bursts_of(i)
+        assert len(bursts) == 5 and io_table.io_times[i] == pytest.approx(bursts[1] + bursts[3])
+    for scheduler in (main.srtf_scheduler, main.mlfq_scheduler):
+        _, completed = scheduler(io_table, sink=main.SilentSink())
+        for p in completed:
+            row = p.pid - 1
+            assert p.turnaround_time == pytest.approx(p.waiting_time + table.bursts[row] + io_table.io_times[row])
+            assert p.waiting_time >= -1e-6
+
+
+def test_io_bursts_rejected_where_unsupported():
+    with pytest.raises(ValueError):
+        main.ProcessTable.from_processes([main.Process(1, 0, None, bursts=[1, 2])])
+    jobs = [main.Process(1, 0, None, bursts=[1, 2, 1])]
+    for scheduler in (main.cfs_scheduler, main.lottery_scheduler, main.stride_scheduler):
+        with pytest.raises(ValueError):
+            scheduler(jobs, sink=main.SilentSink())
+    with pytest.raises(ValueError):
+        main.Simulator().submit(jobs[0])